@@ -0,0 +1,184 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from dataset_archive import ArchiveError, dataset_size, open_dataset, split_member_path
+from dataset_cache import cache_dir_for
+from streaming import GradeStats, iter_chunks
+from student_schema import BOOLEAN_COLUMNS, apply_schema
+
+STORE_VERSION = 1
+
+# Bytes before the processed offset that are re-hashed to detect a rewritten prefix
+TAIL_DIGEST_BYTES = 64 * 1024
+
+
+def store_path_for(data_path):
+    """Default location of the aggregate store: the dataset's cache directory."""
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    return os.path.join(cache_dir_for(data_path), f'{name}.stats.json')
+
+
+def file_tail_digest(data_path, offset):
+    """Hash of the last ``TAIL_DIGEST_BYTES`` before ``offset``, to detect a rewritten prefix cheaply."""
+    with open_dataset(data_path) as f:
+        start = max(0, offset - TAIL_DIGEST_BYTES)
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+class AggregateStore:
+    """Persistent ``GradeStats`` for a dataset, kept in sync with its CSV.
+
+    The store remembers how many bytes of the source it has folded in. When
+    rows are appended to the CSV, ``refresh`` parses only the new bytes and
+    merges their statistics, so keeping the dashboard current costs
+    O(new rows) instead of a pass over the full history. A rewritten or
+    truncated file triggers a full rebuild.
+    """
+
+    def __init__(self, data_path, store_path=None):
+        self.data_path = data_path
+        self.store_path = store_path or store_path_for(data_path)
+        self.stats = GradeStats()
+        self.offset = 0
+        self.tail_digest = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, data_path, store_path=None):
+        """Open the store for ``data_path``, loading saved statistics if any, and refresh it."""
+        store = cls(data_path, store_path)
+        if os.path.exists(store.store_path):
+            with open(store.store_path) as f:
+                payload = json.load(f)
+            if payload.get('version') == STORE_VERSION:
+                store.stats = GradeStats.from_dict(payload['stats'])
+                store.offset = payload['offset']
+                store.tail_digest = payload['tail_digest']
+        store.refresh()
+        return store
+
+    @property
+    def version(self):
+        """Identifier of the source state the statistics reflect."""
+        return f"{self.offset}-{self.tail_digest}"
+
+    def _prefix_unchanged(self, size):
+        if self.offset == 0 or size < self.offset:
+            return False
+        return file_tail_digest(self.data_path, self.offset) == self.tail_digest
+
+    def _ends_with_newline(self, size):
+        if size == 0:
+            return True
+        with open_dataset(self.data_path) as f:
+            f.seek(size - 1)
+            return f.read(1) == b'\n'
+
+    def refresh(self):
+        """Bring the statistics up to date with the source file.
+
+        Returns the number of rows folded in (0 when nothing changed).
+        """
+        with self._lock:
+            size = dataset_size(self.data_path)
+            if size == self.offset and self._prefix_unchanged(size):
+                return 0
+            # A partially written last line is left for the next refresh
+            if not self._ends_with_newline(size):
+                return 0
+
+            if self._prefix_unchanged(size):
+                start = self.offset
+            else:
+                self.stats = GradeStats()
+                start = 0
+
+            n_rows = 0
+            for chunk in iter_chunks(self.data_path, offset=start):
+                self.stats.update(chunk)
+                n_rows += len(chunk)
+            self.offset = size
+            self.tail_digest = file_tail_digest(self.data_path, size)
+            self._save()
+            return n_rows
+
+    def append_records(self, records):
+        """Append raw student records to the source CSV and fold them into the statistics.
+
+        ``records`` must have the source file's columns. They are validated
+        against the schema before anything is written. Archive members are
+        read-only: extract the CSV first to append to it.
+        """
+        if split_member_path(self.data_path) is not None:
+            raise ArchiveError(f"Cannot append to {self.data_path}: extract it from the archive first")
+        with self._lock:
+            with open_dataset(self.data_path) as f:
+                columns = pd.read_csv(f, sep=';', nrows=0).columns
+            raw = records[list(columns)].copy()
+            for col in BOOLEAN_COLUMNS:
+                if raw[col].dtype == bool:
+                    raw[col] = raw[col].map({True: 'yes', False: 'no'})
+
+            typed = apply_schema(raw.copy())
+            typed['performance_binary'] = (typed['G3'] >= 15).astype('int8')
+            batch = GradeStats.from_frame(typed)
+
+            # The batch can be merged directly only if no other rows are pending;
+            # otherwise refresh folds it in together with them
+            size = dataset_size(self.data_path)
+            caught_up = size == self.offset and self._prefix_unchanged(size)
+            with open(self.data_path, 'a', newline='') as f:
+                if not self._ends_with_newline(size):
+                    f.write('\n')
+                raw.to_csv(f, sep=';', header=False, index=False)
+
+            if caught_up:
+                self.stats.merge(batch)
+                size = dataset_size(self.data_path)
+                self.offset = size
+                self.tail_digest = file_tail_digest(self.data_path, size)
+                self._save()
+
+        if not caught_up:
+            self.refresh()
+        return len(raw)
+
+    def _save(self):
+        payload = {
+            'version': STORE_VERSION,
+            'source': os.path.abspath(self.data_path),
+            'offset': self.offset,
+            'tail_digest': self.tail_digest,
+            'stats': self.stats.to_dict(),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+            # Unique per writer, so stores of one dataset opened in parallel never share a temp file
+            tmp_path = f'{self.store_path}.{os.getpid()}-{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.store_path)
+        except OSError:
+            # Read-only data directory: keep the statistics in memory only
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or refresh the dashboard aggregate store for a dataset.")
+    parser.add_argument('datasets', nargs='*', default=['data/student-mat.csv', 'data/student-por.csv'],
+                        help="Semicolon-separated UCI dataset files")
+    args = parser.parse_args()
+
+    for data_path in args.datasets:
+        store = AggregateStore.open(data_path)
+        print(f"{data_path}: {store.stats.n} students -> {store.store_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_store import DEFAULT_STORE_DIR, load_artifact, load_or_train
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def score_columns(binary_proba, multi_proba, binary_classes, multi_classes):
+    """Output columns for the two models' probabilities over the same rows.
+
+    Returns a dict with the probability of good performance, the
+    probability of every performance class and the predicted labels.
+    """
+    good_index = list(binary_classes).index(1)
+    scores = {'prob_good_performance': binary_proba[:, good_index]}
+    for i, cls in enumerate(multi_classes):
+        scores[f'prob_{cls}'] = multi_proba[:, i]
+    scores['predicted_binary'] = binary_classes[binary_proba.argmax(axis=1)]
+    scores['predicted_class'] = multi_classes[multi_proba.argmax(axis=1)]
+    return scores
+
+
+def score_frame(df, model_binary, model_multi, encoder):
+    """Score a frame of raw student records with both models.
+
+    Returns a frame aligned with ``df`` holding the columns of
+    ``score_columns``.
+    """
+    X = encoder.transform(df)
+    binary_proba = model_binary.predict_proba(model_binary.scaler_.transform(X))
+    multi_proba = model_multi.predict_proba(model_multi.scaler_.transform(X))
+    scores = score_columns(binary_proba, multi_proba, model_binary.classes_, model_multi.classes_)
+    return pd.DataFrame(scores, index=df.index)
+
+
+class _ParquetSink:
+    """Append scored chunks to a single Parquet file."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+        self._pa = pa
+        self._pq = pq
+        self._path = path
+        self._writer = None
+
+    def write(self, frame):
+        table = self._pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _CsvSink:
+    """Append scored chunks to a single CSV file, writing the header once."""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='')
+        self._header = True
+
+    def write(self, frame):
+        frame.to_csv(self._file, index=False, header=self._header)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
+def score_csv(input_path, output_path, model_binary, model_multi, encoder,
+              chunksize=DEFAULT_CHUNKSIZE, output_format=None, id_column=None):
+    """Stream a semicolon-separated UCI CSV through both models in chunks.
+
+    Only one chunk is held in memory at a time. Output rows keep the input
+    order; each carries its 0-based input ``row`` number and, if given, the
+    value of ``id_column``. ``output_format`` is ``'csv'`` or ``'parquet'``
+    and defaults to the output file extension.
+
+    Returns a dict with the row count, elapsed seconds and rows per second.
+    """
+    if output_format is None:
+        output_format = 'parquet' if output_path.endswith('.parquet') else 'csv'
+    if output_format not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    sink = _ParquetSink(output_path) if output_format == 'parquet' else _CsvSink(output_path)
+    started = time.perf_counter()
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(input_path, sep=';', chunksize=chunksize):
+            scores = score_frame(chunk, model_binary, model_multi, encoder)
+            scores.insert(0, 'row', np.arange(n_rows, n_rows + len(chunk)))
+            if id_column is not None:
+                scores.insert(1, id_column, chunk[id_column].to_numpy())
+            sink.write(scores)
+            n_rows += len(chunk)
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'rows': n_rows,
+        'seconds': elapsed,
+        'rows_per_sec': n_rows / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a cohort CSV with the student performance models.")
+    parser.add_argument('input', help="Semicolon-separated CSV in the UCI student layout")
+    parser.add_argument('output', help="Output file (.csv or .parquet)")
+    parser.add_argument('--dataset', default='data/student-mat.csv',
+                        help="Training dataset whose models to use (trained on a cache miss)")
+    parser.add_argument('--artifact', help="Score with this artifact directory instead of --dataset")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help="Artifact store directory")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="Output format (default: from extension)")
+    parser.add_argument('--id-column', help="Input column to copy to the output for joining back")
+    args = parser.parse_args()
+
+    if args.artifact:
+        model_binary, model_multi, encoder, _ = load_artifact(args.artifact, mmap_mode='r')
+    else:
+        model_binary, model_multi, encoder, _ = load_or_train(args.dataset, args.store, mmap_mode='r')
+
+    print(f"Scoring {args.input}...")
+    stats = score_csv(args.input, args.output, model_binary, model_multi, encoder,
+                      chunksize=args.chunksize, output_format=args.format, id_column=args.id_column)
+    print(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec) -> {os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
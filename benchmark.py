@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from dataset_archive import open_dataset
+from feature_encoder import FeatureEncoder
+from forest_engine import CompiledForest
+from model_training import train_both_models
+from student_performance_analysis import load_data
+
+DEFAULT_SIZES = [395, 649, 10_000, 100_000]
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1_000, 10_000]
+DEFAULT_TRAIN_MAX_ROWS = 100_000
+
+# Allowed slowdown before compare flags a regression
+DEFAULT_THRESHOLD = 0.10
+
+
+def resample_dataset(df, n_rows, seed=42):
+    """Draw ``n_rows`` student records with replacement, keeping the UCI schema."""
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(df), size=n_rows)
+    return df.iloc[idx].reset_index(drop=True)
+
+
+def measure(fn, warmup=1, repeats=5):
+    """Time ``fn`` after warm-up runs and record its peak traced memory.
+
+    Memory is measured in a separate run so tracemalloc overhead does not
+    leak into the timings.
+    """
+    for _ in range(warmup):
+        fn()
+    times = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'repeats': repeats,
+        'min_s': float(times.min()),
+        'median_s': float(np.median(times)),
+        'mean_s': float(times.mean()),
+        'peak_mb': peak / 2**20,
+    }
+
+
+def latency_percentiles(fn, warmup=100, repeats=2000):
+    """p50/p99 latency of a fast call, timed one call at a time."""
+    for _ in range(warmup):
+        fn()
+    times = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - started
+    return {
+        'repeats': repeats,
+        'p50_ms': float(np.percentile(times, 50) * 1000),
+        'p99_ms': float(np.percentile(times, 99) * 1000),
+        'median_s': float(np.median(times)),
+    }
+
+
+def _predict_both(model_binary, model_multi, X):
+    model_binary.predict_proba(model_binary.scaler_.transform(X))
+    model_multi.predict_proba(model_multi.scaler_.transform(X))
+
+
+def _predict_both_compiled(compiled_binary, compiled_multi, X):
+    # Compiled forests apply the scaler themselves
+    compiled_binary.predict_proba(X)
+    compiled_multi.predict_proba(X)
+
+
+def run_benchmarks(data_path, sizes=DEFAULT_SIZES, batch_sizes=DEFAULT_BATCH_SIZES,
+                   train_max_rows=DEFAULT_TRAIN_MAX_ROWS, warmup=1, repeats=5, n_workers=None):
+    """Benchmark the load, encode, train and predict stages.
+
+    Input sizes are produced by resampling ``data_path``. Returns a dict of
+    results keyed by ``<stage>[<parameter>=<value>]``.
+    """
+    base = load_data(data_path)
+    # Resample the raw file so generated CSVs keep the UCI text encoding
+    with open_dataset(data_path) as f:
+        raw_base = pd.read_csv(f, sep=';')
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix='student-bench-') as tmp_dir:
+        for n_rows in sizes:
+            print(f"Benchmarking {n_rows} rows...")
+            raw = resample_dataset(raw_base, n_rows)
+            csv_path = os.path.join(tmp_dir, f'students-{n_rows}.csv')
+            raw.to_csv(csv_path, sep=';', index=False)
+
+            results[f'load_data[rows={n_rows}]'] = measure(lambda: load_data(csv_path), warmup, repeats)
+            df = load_data(csv_path)
+
+            encoder = FeatureEncoder().fit(df)
+            results[f'encode[rows={n_rows}]'] = measure(lambda: encoder.transform(df), warmup, repeats)
+
+            if n_rows <= train_max_rows:
+                # Training is expensive, so it gets a single timed run per size
+                results[f'train[rows={n_rows}]'] = measure(
+                    lambda: train_both_models(df, encoder=encoder, n_workers=n_workers), 0, 1)
+
+    print("Benchmarking prediction...")
+    encoder = FeatureEncoder().fit(base)
+    trained, _ = train_both_models(base, encoder=encoder, n_workers=n_workers)
+    model_binary = trained['binary'][0]
+    model_multi = trained['multiclass'][0]
+
+    record = base.iloc[0].to_dict()
+    results['predict_single_row'] = latency_percentiles(
+        lambda: _predict_both(model_binary, model_multi, encoder.transform_one(record)),
+        warmup=20, repeats=200)
+
+    compiled_binary = CompiledForest.from_model(model_binary)
+    compiled_multi = CompiledForest.from_model(model_multi)
+    results['predict_single_row_compiled'] = latency_percentiles(
+        lambda: _predict_both_compiled(compiled_binary, compiled_multi, encoder.transform_one(record)),
+        warmup=20, repeats=200)
+
+    for batch_size in batch_sizes:
+        batch = resample_dataset(base, batch_size, seed=batch_size)
+        stats = measure(lambda: _predict_both(model_binary, model_multi, encoder.transform(batch)),
+                        warmup, repeats)
+        stats['rows_per_sec'] = batch_size / stats['median_s']
+        results[f'predict_batch[batch_size={batch_size}]'] = stats
+
+    return results
+
+
+def environment_info():
+    """Describe the machine and library versions a run was made with."""
+    import sklearn
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare two result dicts by median time.
+
+    Returns a list of ``(name, baseline_s, current_s, change, regressed)``
+    rows for the benchmarks present in both runs.
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]['median_s']
+        after = current[name]['median_s']
+        change = (after - before) / before if before > 0 else 0.0
+        rows.append((name, before, after, change, change > threshold))
+    return rows
+
+
+def print_results(results):
+    for name, stats in results.items():
+        line = f"{name:<40} median {stats['median_s'] * 1000:10.3f} ms"
+        if 'p50_ms' in stats:
+            line += f"  p50 {stats['p50_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms"
+        if 'peak_mb' in stats:
+            line += f"  peak {stats['peak_mb']:8.1f} MB"
+        if 'rows_per_sec' in stats:
+            line += f"  {stats['rows_per_sec']:,.0f} rows/s"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the student performance hot path.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run the benchmarks and save the results as JSON")
+    run_parser.add_argument('--data', default='data/student-mat.csv', help="Dataset to resample from")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts to benchmark")
+    run_parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_BATCH_SIZES,
+                            help="Prediction batch sizes")
+    run_parser.add_argument('--train-max-rows', type=int, default=DEFAULT_TRAIN_MAX_ROWS,
+                            help="Skip training benchmarks above this many rows")
+    run_parser.add_argument('--warmup', type=int, default=1, help="Warm-up runs per benchmark")
+    run_parser.add_argument('--repeats', type=int, default=5, help="Timed runs per benchmark")
+    run_parser.add_argument('--workers', type=int, help="CPU cores used for training")
+    run_parser.add_argument('--output', default='benchmark_results.json', help="Where to write the results")
+
+    compare_parser = subparsers.add_parser('compare', help="Flag regressions against a baseline run")
+    compare_parser.add_argument('baseline', help="Baseline results JSON")
+    compare_parser.add_argument('current', help="Current results JSON")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="Allowed relative slowdown (0.10 = 10%%)")
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run_benchmarks(args.data, args.sizes, args.batch_sizes, args.train_max_rows,
+                                 args.warmup, args.repeats, args.workers)
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment_info(), 'results': results}, f, indent=2)
+        print()
+        print_results(results)
+        print(f"\nResults saved to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    with open(args.current) as f:
+        current = json.load(f)['results']
+
+    regressions = 0
+    for name, before, after, change, regressed in compare_results(baseline, current, args.threshold):
+        flag = 'REGRESSION' if regressed else 'ok'
+        print(f"{name:<40} {before * 1000:10.3f} ms -> {after * 1000:10.3f} ms  {change:+7.1%}  {flag}")
+        regressions += regressed
+    print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Same savefig defaults st.pyplot uses, so cached charts look identical
+SAVEFIG_KWARGS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+def chart_key(dataset_version, chart_id, params=None):
+    """Stable cache key for a chart of one dataset version with given widget state."""
+    payload = json.dumps([dataset_version, chart_id, params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def figure_to_png(fig):
+    """Encode a matplotlib figure as PNG bytes and close it."""
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, **SAVEFIG_KWARGS)
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """Size-bounded LRU of rendered chart images.
+
+    Entries are encoded PNG bytes keyed by ``chart_key``. The in-memory LRU
+    is bounded by total bytes. With a ``disk_dir``, rendered charts are also
+    written there and looked up on a memory miss, so several worker
+    processes on one host render each chart only once.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f'{key}.png')
+
+    def _remember(self, key, data):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            if len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get(self, key):
+        """Return cached bytes for ``key`` or ``None``."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is not None:
+                self._remember(key, data)
+                with self._lock:
+                    self.hits += 1
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data):
+        self._remember(key, data)
+        if self.disk_dir:
+            tmp_path = f'{self._disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError:
+                pass
+
+    def get_or_render(self, key, render):
+        """Return the chart for ``key``, calling ``render()`` for a figure only on a miss."""
+        data = self.get(key)
+        if data is None:
+            data = figure_to_png(render())
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
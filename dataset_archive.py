@@ -0,0 +1,199 @@
+import argparse
+import hashlib
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.request
+import zipfile
+
+ARCHIVE_NAME = 'student.zip'
+ARCHIVE_URL = 'https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student.zip'
+
+# SHA-256 of the UCI release of student.zip
+ARCHIVE_SHA256 = '4f671ae4598c20bb4e64de0f65931c98a609a52e383604e2601bd8f7e3822427'
+
+# Overrides ARCHIVE_SHA256, e.g. for a site's own export packaged as student.zip
+ARCHIVE_SHA256_ENV_VAR = 'STUDENT_APP_ARCHIVE_SHA256'
+
+# Base URL of a mirror serving student.zip (a local file server is fine); used instead of UCI
+MIRROR_ENV_VAR = 'STUDENT_APP_DATA_MIRROR'
+
+DATASET_MEMBERS = ('student-mat.csv', 'student-por.csv')
+
+BLOCK_SIZE = 1 << 20
+
+# Archive digests by (path, size, mtime), so each archive version is hashed once per process
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+class ArchiveError(ValueError):
+    """Raised when an archive fails its checksum or lacks a requested member."""
+
+
+def _sha256(f, block_size=BLOCK_SIZE):
+    digest = hashlib.sha256()
+    for block in iter(lambda: f.read(block_size), b''):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def split_member_path(path):
+    """``(archive_path, member)`` for a path inside a zip file, otherwise ``None``.
+
+    Members are addressed like files in a directory named after the archive,
+    e.g. ``data/student.zip/student-mat.csv``, so every loader that takes a
+    dataset path can read straight from the archive.
+    """
+    if os.path.isfile(path):
+        return None
+    parts = os.path.normpath(path).split(os.sep)
+    for i in range(len(parts) - 1, 0, -1):
+        archive_path = os.sep.join(parts[:i])
+        if archive_path.lower().endswith('.zip') and os.path.isfile(archive_path):
+            return archive_path, '/'.join(parts[i:])
+    return None
+
+
+def archive_sha256(archive_path):
+    """SHA-256 of ``archive_path``, hashed once per file size and mtime."""
+    stat = os.stat(archive_path)
+    key = (os.path.abspath(archive_path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        with open(archive_path, 'rb') as f:
+            digest = _sha256(f)
+        with _digests_lock:
+            _digests[key] = digest
+    return digest
+
+
+def expected_sha256(archive_path):
+    """Checksum ``archive_path`` must match, or ``None`` if none is known for it."""
+    override = os.environ.get(ARCHIVE_SHA256_ENV_VAR)
+    if override:
+        return override.lower()
+    return ARCHIVE_SHA256 if os.path.basename(archive_path) == ARCHIVE_NAME else None
+
+
+def verify_archive(archive_path, expected=None):
+    """Check ``archive_path`` against its expected SHA-256 and return its digest.
+
+    ``expected`` defaults to ``expected_sha256(archive_path)``. Raises
+    ``ArchiveError`` on a mismatch. Member contents are further checked
+    against their CRC-32 by ``zipfile`` whenever a member is read to the end.
+    """
+    expected = expected or expected_sha256(archive_path)
+    digest = archive_sha256(archive_path)
+    if expected and digest != expected.lower():
+        raise ArchiveError(f"{archive_path} has SHA-256 {digest}, expected {expected}")
+    return digest
+
+
+def open_dataset(path):
+    """Open a dataset file, or a member of a verified zip archive, for binary reading.
+
+    Members are decompressed as they are read, never extracted to disk.
+    The returned stream is seekable; seeking backwards in a member restarts
+    its decompression, which is cheap for files of this size.
+    """
+    located = split_member_path(path)
+    if located is None:
+        return open(path, 'rb')
+    archive_path, member = located
+    verify_archive(archive_path)
+    # The member stream keeps the archive file open after the ZipFile is closed
+    with zipfile.ZipFile(archive_path) as archive:
+        try:
+            return archive.open(member)
+        except KeyError:
+            raise ArchiveError(f"{member} not found in {archive_path}") from None
+
+
+def locate_dataset(path):
+    """``path`` if the file exists, else the same member of the ``student.zip`` next to it, if there is one."""
+    if os.path.exists(path):
+        return path
+    member_path = os.path.join(os.path.dirname(path), ARCHIVE_NAME, os.path.basename(path))
+    return member_path if split_member_path(member_path) is not None else path
+
+
+def dataset_size(path):
+    """Size in bytes of a dataset file, or the uncompressed size of an archive member."""
+    located = split_member_path(path)
+    if located is None:
+        return os.path.getsize(path)
+    archive_path, member = located
+    with zipfile.ZipFile(archive_path) as archive:
+        try:
+            return archive.getinfo(member).file_size
+        except KeyError:
+            raise ArchiveError(f"{member} not found in {archive_path}") from None
+
+
+def archive_url():
+    """Where to download the archive from: the configured mirror, else UCI."""
+    mirror = os.environ.get(MIRROR_ENV_VAR)
+    return f"{mirror.rstrip('/')}/{ARCHIVE_NAME}" if mirror else ARCHIVE_URL
+
+
+def download_archive(dest, url=None, expected=ARCHIVE_SHA256, timeout=60):
+    """Download the archive to ``dest``, resuming an interrupted download.
+
+    Bytes are written to ``dest + '.part'``. If that file exists, only the
+    rest is requested with an HTTP ``Range`` header. A server that ignores
+    ranges sends the whole archive, which then replaces the partial file.
+    The finished file is checked against ``expected`` before it is renamed
+    to ``dest``, so ``dest`` only ever holds a complete, verified archive. A
+    download that fails the check is deleted so the next attempt starts
+    over. Returns the archive's SHA-256.
+    """
+    url = url or archive_url()
+    part_path = dest + '.part'
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    request = urllib.request.Request(url, headers={'Range': f'bytes={offset}-'} if offset else {})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            resumed = offset and response.getcode() == 206
+            os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+            with open(part_path, 'ab' if resumed else 'wb') as f:
+                shutil.copyfileobj(response, f, BLOCK_SIZE)
+    except urllib.error.HTTPError as e:
+        # 416: nothing left to send, the partial file already holds the whole archive
+        if not (offset and e.code == 416):
+            raise
+
+    with open(part_path, 'rb') as f:
+        digest = _sha256(f)
+    if expected and digest != expected.lower():
+        os.remove(part_path)
+        raise ArchiveError(f"Downloaded archive has SHA-256 {digest}, expected {expected}")
+    os.replace(part_path, dest)
+    return digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download and verify the UCI student archive the app reads from.")
+    parser.add_argument('archive', nargs='?', default=os.path.join('data', ARCHIVE_NAME), help="Archive path")
+    parser.add_argument('--download', action='store_true', help="Download the archive first, resuming a partial one")
+    parser.add_argument('--url', help=f"Download URL (default: ${MIRROR_ENV_VAR}/{ARCHIVE_NAME}, else UCI)")
+    args = parser.parse_args()
+
+    if args.download:
+        part_path = args.archive + '.part'
+        if os.path.exists(part_path):
+            print(f"Resuming download at {os.path.getsize(part_path)} bytes")
+        download_archive(args.archive, args.url, expected=expected_sha256(args.archive))
+    digest = verify_archive(args.archive)
+    print(f"{args.archive}: SHA-256 {digest} ({'verified' if expected_sha256(args.archive) else 'no pinned checksum'})")
+    for member in DATASET_MEMBERS:
+        path = os.path.join(args.archive, member)
+        with open_dataset(path) as f:
+            n_lines = sum(1 for _ in f)
+        print(f"  {path}: {dataset_size(path)} bytes, {n_lines - 1} students")
+
+
+if __name__ == "__main__":
+    main()
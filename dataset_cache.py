@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+
+from dataset_archive import archive_sha256, dataset_size, open_dataset, split_member_path
+from student_performance_analysis import load_data
+
+# Bump when load_data changes what it derives so stale caches are rebuilt
+CACHE_VERSION = 2
+
+CACHE_DIR_NAME = '.cache'
+
+# Writable directory for parsed datasets and statistics, e.g. when data/ is read-only
+CACHE_DIR_ENV_VAR = 'STUDENT_APP_CACHE_DIR'
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's (or archive member's) contents."""
+    digest = hashlib.sha256()
+    with open_dataset(path) as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_dir_for(file_path):
+    """Default cache directory of a dataset: ``$STUDENT_APP_CACHE_DIR``, else ``.cache`` beside it.
+
+    For an archive member, ``.cache`` sits beside the archive.
+    """
+    configured = os.environ.get(CACHE_DIR_ENV_VAR)
+    if configured:
+        return configured
+    located = split_member_path(file_path)
+    source = located[0] if located else file_path
+    return os.path.join(os.path.dirname(os.path.abspath(source)), CACHE_DIR_NAME)
+
+
+def cache_paths(file_path, cache_dir=None):
+    """Return the ``(feather_path, sidecar_path)`` used to cache ``file_path``.
+
+    Archive members are cached under the archive's content hash, so a
+    replaced archive never serves frames parsed from the old one.
+    """
+    if cache_dir is None:
+        cache_dir = cache_dir_for(file_path)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    located = split_member_path(file_path)
+    if located:
+        name = f'{name}-{archive_sha256(located[0])[:16]}'
+    return os.path.join(cache_dir, f'{name}.feather'), os.path.join(cache_dir, f'{name}.json')
+
+
+def _source_state(file_path):
+    located = split_member_path(file_path)
+    stat = os.stat(located[0] if located else file_path)
+    return {'size': dataset_size(file_path), 'mtime_ns': stat.st_mtime_ns}
+
+
+def _cache_is_fresh(file_path, feather_path, sidecar_path, source):
+    """Check the sidecar against the source file, hashing only if mtime moved."""
+    if not (os.path.exists(feather_path) and os.path.exists(sidecar_path)):
+        return False
+    with open(sidecar_path) as f:
+        sidecar = json.load(f)
+    if sidecar.get('version') != CACHE_VERSION or sidecar.get('size') != source['size']:
+        return False
+    if sidecar.get('mtime_ns') == source['mtime_ns']:
+        return True
+
+    # Same size but touched: only the content hash can tell if it changed
+    if sidecar.get('sha256') != file_sha256(file_path):
+        return False
+    sidecar['mtime_ns'] = source['mtime_ns']
+    try:
+        _write_json(sidecar_path, sidecar)
+    except OSError:
+        pass
+    return True
+
+
+def _tmp_path(path):
+    # Unique per writer, so concurrent loads of one dataset never share a temp file
+    return f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+
+
+def _write_json(path, payload):
+    tmp_path = _tmp_path(path)
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def write_cache(df, file_path, cache_dir=None):
+    """Write a frame parsed from ``file_path`` as an uncompressed Feather file.
+
+    Uncompressed Feather can be memory-mapped on read. The sidecar records
+    the source size, mtime and content hash used to detect changes.
+    """
+    import pyarrow.feather as feather
+
+    feather_path, sidecar_path = cache_paths(file_path, cache_dir)
+    os.makedirs(os.path.dirname(feather_path), exist_ok=True)
+
+    tmp_path = _tmp_path(feather_path)
+    feather.write_feather(df, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, feather_path)
+    _write_json(sidecar_path, {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(file_path),
+        'sha256': file_sha256(file_path),
+        **_source_state(file_path),
+    })
+
+
+def read_cache(feather_path):
+    """Memory-map a cached Feather file and return it as a DataFrame."""
+    import pyarrow.feather as feather
+
+    table = feather.read_table(feather_path, memory_map=True)
+    # split_blocks lets numeric columns reference the mapped buffers without consolidation copies
+    return table.to_pandas(split_blocks=True)
+
+
+def load_data_cached(file_path, cache_dir=None):
+    """Load a dataset like ``load_data`` through a columnar on-disk cache.
+
+    The CSV is parsed and the target columns derived only when the cache is
+    missing or the source's size, mtime or content hash has changed; other
+    loads memory-map the cached Feather file. Falls back to ``load_data``
+    when pyarrow is not installed or the cache directory is not writable.
+    ``file_path`` may name a member of a zip archive, which is parsed from
+    the member stream without extracting it.
+    """
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return load_data(file_path)
+
+    feather_path, sidecar_path = cache_paths(file_path, cache_dir)
+    if _cache_is_fresh(file_path, feather_path, sidecar_path, _source_state(file_path)):
+        return read_cache(feather_path)
+
+    df = load_data(file_path)
+    try:
+        write_cache(df, file_path, cache_dir)
+    except OSError:
+        # Read-only data directory: serve the parsed frame without caching it
+        pass
+    return df
@@ -1,24 +1,28 @@
-import urllib.request
 import os
 
+from dataset_archive import ARCHIVE_NAME, archive_url, download_archive, expected_sha256
+
 def download_dataset():
-    """Download the Student Performance Dataset from UCI ML Repository."""
-    url = "https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student.zip"
-    print("Downloading dataset...")
-    
+    """Download the Student Performance Dataset from UCI ML Repository (or the configured mirror)."""
+    url = archive_url()
+    dest = os.path.join('data', ARCHIVE_NAME)
+    print(f"Downloading dataset from {url}...")
+
     try:
-        # Download the zip file
-        urllib.request.urlretrieve(url, "student.zip")
-        print("Dataset downloaded successfully!")
-        
-        # Unzip the file (you'll need to unzip it manually as it's a zip file)
-        print("\nPlease unzip the student.zip file and ensure student-mat.csv is in the current directory.")
-        print("The file student-mat.csv contains the Mathematics course data we'll be using.")
-        
+        # Resumes a previous partial download, and keeps the archive only if its checksum matches
+        if os.path.exists(dest + '.part'):
+            print(f"Resuming at {os.path.getsize(dest + '.part')} bytes")
+        digest = download_archive(dest, url, expected=expected_sha256(dest))
+        print(f"Dataset downloaded and verified (SHA-256 {digest[:16]}...)")
+
+        # No unzipping needed: the app and the training scripts read the CSVs straight from the archive
+        print(f"\nThe app reads student-mat.csv and student-por.csv directly from {dest}.")
+        print(f"To use them from the command line, pass e.g. {os.path.join(dest, 'student-mat.csv')}")
+
     except Exception as e:
         print(f"Error downloading the dataset: {e}")
-        print("\nPlease manually download the dataset from:")
+        print("\nRun this script again to resume, or manually download the dataset from:")
         print("https://archive.ics.uci.edu/ml/datasets/Student+Performance")
 
 if __name__ == "__main__":
-    download_dataset() 
\ No newline at end of file
+    download_dataset()
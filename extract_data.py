@@ -1,23 +1,31 @@
-import zipfile
 import os
 
+from dataset_archive import ARCHIVE_NAME, DATASET_MEMBERS, open_dataset, verify_archive
+
 def extract_dataset():
-    """Extract the student.zip file."""
+    """Check that both datasets can be read from student.zip.
+
+    Nothing is extracted any more: every loader reads the CSVs straight from
+    the archive members. Extracted copies under data/ are only needed to
+    append new rows, and still take precedence when present.
+    """
+    archive = os.path.join('data', ARCHIVE_NAME)
+    if not os.path.exists(archive) and os.path.exists(ARCHIVE_NAME):
+        archive = ARCHIVE_NAME
     try:
-        print("Extracting dataset...")
-        with zipfile.ZipFile('student.zip', 'r') as zip_ref:
-            zip_ref.extractall('.')
-        print("Dataset extracted successfully!")
-        
-        # Check if the file exists
-        if os.path.exists('student-mat.csv'):
-            print("Found student-mat.csv - ready for analysis!")
-        else:
-            print("Warning: student-mat.csv not found after extraction.")
-            print("Please check the contents of the extracted files.")
-            
+        print(f"Checking {archive}...")
+        digest = verify_archive(archive)
+        print(f"Checksum OK (SHA-256 {digest[:16]}...)")
+
+        # Reading each member to the end also checks its CRC-32
+        for member in DATASET_MEMBERS:
+            with open_dataset(os.path.join(archive, member)) as f:
+                n_lines = sum(1 for _ in f)
+            print(f"Found {member} ({n_lines - 1} students) - ready for analysis!")
+
     except Exception as e:
-        print(f"Error extracting the dataset: {e}")
+        print(f"Error reading the dataset archive: {e}")
+        print("Run download_data.py to download (or resume downloading) a verified copy.")
 
 if __name__ == "__main__":
-    extract_dataset() 
\ No newline at end of file
+    extract_dataset()
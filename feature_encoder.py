@@ -0,0 +1,165 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+# Numeric features used by the models, in matrix order
+NUMERIC_FEATURES = [
+    'age', 'studytime', 'failures', 'absences',
+    'G1', 'G2',  # First and second period grades
+    'Medu', 'Fedu',  # Parent's education
+    'traveltime',  # Home to school travel time
+    'freetime', 'goout', 'health'
+]
+
+# Categorical features that are one-hot encoded after the numeric block
+CATEGORICAL_FEATURES = ['school', 'sex', 'address', 'famsize', 'Pstatus',
+                        'Mjob', 'Fjob', 'reason', 'guardian', 'schoolsup',
+                        'famsup', 'paid', 'activities', 'nursery', 'higher',
+                        'internet', 'romantic']
+
+
+def _category_values(series):
+    """String levels of a column; bool flags map back to their yes/no labels."""
+    if series.dtype == bool:
+        return series.map({True: 'yes', False: 'no'})
+    return series.astype(str)
+
+
+class FeatureEncoder:
+    """Map raw student records to a fixed-order NumPy feature matrix.
+
+    The encoder is fitted once per dataset. Column order matches what
+    ``pd.get_dummies`` produced before: the numeric features followed by
+    one ``<column>_<value>`` indicator per category, categories sorted.
+    Unknown categories encode as all zeros and missing numeric columns as 0.
+    """
+
+    def __init__(self, numeric_columns=None, categorical_columns=None):
+        self.numeric_columns = list(numeric_columns or NUMERIC_FEATURES)
+        self.categorical_columns = list(categorical_columns or CATEGORICAL_FEATURES)
+        self.categories_ = None
+        self.feature_names_ = None
+
+    def fit(self, df):
+        """Learn the category levels of every categorical column."""
+        self.categories_ = {}
+        for col in self.categorical_columns:
+            if col in df.columns:
+                values = _category_values(df[col].dropna()).unique()
+                self.categories_[col] = sorted(values)
+            else:
+                self.categories_[col] = []
+
+        self.feature_names_ = list(self.numeric_columns)
+        for col in self.categorical_columns:
+            self.feature_names_.extend(f"{col}_{value}" for value in self.categories_[col])
+
+        self._build_lookups()
+        return self
+
+    def _build_lookups(self):
+        """Precompute offsets, one-hot tables and the single-row template."""
+        self._numeric_index = {col: i for i, col in enumerate(self.numeric_columns)}
+        self._offsets = {}
+        self._onehot = {}
+        self._value_index = {}
+
+        offset = len(self.numeric_columns)
+        for col in self.categorical_columns:
+            levels = self.categories_[col]
+            self._offsets[col] = offset
+            # Row k is the indicator vector for level k; the extra last row
+            # is all zeros and absorbs unknown values (code -1)
+            self._onehot[col] = np.vstack([np.eye(len(levels)), np.zeros((1, len(levels)))])
+            self._value_index[col] = {value: offset + i for i, value in enumerate(levels)}
+            offset += len(levels)
+
+        self._template = np.zeros((1, offset))
+
+    @property
+    def n_features(self):
+        return len(self.feature_names_)
+
+    def feature_groups(self):
+        """Matrix columns of each raw feature, in matrix order.
+
+        Numeric features map to their own column; a categorical maps to all
+        of its indicator columns, so it can be treated as one feature.
+        Categoricals without levels are left out.
+        """
+        self._check_fitted()
+        groups = {col: [i] for col, i in self._numeric_index.items()}
+        for col in self.categorical_columns:
+            n_levels = len(self.categories_[col])
+            if n_levels:
+                offset = self._offsets[col]
+                groups[col] = list(range(offset, offset + n_levels))
+        return groups
+
+    def _check_fitted(self):
+        if self.feature_names_ is None:
+            raise ValueError("FeatureEncoder is not fitted yet. Call fit() first.")
+
+    def transform(self, df):
+        """Encode a DataFrame of raw records into an (n_rows, n_features) array."""
+        self._check_fitted()
+        n_rows = len(df)
+        X = np.zeros((n_rows, self.n_features))
+
+        present = [col for col in self.numeric_columns if col in df.columns]
+        if present:
+            idx = [self._numeric_index[col] for col in present]
+            X[:, idx] = df[present].to_numpy(dtype=np.float64)
+
+        for col in self.categorical_columns:
+            levels = self.categories_[col]
+            if not levels or col not in df.columns:
+                continue
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Remap the existing category codes instead of materialising strings
+                codes = values.cat.set_categories(levels).cat.codes.to_numpy()
+            else:
+                codes = pd.Categorical(_category_values(values), categories=levels).codes
+            codes = np.where(codes < 0, len(levels), codes)
+            offset = self._offsets[col]
+            X[:, offset:offset + len(levels)] = self._onehot[col][codes]
+
+        return X
+
+    def transform_one(self, record):
+        """Encode a single record (a mapping of column to value) into a 1 x n array.
+
+        This skips pandas entirely and is the path used for interactive
+        predictions.
+        """
+        self._check_fitted()
+        x = self._template.copy()
+        row = x[0]
+        for col, i in self._numeric_index.items():
+            value = record.get(col)
+            if value is not None:
+                row[i] = value
+        for col, lookup in self._value_index.items():
+            value = record.get(col)
+            if value is None:
+                continue
+            if isinstance(value, (bool, np.bool_)):
+                value = 'yes' if value else 'no'
+            i = lookup.get(str(value))
+            if i is not None:
+                row[i] = 1.0
+        return x
+
+    def save(self, path):
+        """Persist the fitted encoder with joblib."""
+        self._check_fitted()
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load an encoder previously written by ``save``."""
+        encoder = joblib.load(path)
+        if not isinstance(encoder, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return encoder
@@ -0,0 +1,394 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Rows evaluated per traversal block; bounds the (rows, trees) working arrays
+DEFAULT_BLOCK_ROWS = 4096
+
+# Up to this many rows the per-tree sums are taken in one vectorised call
+# instead of a Python loop over the trees
+SMALL_BLOCK_ROWS = 32
+
+# Single-file format written by CompiledForest.save: magic, header length,
+# JSON header, then each array at an aligned offset
+FORMAT_MAGIC = b'RFOREST\x00'
+FORMAT_VERSION = 1
+FORMAT_ALIGNMENT = 64
+
+
+def _index_dtype(n_values):
+    """Narrowest unsigned integer type that can index ``n_values`` items."""
+    return np.min_scalar_type(max(n_values - 1, 0))
+
+
+def _leaves_hold_class_counts():
+    """True on scikit-learn < 1.4, whose trees store weighted class counts instead of fractions."""
+    import sklearn
+
+    major, minor = (int(part) for part in sklearn.__version__.split('.')[:2])
+    return (major, minor) < (1, 4)
+
+
+def _round_down_float32(values):
+    """Largest float32 not above each float64 value.
+
+    For a float32 ``x``, ``x <= t`` holds exactly when ``x`` is at most the
+    largest float32 not above ``t``, so split decisions are unchanged.
+    """
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def _align(offset):
+    return -(-offset // FORMAT_ALIGNMENT) * FORMAT_ALIGNMENT
+
+
+class CompiledForest:
+    """A fitted random forest flattened into compact NumPy node arrays.
+
+    The nodes of every tree are concatenated into one set of arrays:
+    ``feature`` and ``threshold`` of each split, ``children`` (row 0 left,
+    row 1 right) and ``leaf_index``, which points a leaf at its class
+    distribution in ``leaf_values``. Leaves point back at themselves. All
+    trees are walked together, one level per vectorised step.
+
+    The arrays are kept small: node and feature indices use the narrowest
+    unsigned type that fits, thresholds are float32 rounded down (the same
+    splits for float32 inputs) and identical leaf distributions are stored
+    once. ``save`` writes everything to one file that ``load`` memory-maps,
+    so processes on a host share a single copy through the page cache.
+
+    Prediction follows sklearn step by step: the attached ``scaler_`` is
+    applied in float64, rows are cast to float32 for the split comparisons,
+    and the per-tree distributions are summed in tree order before dividing
+    by the number of trees. The probabilities are therefore bit-identical to
+    ``RandomForestClassifier.predict_proba``, without its per-call input
+    validation and joblib dispatch.
+    """
+
+    ARRAYS = ['feature', 'threshold', 'children', 'leaf_index', 'leaf_values', 'roots',
+              'scaler_mean', 'scaler_scale', 'feature_importances_']
+
+    def __init__(self, feature, threshold, children, leaf_index, leaf_values, roots, max_depth, classes,
+                 n_features, scaler_mean=None, scaler_scale=None, feature_importances_=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.leaf_index = leaf_index
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.n_features = n_features
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.feature_importances_ = feature_importances_
+        self.is_leaf = children[0] == np.arange(len(feature))
+
+    @classmethod
+    def from_model(cls, model):
+        """Compile a fitted ``RandomForestClassifier`` and its ``scaler_``, if any."""
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+        n_classes = len(model.classes_)
+        counts = _leaves_hold_class_counts()
+
+        features, thresholds, lefts, rights, values, leaf_nodes, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left < 0
+            # Leaves loop back to themselves; their feature and threshold are never used
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            leaf = tree.value[is_leaf, 0, :n_classes]
+            if counts:
+                # Normalised exactly as the tree's own predict_proba does
+                totals = leaf.sum(axis=1, keepdims=True)
+                leaf = leaf / np.where(totals == 0.0, 1.0, totals)
+            values.append(leaf)
+            leaf_nodes.append(node_ids[is_leaf] + offset)
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        leaf_values, inverse = np.unique(np.concatenate(values), axis=0, return_inverse=True)
+        leaf_index = np.zeros(offset, dtype=_index_dtype(len(leaf_values)))
+        leaf_index[np.concatenate(leaf_nodes)] = inverse.ravel()
+
+        scaler = getattr(model, 'scaler_', None)
+        return cls(
+            feature=np.concatenate(features).astype(_index_dtype(model.n_features_in_)),
+            threshold=_round_down_float32(np.concatenate(thresholds)),
+            children=np.stack([np.concatenate(lefts), np.concatenate(rights)]).astype(_index_dtype(offset)),
+            leaf_index=leaf_index,
+            leaf_values=np.ascontiguousarray(leaf_values, dtype=np.float64),
+            roots=np.asarray(roots).astype(_index_dtype(offset)),
+            max_depth=max_depth,
+            classes=model.classes_,
+            n_features=model.n_features_in_,
+            scaler_mean=None if scaler is None else scaler.mean_,
+            scaler_scale=None if scaler is None else scaler.scale_,
+            feature_importances_=model.feature_importances_,
+        )
+
+    def save(self, path):
+        """Write the forest to ``path`` in the single-file, memory-mappable format."""
+        arrays = {name: np.ascontiguousarray(getattr(self, name)) for name in self.ARRAYS
+                  if getattr(self, name) is not None}
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': size}
+            size = _align(size + array.nbytes)
+        header = json.dumps({
+            'format_version': FORMAT_VERSION,
+            'classes': self.classes_.tolist(),
+            'n_features': int(self.n_features),
+            'max_depth': int(self.max_depth),
+            'arrays': layout,
+        }).encode()
+        data_start = _align(len(FORMAT_MAGIC) + 8 + len(header))
+
+        # Write beside the target and rename, so readers never map a partial file
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(FORMAT_MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(array.tobytes())
+            f.truncate(data_start + size)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Open a forest written by ``save``; with ``mmap_mode=None`` it is read into memory."""
+        with open(path, 'rb') as f:
+            if f.read(len(FORMAT_MAGIC)) != FORMAT_MAGIC:
+                raise ValueError(f"{path} is not a compiled forest file")
+            header_size = int.from_bytes(f.read(8), 'little')
+            header = json.loads(f.read(header_size))
+        if header.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled forest format in {path}")
+        data_start = _align(len(FORMAT_MAGIC) + 8 + header_size)
+
+        if mmap_mode:
+            buffer = np.memmap(path, dtype=np.uint8, mode=mmap_mode, offset=data_start)
+        else:
+            buffer = np.fromfile(path, dtype=np.uint8, offset=data_start)
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            start = spec['offset']
+            stop = start + int(np.prod(spec['shape'], dtype=np.int64)) * dtype.itemsize
+            arrays[name] = buffer[start:stop].view(dtype).reshape(spec['shape'])
+        return cls(max_depth=header['max_depth'], classes=np.asarray(header['classes']),
+                   n_features=header['n_features'], **arrays)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS if getattr(self, name) is not None)
+
+    def _prepare(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[np.newaxis]
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if self.scaler_mean is not None:
+            X = (X - self.scaler_mean) / self.scaler_scale
+        # sklearn trees compare float32 inputs against the thresholds
+        return X.astype(np.float32)
+
+    def apply(self, X):
+        """Global leaf index reached in every tree, shape ``(n_rows, n_trees)``.
+
+        ``X`` must already be scaled and cast to float32. All (row, tree)
+        pairs advance one level per step; pairs that reach a leaf drop out of
+        the working set, so each step only touches the deeper paths.
+        """
+        n_rows = len(X)
+        flat = X.ravel()
+        nodes = np.tile(self.roots, n_rows)
+        row_starts = np.repeat(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+        positions = np.arange(len(nodes))
+        leaves = np.empty(len(nodes), dtype=np.intp)
+        while len(nodes):
+            go_right = flat[row_starts + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[go_right.view(np.int8), nodes]
+            done = self.is_leaf[nodes]
+            leaves[positions[done]] = nodes[done]
+            active = ~done
+            nodes, row_starts, positions = nodes[active], row_starts[active], positions[active]
+        return leaves.reshape(n_rows, self.n_trees)
+
+    def _sum_trees(self, leaves):
+        # Add the trees strictly in order, as sklearn does, so sums match bit for bit
+        rows = self.leaf_index[leaves]
+        if len(leaves) <= SMALL_BLOCK_ROWS:
+            return np.cumsum(self.leaf_values[rows.T], axis=0)[-1]
+        total = np.zeros((len(leaves), len(self.classes_)), dtype=np.float64)
+        for tree in range(self.n_trees):
+            total += self.leaf_values[rows[:, tree]]
+        return total
+
+    def predict_proba(self, X, block_rows=DEFAULT_BLOCK_ROWS):
+        """Class probabilities for encoded (unscaled) rows, like ``model.predict_proba(scaler_.transform(X))``."""
+        X = self._prepare(X)
+        proba = np.empty((len(X), len(self.classes_)), dtype=np.float64)
+        for start in range(0, len(X), block_rows):
+            proba[start:start + block_rows] = self._sum_trees(self.apply(X[start:start + block_rows]))
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def sklearn_tree_nbytes(model):
+    """Bytes held by the node and value arrays of a fitted sklearn forest."""
+    total = 0
+    for estimator in model.estimators_:
+        state = estimator.tree_.__getstate__()
+        total += state['nodes'].nbytes + state['values'].nbytes
+    return total
+
+
+def parity_check(model, compiled, X):
+    """Number of rows whose compiled probabilities differ from sklearn in any bit."""
+    expected = model.predict_proba(model.scaler_.transform(np.asarray(X, dtype=np.float64)))
+    actual = compiled.predict_proba(X)
+    return int((expected.view(np.uint64) != actual.view(np.uint64)).any(axis=1).sum())
+
+
+def random_rows(X, n_rows, seed=0):
+    """Random encoded rows: each column drawn independently from its observed values."""
+    rng = np.random.default_rng(seed)
+    X = np.asarray(X, dtype=np.float64)
+    columns = [rng.choice(np.unique(X[:, j]), size=n_rows) for j in range(X.shape[1])]
+    return np.column_stack(columns)
+
+
+def _median_seconds(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return float(np.median(times))
+
+
+def check(datasets, n_random_rows=20_000, batch_size=10_000):
+    """Compare the stored compiled forests with sklearn bit for bit and time both.
+
+    Returns the number of mismatched rows over all models.
+    """
+    from model_store import load_or_train
+    from student_performance_analysis import load_data
+
+    failures = 0
+    for data_path in datasets:
+        model_binary, model_multi, encoder, _ = load_or_train(data_path)
+        compiled_binary, compiled_multi, _, _ = load_or_train(data_path, mmap_mode='r', compiled=True)
+        X = encoder.transform(load_data(data_path))
+        checks = np.vstack([X, random_rows(X, n_random_rows)])
+        batch = checks[np.random.default_rng(1).integers(0, len(checks), batch_size)]
+
+        for name, model, compiled in (('binary', model_binary, compiled_binary),
+                                      ('multiclass', model_multi, compiled_multi)):
+            mismatched = parity_check(model, compiled, checks)
+            mismatched += sum(parity_check(model, compiled, row[np.newaxis]) for row in checks[:200])
+            failures += mismatched
+            status = 'OK' if mismatched == 0 else f'{mismatched} MISMATCHED ROWS'
+            print(f"{data_path} [{name}] {compiled.n_trees} trees, {compiled.n_nodes} nodes, "
+                  f"depth {compiled.max_depth}: parity on {len(checks) + 200} rows {status}")
+
+            row = X[:1]
+            sk_single = _median_seconds(lambda: model.predict_proba(model.scaler_.transform(row)), 200)
+            cf_single = _median_seconds(lambda: compiled.predict_proba(row), 200)
+            sk_batch = _median_seconds(lambda: model.predict_proba(model.scaler_.transform(batch)), 5)
+            cf_batch = _median_seconds(lambda: compiled.predict_proba(batch), 5)
+            print(f"  single row: sklearn {sk_single * 1000:.3f} ms, compiled {cf_single * 1000:.3f} ms "
+                  f"({sk_single / cf_single:.0f}x)")
+            print(f"  batch of {len(batch)}: sklearn {sk_batch * 1000:.1f} ms, compiled {cf_batch * 1000:.1f} ms "
+                  f"({sk_batch / cf_batch:.1f}x)")
+    return failures
+
+
+def convert(datasets, store_dir=None):
+    """Republish each dataset's current artifact with freshly compiled forests and report their sizes.
+
+    The artifact is rewritten through ``write_artifact`` as a new version,
+    so serving processes never see a published version change in place.
+    """
+    from model_store import (COMPILED_FILES, DEFAULT_STORE_DIR, MODEL_FILES, load_history, load_or_train,
+                             write_artifact)
+
+    store_dir = store_dir or DEFAULT_STORE_DIR
+    for data_path in datasets:
+        model_binary, model_multi, encoder, metadata = load_or_train(data_path, store_dir)
+        # An incrementally updated artifact is stored under its own key, not artifact_key(data_path)
+        key = metadata['artifact_key']
+        history = load_history(os.path.join(store_dir, key))
+        models = {'binary': model_binary, 'multiclass': model_multi}
+        artifact_dir = write_artifact(store_dir, key, models, encoder, metadata, history)
+        print(f"{artifact_dir}:")
+        for model_type, model in models.items():
+            compiled_path = os.path.join(artifact_dir, COMPILED_FILES[model_type])
+            joblib_bytes = os.path.getsize(os.path.join(artifact_dir, MODEL_FILES[model_type]))
+            compiled_bytes = os.path.getsize(compiled_path)
+            print(f"  {model_type}: joblib file {joblib_bytes / 2**20:.2f} MiB, "
+                  f"sklearn tree arrays {sklearn_tree_nbytes(model) / 2**20:.2f} MiB -> "
+                  f"compiled file {compiled_bytes / 2**20:.2f} MiB ({joblib_bytes / compiled_bytes:.1f}x smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled random forest tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser(
+        'check', help="Check compiled forests against sklearn bit for bit and compare prediction latency")
+    check_parser.add_argument('datasets', nargs='*', default=['data/student-mat.csv', 'data/student-por.csv'],
+                              help="Semicolon-separated UCI dataset files")
+    check_parser.add_argument('--random-rows', type=int, default=20_000,
+                              help="Extra random encoded rows to check per model")
+    check_parser.add_argument('--batch-size', type=int, default=10_000,
+                              help="Batch size for the throughput comparison")
+
+    convert_parser = subparsers.add_parser(
+        'convert', help="Write compiled forests for trained artifacts and report the size before and after")
+    convert_parser.add_argument('datasets', nargs='*', default=['data/student-mat.csv', 'data/student-por.csv'],
+                                help="Semicolon-separated UCI dataset files")
+    convert_parser.add_argument('--store', help="Artifact store directory")
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        if check(args.datasets, args.random_rows, args.batch_size):
+            sys.exit(1)
+    else:
+        convert(args.datasets, args.store)
+
+
+if __name__ == "__main__":
+    main()
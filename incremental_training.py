@@ -0,0 +1,324 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset_archive import dataset_size, open_dataset
+from model_store import (DEFAULT_STORE_DIR, HISTORY_SAMPLE_ROWS, METADATA_FILE, artifact_key, base_metadata,
+                         data_version, history_sample, load_artifact, load_history, prefix_artifacts,
+                         train_artifact, write_artifact)
+from model_training import MODEL_TYPES, train_both_models
+from streaming import iter_chunks
+from student_performance_analysis import (holdout_mask, label_performance_class, load_data, model_params,
+                                          performance_class_edges)
+
+# Trees refitted per update; the oldest trees are dropped to make room
+DEFAULT_TREES_PER_UPDATE = 20
+
+# History rows sampled per new row, so an update's cost follows the new data
+DEFAULT_HISTORY_RATIO = 1.0
+
+# Lower bound on sampled history rows, so small updates still see the old data
+MIN_HISTORY_ROWS = 200
+
+# History rows added per class the window would otherwise lack
+MIN_CLASS_ROWS = 5
+
+# Share of rows whose class may move with the quartile edges before updates give way to a full retrain
+MAX_CLASS_DRIFT = 0.05
+
+
+def find_base_artifact(data_path, store_dir=DEFAULT_STORE_DIR, params=None):
+    """Newest artifact for ``data_path`` and ``params`` trained on a strict prefix of the current file.
+
+    Returns ``(artifact_dir, metadata)``, or ``None`` if no artifact can be extended.
+    """
+    size = dataset_size(data_path)
+    candidates = [c for c in prefix_artifacts(data_path, store_dir, params) if c[0] < size]
+    if not candidates:
+        return None
+    _, _, artifact_dir, metadata = max(candidates, key=lambda c: (c[0], c[1]))
+    return artifact_dir, metadata
+
+
+def _range_sha256(data_path, start, end, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open_dataset(data_path) as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _ends_with_newline(data_path, size):
+    with open_dataset(data_path) as f:
+        f.seek(size - 1)
+        return f.read(1) == b'\n'
+
+
+def merge_history(history, new, n_old, rng, size=HISTORY_SAMPLE_ROWS):
+    """Uniform sample of ``n_old`` history rows plus all ``new`` rows, from a uniform sample of the history.
+
+    ``history`` samples the first ``n_old`` rows. The count taken from the
+    new rows is hypergeometric, which keeps every row of the combined data
+    equally likely to be in the result.
+    """
+    n_history, n_new = len(history['G3']), len(new['G3'])
+    n_sample = min(size, n_old + n_new)
+    from_new = rng.hypergeometric(n_new, n_old, n_sample) if n_sample < n_old + n_new else n_new
+    keep_history = np.sort(rng.choice(n_history, n_sample - from_new, replace=False))
+    keep_new = np.sort(rng.choice(n_new, from_new, replace=False))
+    return {name: np.concatenate([history[name][keep_history], new[name][keep_new]]) for name in history}
+
+
+def class_drift(sample_g3, sample_labels):
+    """Share of sampled rows whose multiclass label moves if the quartile edges are recomputed."""
+    current = np.asarray(label_performance_class(sample_g3, performance_class_edges(sample_g3)).astype(str))
+    return float(np.mean(current != sample_labels))
+
+
+def _training_window(history_labels, new_labels, classes, history_ratio, rng):
+    """Positions of the sampled history training rows to refit on alongside all new training rows."""
+    n_history = min(len(history_labels), max(MIN_HISTORY_ROWS, int(len(new_labels) * history_ratio)))
+    window = rng.choice(len(history_labels), n_history, replace=False)
+
+    # Every tree in a forest predicts over the same classes, so the window must cover them all
+    covered = set(np.asarray(new_labels).tolist()) | set(history_labels[window].tolist())
+    for cls in classes:
+        if cls not in covered:
+            pool = np.flatnonzero(history_labels == cls)
+            window = np.concatenate([window, rng.choice(pool, min(MIN_CLASS_ROWS, len(pool)), replace=False)])
+    return np.sort(window)
+
+
+def add_trees(model, X, y, n_new, max_trees, random_state, n_jobs=None, class_weight=None):
+    """Grow ``n_new`` trees on ``(X, y)`` with ``warm_start`` and drop the oldest beyond ``max_trees``.
+
+    ``X`` is unscaled; the model's own ``scaler_`` is applied so the new
+    trees split on the same scale as the old ones. ``class_weight``
+    overrides the model's setting for this fit only. Returns the number of
+    trees dropped.
+    """
+    classes = model.classes_
+    configured_weight = model.class_weight
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new, random_state=random_state,
+                     n_jobs=n_jobs, class_weight=configured_weight if class_weight is None else class_weight)
+    model.fit(model.scaler_.transform(X), y)
+    model.set_params(warm_start=False, n_jobs=None, class_weight=configured_weight)
+    if not np.array_equal(model.classes_, classes):
+        raise ValueError("The update window does not cover the model's classes")
+
+    dropped = max(0, len(model.estimators_) - max_trees)
+    if dropped:
+        model.estimators_ = model.estimators_[dropped:]
+        model.n_estimators = len(model.estimators_)
+    return dropped
+
+
+def _update_versions(runs, version, n_new, dropped):
+    """Append ``n_new`` trees of ``version`` to the oldest-first run list and trim ``dropped``."""
+    runs = [list(run) for run in runs]
+    if runs and runs[-1][0] == version:
+        runs[-1][1] += n_new
+    else:
+        runs.append([version, n_new])
+    while dropped:
+        take = min(dropped, runs[0][1])
+        runs[0][1] -= take
+        dropped -= take
+        if not runs[0][1]:
+            runs.pop(0)
+    return runs
+
+
+def update_artifact(data_path, store_dir=DEFAULT_STORE_DIR, params=None, trees_per_update=DEFAULT_TREES_PER_UPDATE,
+                    history_ratio=DEFAULT_HISTORY_RATIO, max_trees=None, n_workers=None,
+                    max_class_drift=MAX_CLASS_DRIFT):
+    """Bring the artifact for ``data_path`` up to date by refitting only part of each forest.
+
+    When rows have been appended since the newest usable artifact was
+    trained, only the appended bytes are hashed and parsed. The older rows
+    come from the base artifact's history sample (see
+    ``model_store.history_sample``). ``trees_per_update`` trees per model
+    are grown with ``warm_start`` on the new training rows plus a random
+    sample of the older ones (``history_ratio`` history rows per new row).
+    The oldest trees are then dropped so each forest keeps at most
+    ``max_trees`` trees (default: the configured ``n_estimators``). Both
+    I/O and fitting therefore follow the number of new rows, not the size
+    of the history.
+
+    New rows get multiclass labels from the base artifact's frozen
+    ``class_edges``, so the retained trees and the new ones share the same
+    class definitions. Appended rows can move the quartile edges. If
+    recomputed edges would relabel more than ``max_class_drift`` of the rows
+    (estimated on the history sample), the models are fully retrained.
+
+    The encoder and scaler of the base artifact are kept, so categories
+    first seen in the new rows encode as all zeros until the next full
+    retrain. Holdout rows come from ``holdout_mask`` and are never trained
+    on. Holdout accuracy is measured on the updated history sample, which
+    holds every row of datasets below ``HISTORY_SAMPLE_ROWS``.
+    ``tree_versions`` in the metadata records, oldest first, how many trees
+    were fitted on each data version. Falls back to ``train_artifact`` when
+    no artifact can be extended. Returns the artifact directory.
+    """
+    size = dataset_size(data_path)
+    covering = [c for c in prefix_artifacts(data_path, store_dir, params) if c[0] == size]
+    if covering:
+        return max(covering, key=lambda c: c[1])[2]
+    base = find_base_artifact(data_path, store_dir, params)
+    if base is None:
+        return train_artifact(data_path, store_dir, params, n_workers=n_workers)
+    base_dir, base_meta = base
+    # A partially written last line is left for the next update
+    if not _ends_with_newline(data_path, size):
+        return base_dir
+
+    from sklearn.metrics import accuracy_score
+
+    started = time.perf_counter()
+    timings = {}
+    offset, n_old, class_edges = base_meta['dataset_bytes'], base_meta['n_rows'], base_meta['class_edges']
+    # Chained with the base's hash, so each data state still gets its own key without re-reading the history
+    data_hash = hashlib.sha256(
+        f"{base_meta['dataset_sha256']}+{_range_sha256(data_path, offset, size)}".encode()).hexdigest()
+    key = artifact_key(data_path, params, data_hash=data_hash)
+    seed = int(data_hash[:8], 16)
+    rng = np.random.default_rng(seed)
+
+    new = pd.concat(iter_chunks(data_path, offset=offset), ignore_index=True)
+    new['performance_class'] = label_performance_class(new['G3'], class_edges)
+    n_rows = n_old + len(new)
+    model_binary, model_multi, encoder, _ = load_artifact(base_dir)
+    models = {'binary': model_binary, 'multiclass': model_multi}
+    history = load_history(base_dir)
+    new_holdout = holdout_mask(n_rows)[n_old:]
+    new_sample = history_sample(encoder.transform(new), new, new_holdout, seed, size=len(new))
+    merged = merge_history(history, new_sample, n_old, rng)
+    timings['read'] = time.perf_counter() - started
+
+    drift = class_drift(merged['G3'], merged['multiclass'])
+    if drift > max_class_drift:
+        return train_artifact(data_path, store_dir, params, n_workers=n_workers)
+
+    metadata = base_metadata(data_path, key, data_hash, n_rows, encoder, class_edges)
+    metadata['params'] = base_meta['params']
+    metadata['incremental'] = {
+        'base_artifact': base_meta['artifact_key'],
+        'updates': base_meta.get('incremental', {}).get('updates', 0) + 1,
+        'new_rows': len(new),
+        'class_drift': round(drift, 4),
+        'window_rows': {},
+    }
+    version = data_version(data_hash)
+    history_train = ~history['holdout']
+    new_train = ~new_holdout
+    merged_train = ~merged['holdout']
+
+    for model_type in MODEL_TYPES:
+        model = models[model_type]
+        stage_started = time.perf_counter()
+        history_labels = history[model_type][history_train]
+        new_labels = new_sample[model_type][new_train]
+        window = _training_window(history_labels, new_labels, model.classes_, history_ratio, rng)
+        X = np.vstack([history['X'][history_train][window], new_sample['X'][new_train]])
+        y = np.concatenate([history_labels[window], new_labels])
+        limit = max_trees or model_params(model_type, params)['n_estimators']
+        class_weight = None
+        if model.class_weight == 'balanced':
+            # Balance by all training rows, as sampled; the window alone over-represents the new rows
+            from sklearn.utils.class_weight import compute_class_weight
+            weights = compute_class_weight('balanced', classes=model.classes_, y=merged[model_type][merged_train])
+            class_weight = dict(zip(model.classes_, weights))
+        dropped = add_trees(model, X, y, min(trees_per_update, limit), limit, seed, n_jobs=n_workers,
+                            class_weight=class_weight)
+        timings[f'fit_{model_type}'] = time.perf_counter() - stage_started
+
+        y_pred = model.predict(model.scaler_.transform(merged['X'][~merged_train]))
+        metadata['metrics'][model_type] = {'accuracy': float(accuracy_score(merged[model_type][~merged_train], y_pred))}
+        metadata['tree_versions'][model_type] = _update_versions(
+            base_meta['tree_versions'][model_type], version, min(trees_per_update, limit), dropped)
+        metadata['incremental']['window_rows'][model_type] = len(y)
+
+    timings['total'] = time.perf_counter() - started
+    metadata['timings'] = {stage: round(seconds, 3) for stage, seconds in timings.items()}
+    metadata['training_seconds'] = round(timings['total'], 3)
+    return write_artifact(store_dir, key, models, encoder, metadata, merged)
+
+
+def compare_with_full_retrain(data_path, artifact_dir, params=None, n_workers=None):
+    """Holdout accuracy and fit time of an updated artifact next to a full retrain on the same data.
+
+    The full retrain uses the same ``holdout_mask`` rows and is not saved.
+    It labels classes with the current file's quartile edges, while the
+    update keeps the edges it was trained with.
+    """
+    from sklearn.metrics import accuracy_score
+
+    with open(os.path.join(artifact_dir, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    df = load_data(data_path)
+    results, timings = train_both_models(df, n_workers=n_workers, params=params, holdout=holdout_mask(len(df)))
+    report = {}
+    for model_type in MODEL_TYPES:
+        _, _, _, _, y_test, y_pred = results[model_type]
+        report[model_type] = {
+            'incremental_accuracy': metadata['metrics'][model_type]['accuracy'],
+            'full_accuracy': float(accuracy_score(y_test, y_pred)),
+            'incremental_seconds': metadata['timings'].get(f'fit_{model_type}'),
+            'full_seconds': timings[f'fit_{model_type}'],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update model artifacts with rows appended to their datasets.")
+    parser.add_argument('datasets', nargs='*',
+                        default=['data/student-mat.csv', 'data/student-por.csv'],
+                        help="Semicolon-separated UCI dataset files")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help="Artifact store directory")
+    parser.add_argument('--n-estimators', type=int, help="Number of trees per forest")
+    parser.add_argument('--trees-per-update', type=int, default=DEFAULT_TREES_PER_UPDATE,
+                        help="Trees refitted per model on each update")
+    parser.add_argument('--history-ratio', type=float, default=DEFAULT_HISTORY_RATIO,
+                        help="History rows sampled per new row")
+    parser.add_argument('--max-trees', type=int, help="Forest size bound (default: --n-estimators)")
+    parser.add_argument('--workers', type=int, help="CPU cores to fit with (default: one)")
+    parser.add_argument('--compare', action='store_true', help="Also run a full retrain and compare holdout accuracy")
+    args = parser.parse_args()
+
+    params = {'n_estimators': args.n_estimators} if args.n_estimators else None
+    for data_path in args.datasets:
+        print(f"Updating models for {data_path}...")
+        artifact_dir = update_artifact(data_path, args.store, params, args.trees_per_update,
+                                       args.history_ratio, args.max_trees, n_workers=args.workers)
+        with open(os.path.join(artifact_dir, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        print(f"- saved to {artifact_dir}")
+        incremental = metadata.get('incremental')
+        if incremental:
+            print(f"- {incremental['new_rows']} new rows, update #{incremental['updates']} "
+                  f"of {incremental['base_artifact']}, fit in {metadata['training_seconds']:.3f}s")
+        for model_type, runs in metadata['tree_versions'].items():
+            print(f"- {model_type} trees by data version: "
+                  + ', '.join(f"{version} x{count}" for version, count in runs))
+        if args.compare:
+            for model_type, row in compare_with_full_retrain(data_path, artifact_dir, params, args.workers or 1).items():
+                incremental_fit = row['incremental_seconds']
+                print(f"- {model_type} holdout accuracy: incremental {row['incremental_accuracy']:.3f}, "
+                      f"full retrain {row['full_accuracy']:.3f}; fit "
+                      f"{'n/a' if incremental_fit is None else f'{incremental_fit:.3f}s'} vs "
+                      f"{row['full_seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Histogram bucket upper bounds in seconds, as exported to Prometheus
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Recent observations per stage used for the p50/p95/p99 summaries
+QUANTILE_WINDOW = 1024
+
+METRIC_PREFIX = 'student_app'
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+class StageTiming:
+    """Timing histogram, call count and row count of one instrumented stage."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=QUANTILE_WINDOW):
+        self.buckets = buckets
+        self.bucket_counts = np.zeros(len(buckets) + 1, dtype=np.int64)
+        self.count = 0
+        self.sum = 0.0
+        self.rows = 0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds, rows=None):
+        self.bucket_counts[np.searchsorted(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if rows is not None:
+            self.rows += int(rows)
+        self.recent.append(seconds)
+
+    def quantiles(self):
+        if not self.recent:
+            return {'p50': None, 'p95': None, 'p99': None}
+        p50, p95, p99 = np.percentile(np.asarray(self.recent), [50, 95, 99])
+        return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+
+class _Observation:
+    """Handed out by ``MetricsRegistry.timer`` so the caller can report rows processed."""
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+
+class MetricsRegistry:
+    """Process-wide timings, counters and cache statistics of the hot paths.
+
+    Stages are timed with ``timer(stage, **labels)`` and land in a
+    fixed-bucket histogram (for Prometheus and SLOs) plus a window of recent
+    samples (for live p50/p95/p99). ``count`` keeps plain counters.
+    Streamlit caches report lookups with ``cache_request`` outside the cached
+    function and ``cache_miss`` inside it. Caches that keep their own
+    statistics register a ``stats()`` callable with ``register_cache``.
+
+    Recording is a few arithmetic operations under a lock, cheap enough to
+    leave on in production.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=QUANTILE_WINDOW):
+        self.buckets = buckets
+        self.window = window
+        self.started = time.time()
+        self._timings = {}
+        self._counters = {}
+        self._cache_stats = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds, rows=None, **labels):
+        key = (stage, _label_key(labels))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = StageTiming(self.buckets, self.window)
+            timing.observe(seconds, rows)
+
+    @contextmanager
+    def timer(self, stage, rows=None, **labels):
+        observation = _Observation(rows)
+        started = time.perf_counter()
+        try:
+            yield observation
+        finally:
+            self.observe(stage, time.perf_counter() - started, observation.rows, **labels)
+
+    def count(self, name, value=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def cache_request(self, cache):
+        self.count('cache_requests', cache=cache)
+
+    def cache_miss(self, cache):
+        self.count('cache_misses', cache=cache)
+
+    def register_cache(self, cache, stats):
+        """Report ``stats()`` (a dict with ``hits`` and ``misses``) under ``cache``."""
+        with self._lock:
+            self._cache_stats[cache] = stats
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def _cache_summary(self, counters, collectors):
+        caches = {}
+        for (name, labels), value in counters.items():
+            if name in ('cache_requests', 'cache_misses'):
+                cache = dict(labels)['cache']
+                caches.setdefault(cache, {'requests': 0, 'misses': 0})[name[len('cache_'):]] = value
+        for entry in caches.values():
+            entry['hits'] = entry['requests'] - entry['misses']
+        for cache, stats in collectors.items():
+            entry = dict(stats())
+            entry.setdefault('requests', entry.get('hits', 0) + entry.get('misses', 0))
+            caches[cache] = entry
+        for entry in caches.values():
+            entry['hit_rate'] = entry['hits'] / entry['requests'] if entry['requests'] else None
+        return caches
+
+    def snapshot(self):
+        """All metrics as a JSON-serialisable dict."""
+        with self._lock:
+            timings = [(stage, dict(labels), timing.count, timing.sum, timing.rows,
+                        timing.quantiles(), timing.bucket_counts.tolist())
+                       for (stage, labels), timing in self._timings.items()]
+            counters = dict(self._counters)
+            collectors = dict(self._cache_stats)
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'stages': [
+                {'stage': stage, 'labels': labels, 'count': count, 'sum_seconds': total, 'rows': rows,
+                 'p50_seconds': q['p50'], 'p95_seconds': q['p95'], 'p99_seconds': q['p99'],
+                 'buckets': dict(zip([*map(str, self.buckets), '+Inf'], np.cumsum(buckets).tolist()))}
+                for stage, labels, count, total, rows, q, buckets in sorted(timings, key=lambda t: (t[0], sorted(t[1].items())))
+            ],
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in sorted(counters.items())],
+            'caches': self._cache_summary(counters, collectors),
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        stage_metric = f'{METRIC_PREFIX}_stage_seconds'
+        rows_metric = f'{METRIC_PREFIX}_stage_rows_total'
+        lines = [f'# HELP {stage_metric} Time spent in an instrumented stage.',
+                 f'# TYPE {stage_metric} histogram']
+        for entry in snapshot['stages']:
+            base = [('stage', entry['stage']), *sorted(entry['labels'].items())]
+            for bound, cumulative in entry['buckets'].items():
+                lines.append(f'{stage_metric}_bucket{_format_labels(base + [("le", bound)])} {cumulative}')
+            lines.append(f'{stage_metric}_sum{_format_labels(base)} {entry["sum_seconds"]!r}')
+            lines.append(f'{stage_metric}_count{_format_labels(base)} {entry["count"]}')
+        lines += [f'# HELP {rows_metric} Rows processed by an instrumented stage.',
+                  f'# TYPE {rows_metric} counter']
+        for entry in snapshot['stages']:
+            base = [('stage', entry['stage']), *sorted(entry['labels'].items())]
+            lines.append(f'{rows_metric}{_format_labels(base)} {entry["rows"]}')
+
+        for name in sorted({c['name'] for c in snapshot['counters']}):
+            metric = f'{METRIC_PREFIX}_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            for counter in snapshot['counters']:
+                if counter['name'] == name:
+                    lines.append(f'{metric}{_format_labels(sorted(counter["labels"].items()))} {counter["value"]}')
+
+        for stat in ('hits', 'misses', 'hit_rate'):
+            metric = f'{METRIC_PREFIX}_cache_{stat}'
+            lines.append(f'# TYPE {metric} gauge')
+            for cache, entry in sorted(snapshot['caches'].items()):
+                if entry.get(stat) is not None:
+                    lines.append(f'{metric}{_format_labels([("cache", cache)])} {entry[stat]}')
+        return '\n'.join(lines) + '\n'
+
+
+# Shared by every session and thread of the process
+REGISTRY = MetricsRegistry()
+
+
+def _handler_for(registry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] == '/metrics':
+                body, content_type = registry.to_prometheus(), 'text/plain; version=0.0.4'
+            elif self.path.split('?')[0] == '/metrics.json':
+                body, content_type = registry.to_json(), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_http_server(port, host='127.0.0.1', registry=REGISTRY):
+    """Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _handler_for(registry))
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch metrics from a running app or scoring service.")
+    parser.add_argument('url', help="Metrics URL, e.g. http://127.0.0.1:9464/metrics.json")
+    args = parser.parse_args()
+
+    from urllib.request import urlopen
+
+    with urlopen(args.url) as response:
+        body = response.read().decode()
+    if not args.url.endswith('.json'):
+        print(body, end='')
+        return
+    snapshot = json.loads(body)
+    print(f"{'stage':<32} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows':>10}")
+    for entry in snapshot['stages']:
+        name = entry['stage'] + ''.join(f"[{k}={v}]" for k, v in entry['labels'].items())
+        p50, p95, p99 = (entry[f'{q}_seconds'] * 1000 for q in ('p50', 'p95', 'p99'))
+        print(f"{name:<32} {entry['count']:>8} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f} {entry['rows']:>10}")
+    for cache, entry in snapshot['caches'].items():
+        rate = 'n/a' if entry['hit_rate'] is None else f"{entry['hit_rate'] * 100:.1f}%"
+        print(f"cache {cache}: {entry['hits']} hits / {entry['requests']} requests ({rate})")
+
+
+if __name__ == "__main__":
+    main()
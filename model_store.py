@@ -0,0 +1,334 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import joblib
+import numpy as np
+
+from aggregate_store import file_tail_digest
+from dataset_archive import dataset_size
+from dataset_cache import file_sha256
+from feature_encoder import FeatureEncoder
+from forest_engine import CompiledForest
+from model_training import MODEL_TYPES, format_timings, train_both_models
+from student_performance_analysis import holdout_mask, load_data, model_params, performance_class_edges
+
+# Bump when the artifact layout or training recipe changes so old artifacts are ignored
+ARTIFACT_VERSION = 4
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+MODEL_FILES = {
+    'binary': 'model_binary.joblib',
+    'multiclass': 'model_multi.joblib',
+}
+# Compact, memory-mappable copies of the forests used for serving
+COMPILED_FILES = {
+    'binary': 'model_binary.forest',
+    'multiclass': 'model_multi.forest',
+}
+ENCODER_FILE = 'encoder.joblib'
+METADATA_FILE = 'metadata.json'
+# Uniform sample of the encoded rows, so updates need not re-read the history
+HISTORY_FILE = 'history.npz'
+
+# Rows kept in an artifact's history sample
+HISTORY_SAMPLE_ROWS = 5000
+
+# Unpublished or superseded version directories older than this are removed on the next write
+STALE_VERSION_SECONDS = 300
+
+
+def dataset_fingerprint(data_path):
+    """Return the SHA-256 hex digest of a dataset file's contents."""
+    return file_sha256(data_path)
+
+
+def _model_defining_params(params):
+    """Drop settings such as ``n_jobs`` that do not change the fitted model."""
+    return {k: v for k, v in (params or {}).items() if k != 'n_jobs'}
+
+
+def artifact_key(data_path, params=None, data_hash=None):
+    """Directory name for the artifact trained on ``data_path`` with ``params``.
+
+    The key combines the dataset name, its content hash, the artifact version
+    and the resolved hyperparameters of both models.
+    """
+    if data_hash is None:
+        data_hash = dataset_fingerprint(data_path)
+    params = _model_defining_params(params)
+    resolved = {
+        'version': ARTIFACT_VERSION,
+        'binary': model_params('binary', params),
+        'multiclass': model_params('multiclass', params),
+    }
+    params_hash = hashlib.sha256(json.dumps(resolved, sort_keys=True).encode()).hexdigest()
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    return f"{name}-{data_hash[:16]}-{params_hash[:12]}"
+
+
+def model_version(metadata):
+    """Identifier of one trained pair of models; changes whenever they are retrained."""
+    return f"{metadata['artifact_key']}@{metadata['created_at']}"
+
+
+def data_version(data_hash):
+    """Short label of a dataset state, as recorded per tree in ``tree_versions``."""
+    return data_hash[:16]
+
+
+def base_metadata(data_path, key, data_hash, n_rows, encoder, class_edges):
+    """Metadata fields shared by fully trained and incrementally updated artifacts.
+
+    ``dataset_bytes`` and ``tail_digest`` let a later update check that the
+    rows this artifact was trained on are still the start of the file.
+    ``class_edges`` are the grade quartile edges the multiclass labels were
+    cut at; updates label new rows with the same edges.
+    """
+    size = dataset_size(data_path)
+    return {
+        'artifact_version': ARTIFACT_VERSION,
+        'artifact_key': key,
+        'dataset': os.path.basename(data_path),
+        'dataset_sha256': data_hash,
+        'dataset_bytes': size,
+        'tail_digest': file_tail_digest(data_path, size),
+        'n_rows': n_rows,
+        'class_edges': class_edges,
+        'feature_columns': encoder.feature_names_,
+        'params': {},
+        'metrics': {},
+        'tree_versions': {},
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def history_sample(X, df, holdout, seed, size=HISTORY_SAMPLE_ROWS):
+    """Uniform sample of up to ``size`` rows: encoded features, both targets, G3 and the holdout flag."""
+    rows = np.arange(len(df))
+    if len(rows) > size:
+        rows = np.sort(np.random.default_rng(seed).choice(rows, size, replace=False))
+    return {
+        'X': np.asarray(X, dtype=np.float32)[rows],
+        'binary': np.asarray(df['performance_binary'])[rows],
+        'multiclass': np.asarray(df['performance_class'].astype(str), dtype=str)[rows],
+        'G3': np.asarray(df['G3'])[rows],
+        'holdout': np.asarray(holdout)[rows],
+    }
+
+
+def load_history(artifact_dir):
+    with np.load(os.path.join(artifact_dir, HISTORY_FILE)) as history:
+        return {name: history[name] for name in history.files}
+
+
+def _remove_stale_versions(store_dir, key, keep):
+    now = time.time()
+    for entry in os.listdir(store_dir):
+        path = os.path.join(store_dir, entry)
+        if not entry.startswith(f'.{key}.') or entry in keep or now - os.lstat(path).st_mtime <= STALE_VERSION_SECONDS:
+            continue
+        if os.path.islink(path):
+            os.remove(path)
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _publish(store_dir, key, version):
+    """Point the symlink ``store_dir/key`` at the directory ``version`` with one atomic rename."""
+    artifact_dir = os.path.join(store_dir, key)
+    link_path = os.path.join(store_dir, f'{version}.link')
+    try:
+        os.symlink(version, link_path)
+    except OSError:
+        # No symlinks on this filesystem (e.g. Windows without developer mode): swap the directory
+        if os.path.isdir(artifact_dir):
+            shutil.rmtree(artifact_dir)
+        os.replace(os.path.join(store_dir, version), artifact_dir)
+        return
+    previous = os.readlink(artifact_dir) if os.path.islink(artifact_dir) else None
+    if previous is None and os.path.isdir(artifact_dir):
+        # A plain directory from before artifacts were versioned; moved aside once
+        previous = f'.{key}.{uuid.uuid4().hex[:12]}'
+        os.replace(artifact_dir, os.path.join(store_dir, previous))
+    os.replace(link_path, artifact_dir)
+    # The replaced version stays for readers that are still loading it
+    _remove_stale_versions(store_dir, key, keep={version, previous})
+
+
+def write_artifact(store_dir, key, models, encoder, metadata, history):
+    """Write ``models`` (model type -> fitted forest), the encoder, metadata and history sample as artifact ``key``.
+
+    Each write goes into a fresh version directory, ``.<key>.<id>``, and
+    ``store_dir/<key>`` is a symlink that is then swapped to it with one
+    atomic rename. Readers see the old artifact or the new one, never a
+    partial or missing one. Returns the artifact directory.
+    """
+    artifact_dir = os.path.join(store_dir, key)
+    os.makedirs(store_dir, exist_ok=True)
+    version = f'.{key}.{uuid.uuid4().hex[:12]}'
+    # Unlike mkdtemp, which creates 0700 directories, mkdir applies the umask
+    tmp_dir = os.path.join(store_dir, f'{version}.tmp')
+    os.mkdir(tmp_dir)
+    try:
+        for model_type, filename in MODEL_FILES.items():
+            joblib.dump(models[model_type], os.path.join(tmp_dir, filename))
+            CompiledForest.from_model(models[model_type]).save(os.path.join(tmp_dir, COMPILED_FILES[model_type]))
+        encoder.save(os.path.join(tmp_dir, ENCODER_FILE))
+        np.savez(os.path.join(tmp_dir, HISTORY_FILE), **history)
+        with open(os.path.join(tmp_dir, METADATA_FILE), 'w') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_dir, os.path.join(store_dir, version))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    _publish(store_dir, key, version)
+    return artifact_dir
+
+
+def train_artifact(data_path, store_dir=DEFAULT_STORE_DIR, params=None, n_workers=None):
+    """Train both models on ``data_path`` and write them to the artifact store.
+
+    The artifact directory holds the two fitted forests (each with its
+    ``scaler_`` attached), their compact ``CompiledForest`` copies, the
+    fitted ``FeatureEncoder`` and a ``metadata.json`` with the feature
+    columns, hyperparameters, holdout metrics, the data version every tree
+    was trained on and stage timings, plus a ``history_sample`` of the rows
+    for later updates. Both models are trained concurrently by
+    ``train_both_models`` using up to ``n_workers`` cores. The holdout rows
+    come from ``holdout_mask``, so they stay held out when
+    ``incremental_training`` later adds trees for appended rows. Returns the
+    artifact directory.
+    """
+    data_hash = dataset_fingerprint(data_path)
+    key = artifact_key(data_path, params, data_hash=data_hash)
+
+    started = time.perf_counter()
+    df = load_data(data_path)
+    encoder = FeatureEncoder().fit(df)
+    holdout = holdout_mask(len(df))
+    metadata = base_metadata(data_path, key, data_hash, len(df), encoder, performance_class_edges(df['G3']))
+
+    from sklearn.metrics import accuracy_score
+
+    results, timings = train_both_models(df, encoder=encoder, n_workers=n_workers, params=params,
+                                         holdout=holdout)
+    models = {}
+    for model_type in MODEL_TYPES:
+        model, _, _, _, y_test, y_pred = results[model_type]
+        models[model_type] = model
+        metadata['params'][model_type] = model_params(model_type, _model_defining_params(params))
+        metadata['metrics'][model_type] = {'accuracy': float(accuracy_score(y_test, y_pred))}
+        metadata['tree_versions'][model_type] = [[data_version(data_hash), len(model.estimators_)]]
+
+    metadata['timings'] = {stage: round(seconds, 3) for stage, seconds in timings.items()}
+    metadata['training_seconds'] = round(time.perf_counter() - started, 3)
+    history = history_sample(encoder.transform(df), df, holdout, seed=int(data_hash[:8], 16))
+    return write_artifact(store_dir, key, models, encoder, metadata, history)
+
+
+def load_artifact(artifact_dir, mmap_mode=None, compiled=False):
+    """Load ``(model_binary, model_multi, encoder, metadata)`` from an artifact directory.
+
+    With ``compiled=True`` the models are the ``CompiledForest`` copies,
+    which predict identically and do not need sklearn. ``mmap_mode`` is
+    passed to the loader so the tree arrays can be memory-mapped instead of
+    copied into each process.
+    """
+    # Resolve the symlink once, so every file comes from the same version
+    artifact_dir = os.path.realpath(artifact_dir)
+    with open(os.path.join(artifact_dir, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    if metadata.get('artifact_version') != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported artifact version in {artifact_dir}")
+
+    if compiled:
+        model_binary = CompiledForest.load(os.path.join(artifact_dir, COMPILED_FILES['binary']), mmap_mode=mmap_mode)
+        model_multi = CompiledForest.load(os.path.join(artifact_dir, COMPILED_FILES['multiclass']),
+                                          mmap_mode=mmap_mode)
+    else:
+        model_binary = joblib.load(os.path.join(artifact_dir, MODEL_FILES['binary']), mmap_mode=mmap_mode)
+        model_multi = joblib.load(os.path.join(artifact_dir, MODEL_FILES['multiclass']), mmap_mode=mmap_mode)
+    encoder = FeatureEncoder.load(os.path.join(artifact_dir, ENCODER_FILE))
+    return model_binary, model_multi, encoder, metadata
+
+
+def _params_hash(key):
+    return key.rsplit('-', 1)[1]
+
+
+def prefix_artifacts(data_path, store_dir=DEFAULT_STORE_DIR, params=None):
+    """Artifacts for ``data_path`` and ``params`` trained on a prefix of the current file.
+
+    A candidate qualifies when the file has only grown since it was
+    trained, i.e. the bytes just before its recorded size are unchanged.
+    Returns ``(dataset_bytes, created_at, artifact_dir, metadata)`` tuples.
+    """
+    if not os.path.isdir(store_dir):
+        return []
+    name = os.path.basename(data_path)
+    wanted = _params_hash(artifact_key(data_path, params, data_hash=''))
+    size = dataset_size(data_path)
+
+    candidates = []
+    for entry in os.listdir(store_dir):
+        path = os.path.join(store_dir, entry, METADATA_FILE)
+        if entry.startswith('.') or not os.path.exists(path):
+            continue
+        with open(path) as f:
+            metadata = json.load(f)
+        if (metadata.get('artifact_version') != ARTIFACT_VERSION or metadata.get('dataset') != name
+                or _params_hash(metadata['artifact_key']) != wanted):
+            continue
+        offset = metadata['dataset_bytes']
+        if offset <= size and file_tail_digest(data_path, offset) == metadata['tail_digest']:
+            candidates.append((offset, metadata['created_at'], os.path.dirname(path), metadata))
+    return candidates
+
+
+def load_or_train(data_path, store_dir=DEFAULT_STORE_DIR, params=None, mmap_mode=None, compiled=False):
+    """Load the artifact matching ``data_path`` and ``params``, training it on a cache miss.
+
+    An incrementally updated artifact that covers the whole current file
+    counts as a match.
+    """
+    artifact_dir = os.path.join(store_dir, artifact_key(data_path, params))
+    if not os.path.exists(os.path.join(artifact_dir, METADATA_FILE)):
+        size = dataset_size(data_path)
+        covering = [c for c in prefix_artifacts(data_path, store_dir, params) if c[0] == size]
+        if covering:
+            artifact_dir = max(covering, key=lambda c: c[1])[2]
+        else:
+            artifact_dir = train_artifact(data_path, store_dir, params)
+    return load_artifact(artifact_dir, mmap_mode=mmap_mode, compiled=compiled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train model artifacts for the student performance app.")
+    parser.add_argument('datasets', nargs='*',
+                        default=['data/student-mat.csv', 'data/student-por.csv'],
+                        help="Semicolon-separated UCI dataset files to train on")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help="Artifact store directory")
+    parser.add_argument('--n-estimators', type=int, help="Number of trees per forest")
+    parser.add_argument('--workers', type=int, help="Total CPU cores to train with (default: all)")
+    args = parser.parse_args()
+
+    params = {'n_estimators': args.n_estimators} if args.n_estimators else None
+    for data_path in args.datasets:
+        print(f"Training models for {data_path}...")
+        artifact_dir = train_artifact(data_path, args.store, params, n_workers=args.workers)
+        with open(os.path.join(artifact_dir, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        print(f"- saved to {artifact_dir}")
+        for model_type, metrics in metadata['metrics'].items():
+            print(f"- {model_type} accuracy: {metrics['accuracy']:.3f}")
+        print(f"- timings: {format_timings(metadata['timings'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class PredictionCache:
+    """Bounded LRU of model outputs keyed on the encoded feature vector.
+
+    Keys are the exact bytes of the float64 row produced by
+    ``FeatureEncoder.transform_one``, so two submissions share an entry
+    exactly when the models would see the same input. Entries are grouped by
+    ``scope`` (one per dataset). Each scope remembers the model version its
+    entries were computed with. A lookup with a different version drops that
+    scope's entries first, so retrained models never serve stale
+    predictions.
+
+    One instance is meant to be shared by all sessions; it is thread-safe.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _check_version(self, scope, version):
+        if self._versions.get(scope, version) != version:
+            stale = [key for key in self._entries if key[0] == scope]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+        self._versions[scope] = version
+
+    def get(self, scope, version, row):
+        """Cached outputs for ``row`` under ``version`` of the ``scope`` models, or ``None``."""
+        key = (scope, np.ascontiguousarray(row, dtype=np.float64).tobytes())
+        with self._lock:
+            self._check_version(scope, version)
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, scope, version, row, value):
+        key = (scope, np.ascontiguousarray(row, dtype=np.float64).tobytes())
+        # Callers share the cached arrays, so they must not be modified in place
+        for array in value:
+            array.flags.writeable = False
+        with self._lock:
+            self._check_version(scope, version)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_predict(self, scope, version, row, predict):
+        """Return the cached outputs for ``row``, calling ``predict()`` only on a miss.
+
+        ``predict`` returns a tuple of arrays, e.g. the binary and multiclass
+        probabilities.
+        """
+        value = self.get(scope, version, row)
+        if value is None:
+            value = tuple(predict())
+            self.put(scope, version, row, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,118 @@
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from metrics import REGISTRY
+
+# Set to 0 to load each dataset and its models only when it is first selected
+PREWARM_ENV_VAR = 'STUDENT_APP_PREWARM'
+
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+def prewarm_enabled():
+    return os.environ.get(PREWARM_ENV_VAR, '1').lower() not in ('0', 'false', 'no')
+
+
+class Prewarmer:
+    """Loads every dataset and its models on a background thread pool.
+
+    ``plans`` maps a dataset name to its ordered ``(step, function)`` pairs.
+    Each function is called without arguments, once the previous step of
+    the same dataset has succeeded; datasets are warmed in parallel, one per
+    worker. The app's steps are its ``st.cache_data`` and
+    ``st.cache_resource`` loaders, which are shared by the whole process. A
+    session that selects a dataset after it is ready finds everything
+    cached, and one that selects it earlier waits on the same computation
+    rather than repeating it.
+
+    ``start`` returns at once, so warming never delays the first page
+    render. ``status`` can be read from any thread while warming runs.
+    """
+
+    def __init__(self, plans, n_workers=None, registry=REGISTRY):
+        self.plans = {name: list(steps) for name, steps in plans.items()}
+        self.n_workers = n_workers or len(self.plans) or 1
+        self.registry = registry
+        self._status = {name: {'state': PENDING, 'step': None, 'error': None, 'seconds': None}
+                        for name in self.plans}
+        self._lock = threading.Lock()
+        self._futures = []
+
+    def start(self):
+        pool = ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix='prewarm')
+        self._futures = [pool.submit(self._warm, name) for name in self.plans]
+        # Workers exit once the queue drains; nobody needs to join them
+        pool.shutdown(wait=False)
+        return self
+
+    def _update(self, name, **fields):
+        with self._lock:
+            self._status[name].update(fields)
+
+    def _warm(self, name):
+        started = time.perf_counter()
+        for step, function in self.plans[name]:
+            self._update(name, state=LOADING, step=step)
+            try:
+                with self.registry.timer('prewarm', dataset=name, step=step):
+                    function()
+            except Exception as e:
+                self._update(name, state=FAILED, error=f"{step}: {e}", seconds=time.perf_counter() - started)
+                return
+        self._update(name, state=READY, step=None, seconds=time.perf_counter() - started)
+
+    def status(self):
+        """``{name: {'state', 'step', 'error', 'seconds'}}`` for every dataset, in plan order."""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._status.items()}
+
+    def is_ready(self, name):
+        with self._lock:
+            return self._status[name]['state'] == READY
+
+    def done(self):
+        """True once every dataset is ready or has failed."""
+        return all(future.done() for future in self._futures)
+
+    def wait(self, timeout=None):
+        wait(self._futures, timeout)
+        return self.done()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build every on-disk cache the app reads (datasets, models, statistics, importance) ahead of time.")
+    parser.add_argument('datasets', nargs='*',
+                        default=['data/student-mat.csv', 'data/student-por.csv'],
+                        help="Semicolon-separated UCI dataset files")
+    args = parser.parse_args()
+
+    from aggregate_store import AggregateStore
+    from dataset_cache import load_data_cached
+    from model_store import load_or_train
+    from permutation_importance import load_or_compute
+
+    plans = {
+        data_path: [
+            ('data', lambda path=data_path: load_data_cached(path)),
+            ('models', lambda path=data_path: load_or_train(path)),
+            ('statistics', lambda path=data_path: AggregateStore.open(path)),
+            ('importance', lambda path=data_path: load_or_compute(path)),
+        ]
+        for data_path in args.datasets
+    }
+    prewarmer = Prewarmer(plans).start()
+    prewarmer.wait()
+    for data_path, entry in prewarmer.status().items():
+        detail = f"failed at {entry['error']}" if entry['state'] == FAILED else entry['state']
+        print(f"{data_path}: {detail} ({entry['seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import argparse
+import contextlib
+import cProfile
+import glob
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Set to 1 to profile every rerun; otherwise admins can profile one rerun with ?profile=1
+PROFILE_ENV_VAR = 'STUDENT_APP_PROFILE'
+
+# Where the per-rerun reports are written
+PROFILE_DIR_ENV_VAR = 'STUDENT_APP_PROFILE_DIR'
+DEFAULT_PROFILE_DIR = 'profiles'
+
+# Functions and allocation sites listed in each report
+DEFAULT_TOP = 25
+
+# Stack depth recorded per allocation; 1 keeps tracemalloc's overhead low
+TRACEMALLOC_FRAMES = 1
+
+# tracemalloc is process-wide, so concurrent profiled reruns share one trace
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+# Only one cProfile profiler can be active per process on Python 3.12+, so one rerun at a time gets one
+_cpu_profile_lock = threading.Lock()
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV_VAR, '').lower() in ('1', 'true', 'yes')
+
+
+def profile_dir():
+    return os.environ.get(PROFILE_DIR_ENV_VAR, DEFAULT_PROFILE_DIR)
+
+
+def _format_bytes(size, signed=True):
+    sign = ('-' if size < 0 else '+') if signed else ''
+    size = abs(size)
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == 'B' else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+def _release_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+class RerunProfiler:
+    """CPU and memory profile of one Streamlit script rerun.
+
+    ``start`` enables cProfile and starts tracemalloc, unless another
+    profiled rerun already has. ``stop`` writes up to three files to
+    ``directory`` and returns the path of the text report:
+
+    - ``<stem>.txt``: functions ranked by cumulative and own time, plus
+      allocation sites ranked by net memory allocated during the rerun
+    - ``<stem>.prof``: the raw cProfile stats, for snakeviz or ``pstats``
+    - ``<stem>.json``: a summary read by ``python rerun_profiler.py``
+
+    Up to Python 3.11, cProfile follows only the calling thread, the
+    session's script thread. From 3.12 it hooks into the process-wide
+    ``sys.monitoring``, so it also records other sessions' threads, and a
+    second profiler cannot be enabled while one is active. CPU profiles are
+    therefore taken by one rerun at a time: a rerun that starts while
+    another is being profiled gets only the wall time, CPU time and memory
+    figures, and no ``.prof`` file. Allocation figures are process-wide as
+    well. When profiling is off, nothing here is constructed and a rerun
+    pays only for the check.
+    """
+
+    def __init__(self, directory=None, label=None, top=DEFAULT_TOP):
+        self.directory = directory or profile_dir()
+        self.label = label
+        self.top = top
+        self.context = {}
+        self._profile = cProfile.Profile()
+        self._started = None
+        self._cpu_started = None
+        self._owns_peak = False
+        self._profiling_cpu = False
+        self._snapshot = None
+        self.report_path = None
+
+    def start(self):
+        global _tracemalloc_users
+        with _tracemalloc_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            # The peak is only meaningful when no other rerun is being traced
+            self._owns_peak = _tracemalloc_users == 0
+            if self._owns_peak:
+                tracemalloc.reset_peak()
+            _tracemalloc_users += 1
+        try:
+            self._snapshot = tracemalloc.take_snapshot()
+        except BaseException:
+            _release_tracemalloc()
+            raise
+        self._started = time.perf_counter()
+        self._cpu_started = time.thread_time()
+        self._profiling_cpu = _cpu_profile_lock.acquire(blocking=False)
+        if self._profiling_cpu:
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiling tool, outside this module, is already active
+                _cpu_profile_lock.release()
+                self._profiling_cpu = False
+        return self
+
+    def stop(self):
+        """Stop profiling and write the reports; returns the text report path."""
+        if self._profiling_cpu:
+            self._profile.disable()
+            _cpu_profile_lock.release()
+        wall = time.perf_counter() - self._started
+        cpu = time.thread_time() - self._cpu_started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        _release_tracemalloc()
+
+        allocations = [stat for stat in snapshot.compare_to(self._snapshot, 'lineno') if stat.size_diff]
+        allocations.sort(key=lambda stat: stat.size_diff, reverse=True)
+        summary = {
+            'label': self.label,
+            'context': self.context,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(time.time() - wall)),
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'cpu_profiled': self._profiling_cpu,
+            'net_allocated_bytes': sum(stat.size_diff for stat in allocations),
+            'peak_traced_bytes': peak if self._owns_peak else None,
+            'traced_bytes': current,
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        stem = (time.strftime('%Y%m%d-%H%M%S', time.localtime(now)) + f"{now % 1:.3f}"[1:]
+                + f"-{os.getpid()}-{threading.get_ident() % 10000:04d}")
+        if self.label:
+            stem += '-' + ''.join(c if c.isalnum() else '_' for c in self.label)
+        base = os.path.join(self.directory, stem)
+        if self._profiling_cpu:
+            self._profile.dump_stats(base + '.prof')
+        with open(base + '.json', 'w') as f:
+            json.dump(summary, f, indent=2)
+        with open(base + '.txt', 'w') as f:
+            f.write(self.format(summary, allocations))
+        self.report_path = base + '.txt'
+        return self.report_path
+
+    def format(self, summary, allocations):
+        lines = [f"Rerun profile: {self.label or 'unlabelled'}"]
+        lines += [f"  {key}: {value}" for key, value in self.context.items()]
+        lines.append(f"Wall time {summary['wall_seconds'] * 1000:.0f} ms, "
+                     f"CPU time {summary['cpu_seconds'] * 1000:.0f} ms")
+        peak = summary['peak_traced_bytes']
+        lines.append(f"Memory {_format_bytes(summary['net_allocated_bytes'])} net allocated, "
+                     f"peak traced {'n/a (concurrent profiles)' if peak is None else _format_bytes(peak, signed=False)}")
+        lines.append('')
+
+        if not summary['cpu_profiled']:
+            lines += ["No function profile: another profiler was active during this rerun", '']
+        sorts = (('cumulative', 'cumulative time'), ('tottime', 'own time')) if summary['cpu_profiled'] else ()
+        for sort, title in sorts:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.strip_dirs().sort_stats(sort).print_stats(self.top)
+            lines.append(f"Top {self.top} functions by {title}")
+            # Skip pstats' own preamble up to the column header
+            body = stream.getvalue().splitlines()
+            start = next((i for i, line in enumerate(body) if line.lstrip().startswith('ncalls')), 0)
+            lines += [line for line in body[start:] if line.strip()]
+            lines.append('')
+
+        lines.append(f"Top {self.top} allocation sites by net size")
+        for stat in allocations[:self.top]:
+            frame = stat.traceback[0]
+            lines.append(f"{_format_bytes(stat.size_diff):>12} {stat.count_diff:>+9} blocks  "
+                         f"{frame.filename}:{frame.lineno}")
+        return '\n'.join(lines) + '\n'
+
+
+@contextlib.contextmanager
+def profile_rerun(enabled=True, directory=None):
+    """Profile the enclosed block with a ``RerunProfiler`` when ``enabled``.
+
+    Yields the running profiler, or ``None`` when profiling is off or could
+    not start; a profiler that fails to start never fails the rerun. The
+    report is written however the block ends. If it ends with an exception
+    (an error, or Streamlit's ``StopException`` or ``RerunException``), its
+    type is recorded under ``interrupted_by`` and the exception propagates.
+    """
+    profiler = None
+    if enabled:
+        try:
+            profiler = RerunProfiler(directory).start()
+        except Exception:
+            logging.getLogger(__name__).exception("Could not start the rerun profiler")
+    if profiler is None:
+        yield None
+        return
+    try:
+        yield profiler
+    except BaseException as e:
+        profiler.context.update(interrupted_by=type(e).__name__)
+        raise
+    finally:
+        try:
+            profiler.stop()
+        except Exception:
+            # A report that cannot be written must not fail the rerun
+            logging.getLogger(__name__).exception("Could not write the rerun profile")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise the per-rerun profiles written by the app.")
+    parser.add_argument('directory', nargs='?', default=profile_dir(), help="Profile directory")
+    parser.add_argument('--top', type=int, default=20, help="Functions and reruns to list")
+    args = parser.parse_args()
+
+    summaries = []
+    for path in glob.glob(os.path.join(args.directory, '*.json')):
+        with open(path) as f:
+            summaries.append((os.path.splitext(path)[0], json.load(f)))
+    if not summaries:
+        print(f"No profiles in {args.directory}")
+        return
+
+    summaries.sort(key=lambda item: item[1]['wall_seconds'], reverse=True)
+    print(f"{len(summaries)} profiled reruns; slowest first:")
+    for base, summary in summaries[:args.top]:
+        print(f"  {summary['wall_seconds'] * 1000:>8.0f} ms  {_format_bytes(summary['net_allocated_bytes']):>12}  "
+              f"{summary['label'] or ''}  {os.path.basename(base)}.txt")
+
+    # Merged over all reruns, the functions that cost the most overall
+    profiles = [base + '.prof' for base, _ in summaries if os.path.exists(base + '.prof')]
+    if profiles:
+        print()
+        stats = pstats.Stats(*profiles)
+        stats.strip_dirs().sort_stats('cumulative').print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# Axis choices offered by the scatter explorer on the Performance Factors tab
+SCATTER_X_AXES = ['G1', 'G2', 'studytime', 'absences', 'Medu', 'Fedu']
+SCATTER_Y_AXES = ['G3', 'G2', 'G1', 'studytime', 'absences']
+
+
+def _count_dtype(n_rows):
+    """Smallest unsigned integer type that can hold a count of ``n_rows``."""
+    for dtype in (np.uint16, np.uint32):
+        if n_rows <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+class ScatterIndex:
+    """Joint count tables for every scatter axis pair, split by outcome.
+
+    For each ``(x, y)`` pair the index holds a ``(2, nx, ny)`` integer array:
+    the number of students with each value combination who did not (0) or
+    did (1) reach ``performance_binary``. Axes are small-domain integers, so
+    the tables are exact and tiny. Switching scatter axes and range count
+    queries become array lookups instead of passes over the data.
+    """
+
+    def __init__(self, offsets, sizes, tables, n_rows):
+        self.offsets = offsets
+        self.sizes = sizes
+        self.tables = tables
+        self.n_rows = n_rows
+
+    @classmethod
+    def build(cls, df, x_axes=SCATTER_X_AXES, y_axes=SCATTER_Y_AXES, hue='performance_binary'):
+        """Build the index in one pass per axis pair."""
+        columns = list(dict.fromkeys(list(x_axes) + list(y_axes)))
+        codes = {}
+        offsets = {}
+        sizes = {}
+        for col in columns:
+            values = df[col].to_numpy()
+            if not np.issubdtype(values.dtype, np.integer):
+                raise ValueError(f"Scatter index needs integer columns, '{col}' is {values.dtype}")
+            low = int(values.min()) if len(values) else 0
+            high = int(values.max()) if len(values) else 0
+            offsets[col] = low
+            sizes[col] = high - low + 1
+            codes[col] = values.astype(np.int64) - low
+
+        outcome = df[hue].to_numpy().astype(np.int64)
+        dtype = _count_dtype(len(df))
+        tables = {}
+        for x in x_axes:
+            for y in y_axes:
+                nx, ny = sizes[x], sizes[y]
+                flat = (outcome * nx + codes[x]) * ny + codes[y]
+                counts = np.bincount(flat, minlength=2 * nx * ny)
+                tables[(x, y)] = counts.reshape(2, nx, ny).astype(dtype)
+        return cls(offsets, sizes, tables, len(df))
+
+    def _table(self, x, y):
+        try:
+            return self.tables[(x, y)]
+        except KeyError:
+            raise KeyError(f"No index for axis pair ({x}, {y})") from None
+
+    def _slice(self, col, low, high):
+        start = 0 if low is None else max(0, int(low) - self.offsets[col])
+        stop = self.sizes[col] if high is None else max(0, int(high) - self.offsets[col] + 1)
+        return slice(start, stop)
+
+    def bins(self, x, y):
+        """Non-empty bins of a pair, shaped like ``scatter_lod.bin_scatter`` output."""
+        table = self._table(x, y).astype(np.int64)
+        totals = table.sum(axis=0)
+        xi, yi = np.nonzero(totals)
+        count = totals[xi, yi]
+        return pd.DataFrame({
+            'x': xi + self.offsets[x],
+            'y': yi + self.offsets[y],
+            'count': count,
+            'pass_rate': table[1, xi, yi] / count,
+        })
+
+    def count(self, x, y, x_min=None, x_max=None, y_min=None, y_max=None, passed=None):
+        """Number of students with ``x`` and ``y`` in the given inclusive ranges.
+
+        ``passed`` restricts the count to students who did (``True``) or did
+        not (``False``) reach good performance. For example, students with
+        G2 = 12 who reached G3 >= 15::
+
+            index.count('G2', 'G3', x_min=12, x_max=12, y_min=15)
+        """
+        table = self._table(x, y)
+        if passed is not None:
+            table = table[1 if passed else 0][np.newaxis]
+        region = table[:, self._slice(x, x_min, x_max), self._slice(y, y_min, y_max)]
+        return int(region.sum(dtype=np.int64))
+
+    @property
+    def nbytes(self):
+        return sum(table.nbytes for table in self.tables.values())
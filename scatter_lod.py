@@ -0,0 +1,56 @@
+import numpy as np
+
+# Above this many rows the scatter plot switches from raw points to bins
+DEFAULT_RAW_POINT_LIMIT = 5_000
+
+# Marker area range (points^2) used to show bin counts
+MIN_MARKER_AREA = 20
+MAX_MARKER_AREA = 600
+
+
+def bin_scatter(df, x, y, hue='performance_binary'):
+    """Aggregate a scatter into exact bins, one per distinct ``(x, y)`` pair.
+
+    The axes are small-domain integers (grades, ordinals, absences), so
+    every distinct pair is its own bin and nothing is approximated. Returns a
+    frame with ``x``, ``y``, the bin ``count`` and the ``pass_rate`` (mean
+    of ``hue``) per bin.
+    """
+    # Name the keys explicitly so x and y may be the same column
+    keys = [df[x].rename('x'), df[y].rename('y')]
+    grouped = df[hue].groupby(keys, observed=True, sort=True).agg(['size', 'mean'])
+    bins = grouped.reset_index().rename(columns={'size': 'count', 'mean': 'pass_rate'})
+    bins['count'] = bins['count'].astype(np.int64)
+    return bins
+
+
+def scatter_level_of_detail(df, x, y, hue='performance_binary', raw_point_limit=DEFAULT_RAW_POINT_LIMIT,
+                            index=None):
+    """Pick how to draw a scatter of ``df``.
+
+    Returns ``('raw', frame)`` with the plotted columns when the frame is
+    small enough to draw point by point, otherwise ``('binned', bins)`` whose
+    size depends only on the axis domains. With a ``ScatterIndex`` covering
+    the pair, bins are looked up instead of computed from ``df``.
+    """
+    if len(df) <= raw_point_limit:
+        return 'raw', df[list(dict.fromkeys([x, y, hue]))]
+    if index is not None and (x, y) in index.tables:
+        return 'binned', index.bins(x, y)
+    return 'binned', bin_scatter(df, x, y, hue)
+
+
+def plot_binned_scatter(ax, bins, x_label, y_label):
+    """Draw bins as markers sized by count and coloured by pass rate."""
+    import matplotlib.pyplot as plt
+
+    counts = bins['count'].to_numpy()
+    scale = np.sqrt(counts / counts.max()) if len(counts) else counts
+    sizes = MIN_MARKER_AREA + (MAX_MARKER_AREA - MIN_MARKER_AREA) * scale
+    points = ax.scatter(bins['x'], bins['y'], s=sizes, c=bins['pass_rate'],
+                        cmap='RdYlGn', vmin=0, vmax=1, edgecolors='white', linewidths=0.5)
+    colorbar = plt.colorbar(points, ax=ax)
+    colorbar.set_label('Pass rate (G3 ≥ 15)', color='#666')
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    return points
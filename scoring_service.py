@@ -0,0 +1,336 @@
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from batch_scoring import score_columns
+from dataset_archive import locate_dataset
+from feature_encoder import CATEGORICAL_FEATURES, NUMERIC_FEATURES
+from metrics import REGISTRY
+from model_store import DEFAULT_STORE_DIR, load_or_train, model_version
+from student_schema import BOOLEAN_COLUMNS, CATEGORICAL_COLUMNS
+
+# Same course names and files as the app; read from data/student.zip when not extracted
+DEFAULT_DATASETS = {
+    'Mathematics': 'data/student-mat.csv',
+    'Portuguese': 'data/student-por.csv',
+}
+
+# How long the first request of a batch waits for others to join it
+DEFAULT_WINDOW_MS = 5.0
+
+# A batch is scored as soon as it holds this many rows
+DEFAULT_MAX_BATCH_ROWS = 512
+
+# Larger batches are scored with the sklearn forests, which overtake the compiled ones here
+COMPILED_MAX_ROWS = 128
+
+# Most recent request latencies kept for the /latency percentiles
+LATENCY_SAMPLES = 10_000
+
+REQUIRED_FIELDS = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+
+class RequestError(ValueError):
+    """A scoring request that cannot be served; reported to the client as HTTP 400."""
+
+
+class MicroBatcher:
+    """Collect concurrent scoring calls into one vectorised prediction.
+
+    The first call to ``submit`` opens a batch and starts a ``window_ms``
+    timer. Calls arriving before it fires join the batch. The batch is then
+    scored with a single ``predict`` call in a worker thread, or sooner once
+    it holds ``max_batch_rows`` rows. ``predict`` receives the stacked rows
+    and returns a dict of per-row output arrays. Each caller gets back the
+    slice for its own rows.
+    """
+
+    def __init__(self, predict, window_ms=DEFAULT_WINDOW_MS, max_batch_rows=DEFAULT_MAX_BATCH_ROWS):
+        self.predict = predict
+        self.window = window_ms / 1000
+        self.max_batch_rows = max_batch_rows
+        self.batches = 0
+        self.rows = 0
+        self._pending = []
+        self._pending_rows = 0
+        self._timer = None
+
+    async def submit(self, X):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((X, future))
+        self._pending_rows += len(X)
+        if self._pending_rows >= self.max_batch_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            asyncio.get_running_loop().create_task(self._score(batch))
+
+    async def _score(self, batch):
+        X = np.vstack([rows for rows, _ in batch])
+        try:
+            outputs = await asyncio.get_running_loop().run_in_executor(None, self.predict, X)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.rows += len(X)
+        start = 0
+        for rows, future in batch:
+            stop = start + len(rows)
+            if not future.done():
+                future.set_result({name: values[start:stop] for name, values in outputs.items()})
+            start = stop
+
+
+class LatencyTracker:
+    """Rolling window of request latencies."""
+
+    def __init__(self, max_samples=LATENCY_SAMPLES):
+        self.count = 0
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self._samples.append(seconds)
+
+    def summary(self):
+        with self._lock:
+            samples = np.asarray(self._samples)
+            count = self.count
+        if not len(samples):
+            return {'requests': count}
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+        return {'requests': count, 'window': len(samples),
+                'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+
+def _is_number(value):
+    if value is None or isinstance(value, bool):
+        return False
+    try:
+        return bool(np.isfinite(float(value)))
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_level(field, value):
+    if field in BOOLEAN_COLUMNS:
+        return isinstance(value, bool) or value in ('yes', 'no')
+    return isinstance(value, str) and value in CATEGORICAL_COLUMNS.get(field, ())
+
+
+class DatasetScorer:
+    """The models and encoder of one dataset behind a ``MicroBatcher``.
+
+    Batches of up to ``compiled_max_rows`` rows are scored with the compiled
+    forests, larger ones with the sklearn forests they were compiled from.
+    """
+
+    def __init__(self, data_path, store_dir=DEFAULT_STORE_DIR, window_ms=DEFAULT_WINDOW_MS,
+                 max_batch_rows=DEFAULT_MAX_BATCH_ROWS, compiled_max_rows=COMPILED_MAX_ROWS):
+        self.data_path = data_path
+        self.model_binary, self.model_multi, self.encoder, metadata = load_or_train(
+            data_path, store_dir, mmap_mode='r', compiled=True)
+        self.sklearn_binary, self.sklearn_multi, _, _ = load_or_train(data_path, store_dir, mmap_mode='r')
+        self.compiled_max_rows = compiled_max_rows
+        self.model_version = model_version(metadata)
+        self.batcher = MicroBatcher(self.predict, window_ms, max_batch_rows)
+
+    def predict(self, X):
+        with REGISTRY.timer('service_predict', rows=len(X)):
+            if len(X) <= self.compiled_max_rows:
+                proba_binary = self.model_binary.predict_proba(X)
+                proba_multi = self.model_multi.predict_proba(X)
+            else:
+                proba_binary = self.sklearn_binary.predict_proba(self.sklearn_binary.scaler_.transform(X))
+                proba_multi = self.sklearn_multi.predict_proba(self.sklearn_multi.scaler_.transform(X))
+            return score_columns(proba_binary, proba_multi, self.model_binary.classes_, self.model_multi.classes_)
+
+    def encode(self, records):
+        for i, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise RequestError(f"Record {i} is not a JSON object")
+            missing = [field for field in REQUIRED_FIELDS if field not in record]
+            if missing:
+                raise RequestError(f"Record {i} is missing fields: {', '.join(missing)}")
+            # The encoder would silently score nulls and unknown levels as zeros
+            invalid = [field for field in NUMERIC_FEATURES if not _is_number(record[field])]
+            if invalid:
+                raise RequestError(f"Record {i} has missing or non-numeric values for: {', '.join(invalid)}")
+            invalid = [field for field in CATEGORICAL_FEATURES if not _is_level(field, record[field])]
+            if invalid:
+                raise RequestError(f"Record {i} has unknown values for: {', '.join(invalid)}")
+        with REGISTRY.timer('service_encode', rows=len(records)):
+            return np.vstack([self.encoder.transform_one(record) for record in records])
+
+    async def score(self, records):
+        outputs = await self.batcher.submit(self.encode(records))
+        names = list(outputs)
+        return [{name: outputs[name][i].item() for name in names} for i in range(len(records))]
+
+
+class ScoringApp:
+    """ASGI application serving ``POST /score``, ``GET /health``, ``GET /latency`` and ``GET /metrics``.
+
+    ``/score`` takes ``{"dataset": name, "records": [...]}``, where each
+    record holds the raw student fields the app's encoder uses. It returns
+    one prediction per record with the columns of
+    ``batch_scoring.score_columns``. ``/metrics`` exports the stage timings
+    in the Prometheus text format, ``/metrics.json`` as JSON.
+    """
+
+    def __init__(self, scorers):
+        self.scorers = scorers
+        self.default_dataset = next(iter(scorers))
+        self.latency = LatencyTracker()
+        self.started = time.time()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        route = (scope['method'], scope['path'])
+        if route == ('POST', '/score'):
+            started = time.perf_counter()
+            status, payload = await self._score(await _read_body(receive))
+            if status == 200:
+                self.latency.record(time.perf_counter() - started)
+                REGISTRY.observe('service_request', time.perf_counter() - started)
+        elif route == ('GET', '/health'):
+            status, payload = 200, self.health()
+        elif route == ('GET', '/latency'):
+            status, payload = 200, self.latency_report()
+        elif route == ('GET', '/metrics'):
+            await _send_text(send, 200, REGISTRY.to_prometheus(), b'text/plain; version=0.0.4')
+            return
+        elif route == ('GET', '/metrics.json'):
+            status, payload = 200, REGISTRY.snapshot()
+        else:
+            status, payload = 404, {'error': f"No route for {scope['method']} {scope['path']}"}
+        await _send_json(send, status, payload)
+
+    async def _score(self, body):
+        try:
+            try:
+                request = json.loads(body or b'{}')
+            except ValueError:
+                raise RequestError("Request body is not valid JSON") from None
+            if not isinstance(request, dict):
+                raise RequestError("Request body must be a JSON object")
+            dataset = request.get('dataset', self.default_dataset)
+            if dataset not in self.scorers:
+                raise RequestError(f"Unknown dataset '{dataset}'; choose from {', '.join(self.scorers)}")
+            records = request.get('records')
+            if not isinstance(records, list) or not records:
+                raise RequestError("'records' must be a non-empty list of student records")
+            scorer = self.scorers[dataset]
+            predictions = await scorer.score(records)
+        except RequestError as e:
+            return 400, {'error': str(e)}
+        return 200, {'dataset': dataset, 'model_version': scorer.model_version, 'predictions': predictions}
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'datasets': {name: {'model_version': scorer.model_version} for name, scorer in self.scorers.items()},
+        }
+
+    def latency_report(self):
+        report = self.latency.summary()
+        report['batches'] = {}
+        for name, scorer in self.scorers.items():
+            batcher = scorer.batcher
+            report['batches'][name] = {
+                'batches': batcher.batches,
+                'rows': batcher.rows,
+                'mean_batch_rows': batcher.rows / batcher.batches if batcher.batches else 0.0,
+            }
+        return report
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def _send_text(send, status, text, content_type):
+    body = text.encode()
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', content_type),
+                            (b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _send_json(send, status, payload):
+    await _send_text(send, status, json.dumps(payload), b'application/json')
+
+
+def create_app(datasets=None, store_dir=DEFAULT_STORE_DIR, window_ms=DEFAULT_WINDOW_MS,
+               max_batch_rows=DEFAULT_MAX_BATCH_ROWS, compiled_max_rows=COMPILED_MAX_ROWS):
+    """Build the scoring app for ``datasets``, a mapping of name to training CSV."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    datasets = datasets or {name: locate_dataset(os.path.join(here, path)) for name, path in DEFAULT_DATASETS.items()}
+    scorers = {name: DatasetScorer(path, store_dir, window_ms, max_batch_rows, compiled_max_rows)
+               for name, path in datasets.items()}
+    return ScoringApp(scorers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the student performance models over HTTP with micro-batching.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=8600, help="Port to listen on")
+    parser.add_argument('--dataset', action='append', metavar='NAME=PATH',
+                        help="Dataset to serve (repeatable; default: the app's datasets)")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help="Artifact store directory")
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_WINDOW_MS,
+                        help="How long a batch waits for more requests")
+    parser.add_argument('--max-batch-rows', type=int, default=DEFAULT_MAX_BATCH_ROWS,
+                        help="Score a batch as soon as it holds this many rows")
+    parser.add_argument('--compiled-max-rows', type=int, default=COMPILED_MAX_ROWS,
+                        help="Score larger batches with the sklearn forests instead of the compiled ones")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError as e:
+        raise ImportError("The scoring service requires uvicorn: pip install uvicorn") from e
+
+    datasets = dict(item.split('=', 1) for item in args.dataset) if args.dataset else None
+    app = create_app(datasets, args.store, args.window_ms, args.max_batch_rows, args.compiled_max_rows)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == "__main__":
+    main()
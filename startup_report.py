@@ -0,0 +1,105 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# Set to 1 to show the startup timing report in the app sidebar and log it
+REPORT_ENV_VAR = 'STUDENT_APP_STARTUP_REPORT'
+
+# Modules the app defers until a page needs them
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'sklearn']
+
+# Modules imported on every rerun, whatever the page
+APP_STARTUP_MODULES = [
+    'streamlit', 'pandas', 'numpy', 'dataset_cache', 'model_store', 'aggregate_store',
+    'chart_cache', 'scatter_index', 'scatter_lod', 'prediction_cache', 'metrics',
+    'rerun_profiler', 'permutation_importance', 'dataset_merge', 'prewarm', 'dataset_archive',
+]
+
+# Timings of the first run in this process, i.e. the cold start
+_cold_start = None
+
+
+def report_enabled():
+    return os.environ.get(REPORT_ENV_VAR, '').lower() in ('1', 'true', 'yes')
+
+
+class StartupTimer:
+    """Wall-clock time per startup phase of one script run.
+
+    Phases are timed with ``phase(name)`` and kept in the order they ran.
+    Timing a phase twice adds up. The first timer to ``finish`` in the
+    process is kept as the cold-start report; later reruns hit Streamlit's
+    caches and ``sys.modules`` and are expected to be much faster.
+    """
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = {}
+        self.total = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def finish(self):
+        """Stop the clock and return the cold-start timer (this one on the first run)."""
+        global _cold_start
+        self.total = time.perf_counter() - self.started
+        if _cold_start is None:
+            _cold_start = self
+            if report_enabled():
+                print(f"Cold start: {self.format()}", flush=True)
+        return _cold_start
+
+    def format(self):
+        parts = [f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()]
+        if self.total is not None:
+            parts.append(f"total {self.total * 1000:.0f} ms")
+        return ', '.join(parts)
+
+
+def measure_cold_imports(modules=APP_STARTUP_MODULES):
+    """Import ``modules`` in a fresh interpreter.
+
+    Returns the import time in seconds and the heavy modules that were
+    pulled in along the way (which should be none).
+    """
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {list(modules)!r}:\n"
+        "    __import__(name)\n"
+        "print(time.perf_counter() - start)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, '-c', code], cwd=here, check=True,
+                            capture_output=True, text=True).stdout.splitlines()
+    return float(output[0]), [name for name in output[1].split(',') if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the app's cold import time in a fresh interpreter.")
+    parser.add_argument('--repeats', type=int, default=3, help="Fresh interpreters to time")
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.repeats):
+        seconds, heavy = measure_cold_imports()
+        timings.append(seconds)
+    print(f"Startup imports: best {min(timings) * 1000:.0f} ms over {args.repeats} runs")
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        sys.exit(1)
+    print("Heavy modules imported at startup: none")
+
+
+if __name__ == "__main__":
+    main()
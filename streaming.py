@@ -0,0 +1,190 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from dataset_archive import open_dataset
+from student_schema import READ_DTYPES, apply_schema
+
+GRADE_COLUMNS = ['G1', 'G2', 'G3']
+
+# Grades are integers on a 0-20 scale
+GRADE_MAX = 20
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def iter_chunks(file_path, chunksize=DEFAULT_CHUNKSIZE, offset=0):
+    """Yield typed, validated chunks of a semicolon-separated UCI CSV.
+
+    Each chunk goes through the same schema as ``load_data`` and gets the
+    ``performance_binary`` column. ``performance_class`` is not added: its
+    quartile edges depend on the whole file and cannot be known per chunk.
+
+    A non-zero ``offset`` must be the byte position of a line start; only the
+    rows from there on are read, using the column names from the header.
+    """
+    with open_dataset(file_path) as f:
+        if offset:
+            names = pd.read_csv(f, sep=';', nrows=0).columns
+            f.seek(offset)
+            reader = pd.read_csv(f, sep=';', names=names, header=None,
+                                 dtype=READ_DTYPES, chunksize=chunksize)
+        else:
+            reader = pd.read_csv(f, sep=';', dtype=READ_DTYPES, chunksize=chunksize)
+        for chunk in reader:
+            apply_schema(chunk)
+            chunk['performance_binary'] = (chunk['G3'] >= 15).astype(np.int8)
+            yield chunk
+
+
+class GradeStats:
+    """Mergeable sufficient statistics of the grade columns.
+
+    Holds the count, pass count, means, co-moment matrix and a per-value
+    histogram of every grade. Two sets of statistics merge with the pairwise
+    update of Chan et al., which is numerically stable, so chunks or batches
+    can be folded in one at a time in constant memory and the results match
+    a full-frame computation.
+    """
+
+    def __init__(self, columns=GRADE_COLUMNS):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = 0
+        self.passed = 0
+        self.mean = np.zeros(k)
+        # Sum of outer products of deviations from the mean (co-moment matrix)
+        self.comoment = np.zeros((k, k))
+        # Count of students per grade value 0..GRADE_MAX
+        self.histograms = {col: np.zeros(GRADE_MAX + 1, dtype=np.int64) for col in self.columns}
+
+    @classmethod
+    def from_frame(cls, df, columns=GRADE_COLUMNS):
+        """Statistics of a single frame of student records."""
+        stats = cls(columns)
+        stats.n = len(df)
+        if stats.n == 0:
+            return stats
+        X = df[stats.columns].to_numpy(dtype=np.float64)
+        stats.mean = X.mean(axis=0)
+        centered = X - stats.mean
+        stats.comoment = centered.T @ centered
+        if 'performance_binary' in df:
+            stats.passed = int(df['performance_binary'].sum())
+        else:
+            stats.passed = int((df['G3'] >= 15).sum())
+        for col in stats.columns:
+            stats.histograms[col] = np.bincount(df[col].to_numpy(dtype=np.int64), minlength=GRADE_MAX + 1)
+        return stats
+
+    def merge(self, other):
+        """Fold another ``GradeStats`` over the same columns into this one."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge statistics over different columns")
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.n / n)
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.n * other.n / n)
+        self.n = n
+        self.passed += other.passed
+        for col in self.columns:
+            self.histograms[col] = self.histograms[col] + other.histograms[col]
+        return self
+
+    def update(self, chunk):
+        """Fold a chunk of student records into the running statistics."""
+        return self.merge(GradeStats.from_frame(chunk, self.columns))
+
+    def to_dict(self):
+        return {
+            'columns': self.columns,
+            'n': self.n,
+            'passed': self.passed,
+            'mean': self.mean.tolist(),
+            'comoment': self.comoment.tolist(),
+            'histograms': {col: hist.tolist() for col, hist in self.histograms.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        stats = cls(payload['columns'])
+        stats.n = payload['n']
+        stats.passed = payload['passed']
+        stats.mean = np.asarray(payload['mean'], dtype=np.float64)
+        stats.comoment = np.asarray(payload['comoment'], dtype=np.float64)
+        stats.histograms = {col: np.asarray(hist, dtype=np.int64) for col, hist in payload['histograms'].items()}
+        return stats
+
+    def skew(self, column):
+        """Sample skewness of a grade, computed exactly from its histogram like ``Series.skew``."""
+        counts = self.histograms[column]
+        n = counts.sum()
+        if n < 3:
+            return float('nan')
+        values = np.arange(len(counts))
+        deviations = values - (counts @ values) / n
+        m2 = counts @ deviations ** 2 / n
+        m3 = counts @ deviations ** 3 / n
+        if m2 == 0:
+            return 0.0
+        return float(np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5)
+
+    def column_mean(self, column):
+        return float(self.mean[self.columns.index(column)])
+
+    @property
+    def success_rate(self):
+        """Share of students with a final grade of 15 or more."""
+        return self.passed / self.n if self.n else float('nan')
+
+    def covariance(self):
+        """Sample covariance matrix of the grade columns as a DataFrame."""
+        cov = self.comoment / (self.n - 1) if self.n > 1 else np.full_like(self.comoment, np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def corr(self):
+        """Pearson correlation matrix, as ``df[columns].corr()`` would return."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scale = np.sqrt(np.diag(self.comoment))
+            corr = self.comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def kpis(self):
+        """Dashboard KPIs: student count, average final grade and success rate."""
+        return {
+            'students': self.n,
+            'average_grade': self.column_mean('G3'),
+            'success_rate': self.success_rate,
+            'period_means': {col: self.column_mean(col) for col in self.columns},
+        }
+
+
+def stream_stats(file_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Compute ``GradeStats`` over a CSV of any size, one chunk at a time."""
+    stats = GradeStats()
+    for chunk in iter_chunks(file_path, chunksize):
+        stats.update(chunk)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute dashboard KPIs over a large student CSV in chunks.")
+    parser.add_argument('file', help="Semicolon-separated CSV in the UCI student layout")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk")
+    args = parser.parse_args()
+
+    stats = stream_stats(args.file, args.chunksize)
+    kpis = stats.kpis()
+    print(f"Students: {kpis['students']}")
+    print(f"Average grade: {kpis['average_grade']:.2f}")
+    print(f"Success rate: {kpis['success_rate'] * 100:.1f}%")
+    print("Period means: " + ', '.join(f"{col} {value:.2f}" for col, value in kpis['period_means'].items()))
+    print("\nGrade correlation:")
+    print(stats.corr().round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,49 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix
-import matplotlib.pyplot as plt
-import seaborn as sns
+from dataset_archive import open_dataset
+from feature_encoder import FeatureEncoder
+from student_schema import READ_DTYPES, apply_schema
 
 # Data Loading and Preprocessing
 def load_data(file_path):
-    """Load and prepare the student performance dataset."""
+    """Load and prepare the student performance dataset.
+
+    Columns are validated and cast to the compact dtypes declared in
+    ``student_schema``; a ``SchemaError`` is raised for invalid data.
+    ``file_path`` may name a member of a zip archive (see ``dataset_archive``).
+    """
     # Read the data
-    df = pd.read_csv(file_path, sep=';')
+    with open_dataset(file_path) as f:
+        df = pd.read_csv(f, sep=';', dtype=READ_DTYPES)
+    apply_schema(df)
     
     # Create binary target variable
-    df['performance_binary'] = (df['G3'] >= 15).astype(int)
+    df['performance_binary'] = (df['G3'] >= 15).astype(np.int8)
     
     # Create multi-class target variable
     df['performance_class'] = pd.qcut(df['G3'], q=4, labels=['Poor', 'Fair', 'Good', 'Excellent'])
     
     return df
 
+def performance_class_edges(g3):
+    """The three inner quartile edges of the final grade that ``load_data`` splits classes at."""
+    return [float(edge) for edge in pd.qcut(g3, q=4, retbins=True)[1][1:-1]]
+
+def label_performance_class(g3, edges):
+    """``performance_class`` of grades ``g3`` under fixed quartile ``edges``.
+
+    Labels match ``load_data`` for the frame the edges were computed on, so
+    rows appended later can be labelled with the class definitions a model
+    was trained with.
+    """
+    return pd.cut(g3, bins=[-np.inf, *edges, np.inf], labels=['Poor', 'Fair', 'Good', 'Excellent'])
+
 def visualize_data(df):
     """Create visualizations for data analysis."""
+    # Plotting libraries are slow to import; load them only when plotting
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Set style parameters
     plt.style.use('default')
     sns.set_theme(style="whitegrid")
@@ -61,48 +82,23 @@ def visualize_data(df):
     plt.savefig('performance_analysis.png')
     plt.close()
 
-def prepare_features(df, target='binary'):
-    """Prepare features for modeling."""
+def prepare_features(df, target='binary', encoder=None):
+    """Prepare features for modeling.
+
+    If no fitted ``FeatureEncoder`` is given, one is fitted on ``df`` itself,
+    so each dataset is encoded against its own categories.
+    """
     try:
         # Create binary target variable if G3 exists
         if 'G3' in df.columns:
-            df['performance_binary'] = (df['G3'] >= 15).astype(int)
+            df['performance_binary'] = (df['G3'] >= 15).astype(np.int8)
             df['performance_class'] = pd.qcut(df['G3'], q=4, labels=['Poor', 'Fair', 'Good', 'Excellent'])
         
-        # Select relevant features
-        feature_columns = [
-            'age', 'studytime', 'failures', 'absences',
-            'G1', 'G2',  # First and second period grades
-            'Medu', 'Fedu',  # Parent's education
-            'traveltime',  # Home to school travel time
-            'freetime', 'goout', 'health'
-        ]
-        
-        # Convert categorical variables to dummy variables
-        categorical_columns = ['school', 'sex', 'address', 'famsize', 'Pstatus', 
-                             'Mjob', 'Fjob', 'reason', 'guardian', 'schoolsup', 
-                             'famsup', 'paid', 'activities', 'nursery', 'higher', 
-                             'internet', 'romantic']
-        
-        # Create dummy variables for input data
-        df_encoded = pd.get_dummies(df, columns=categorical_columns)
-        
-        # Get reference data and its encoded columns
-        reference_data = pd.read_csv('data/student-mat.csv', sep=';')
-        reference_encoded = pd.get_dummies(reference_data, columns=categorical_columns)
+        if encoder is None:
+            encoder = FeatureEncoder().fit(df)
         
-        # Get all columns that should be in the feature set
-        dummy_columns = [col for col in reference_encoded.columns 
-                        if any(cat in col for cat in categorical_columns)]
-        all_columns = feature_columns + dummy_columns
-        
-        # Add missing columns with zeros
-        for col in all_columns:
-            if col not in df_encoded.columns:
-                df_encoded[col] = 0
-        
-        # Select only the required columns in the correct order
-        X = df_encoded[all_columns].copy()
+        # Encode straight into the fixed feature order
+        X = pd.DataFrame(encoder.transform(df), columns=encoder.feature_names_, index=df.index)
         
         # Select target variable based on classification type
         if target == 'binary':
@@ -116,22 +112,51 @@ def prepare_features(df, target='binary'):
         print(f"Error in prepare_features: {str(e)}")
         return None, None
 
-def train_model(X, y, model_type='binary'):
-    """Train a Random Forest model."""
+def model_params(model_type='binary', params=None):
+    """Random Forest hyperparameters for a model type, with optional overrides."""
+    resolved = {
+        'n_estimators': 100,
+        'random_state': 42,
+        'class_weight': 'balanced' if model_type == 'multiclass' else None
+    }
+    if params:
+        resolved.update(params)
+    return resolved
+
+def holdout_mask(n_rows, test_size=0.2):
+    """Boolean mask of held-out rows that depends only on each row's position.
+
+    Appending rows never moves an existing row between the training and
+    holdout sets, so models updated with new rows are still scored on rows
+    they have never seen.
+    """
+    # Knuth's multiplicative hash spreads consecutive positions evenly over [0, 2**32)
+    positions = np.arange(n_rows, dtype=np.uint64)
+    return positions * np.uint64(2654435761) % np.uint64(2**32) < np.uint64(test_size * 2**32)
+
+def train_model(X, y, model_type='binary', params=None, holdout=None):
+    """Train a Random Forest model.
+
+    ``holdout`` is an optional boolean mask of test rows (see
+    ``holdout_mask``); by default a random 20% is held out.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
     # Split the data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    if holdout is None:
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    else:
+        X_train, X_test, y_train, y_test = X[~holdout], X[holdout], y[~holdout], y[holdout]
     
-    # Scale the features
+    # Scale the features (fitted on plain arrays so encoded rows can be scaled directly)
     scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
+    X_train_scaled = scaler.fit_transform(np.asarray(X_train, dtype=np.float64))
+    X_test_scaled = scaler.transform(np.asarray(X_test, dtype=np.float64))
     
     # Train the model
-    model = RandomForestClassifier(
-        n_estimators=100,
-        random_state=42,
-        class_weight='balanced' if model_type == 'multiclass' else None
-    )
+    model = RandomForestClassifier(**model_params(model_type, params))
     model.fit(X_train_scaled, y_train)
     
     # Make predictions
@@ -144,6 +169,10 @@ def train_model(X, y, model_type='binary'):
 
 def analyze_results(model, X, y_test, y_pred, feature_names):
     """Analyze and visualize the results."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.metrics import classification_report, confusion_matrix
+
     # Print classification report
     print("\nClassification Report:")
     print(classification_report(y_test, y_pred))
@@ -1,23 +1,47 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-import joblib
-from student_performance_analysis import load_data, prepare_features, train_model
-import os
+from startup_report import StartupTimer, report_enabled
+
+startup_timer = StartupTimer()
+
+# Only light modules are imported up front; matplotlib, seaborn and sklearn
+# load on first use by the page that needs them
+with startup_timer.phase('imports'):
+    import hmac
+    import importlib.util
+    import logging
+    import os
+
+    import streamlit as st
+    import pandas as pd
+    import numpy as np
+    from dataset_archive import ARCHIVE_NAME
+    from dataset_cache import load_data_cached
+    from dataset_merge import merge_courses
+    from model_store import load_or_train, model_version
+    from permutation_importance import load_or_compute as load_or_compute_importance
+    from prewarm import FAILED, LOADING, READY, Prewarmer, prewarm_enabled
+    from prediction_cache import DEFAULT_MAX_ENTRIES, PredictionCache
+    from aggregate_store import AggregateStore
+    from chart_cache import ChartCache, chart_key
+    from metrics import QUANTILE_WINDOW, REGISTRY, start_http_server
+    from rerun_profiler import profile_rerun, profiling_enabled
+    from scatter_index import SCATTER_X_AXES, SCATTER_Y_AXES, ScatterIndex
+    from scatter_lod import DEFAULT_RAW_POINT_LIMIT, plot_binned_scatter, scatter_level_of_detail
+
+# Dataset files under data/ for each course offered in the app
+DATASET_FILES = {
+    'Mathematics': 'student-mat.csv',
+    'Portuguese': 'student-por.csv',
+}
+
+# Students enrolled in both courses, joined on the attributes student-merge.R uses
+COMBINED_DATASET = 'Both Courses'
 
 def check_requirements():
     try:
-        # Check if required packages are available
-        import streamlit
-        import pandas
-        import numpy
-        import matplotlib.pyplot
-        import seaborn
-        import sklearn
+        # Check if required packages are available without importing them
+        for package in ['streamlit', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'sklearn']:
+            if importlib.util.find_spec(package) is None:
+                raise ImportError(f"No module named '{package}'")
         
         # Check if data directory exists
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -35,811 +59,1083 @@ def check_requirements():
         st.error(f"Setup error: {str(e)}")
         return False
 
-# Run requirements check
-if not check_requirements():
-    st.stop()
-
-# Page configuration must be the first Streamlit command
-st.set_page_config(
-    page_title="Student Performance Analytics",
-    page_icon="📚",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS for luxury design with animations and responsive layout
-st.markdown("""
-<style>
-    /* Main container */
-    .main {
-        background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-        animation: gradientBG 15s ease infinite;
-        font-size: 16px;  /* Base font size increase */
-    }
-    
-    @keyframes gradientBG {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    /* Responsive containers */
-    @media (max-width: 768px) {
-        .responsive-grid {
-            grid-template-columns: 1fr !important;
-        }
-        .metrics-container {
-            flex-direction: column;
-        }
-    }
-    
-    /* Headers with animations */
-    h1 {
-        background: linear-gradient(120deg, #1e3d59, #2b4d6f);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-family: 'Helvetica Neue', sans-serif;
-        font-weight: 700;
-        padding: 1.5rem 0;
-        animation: fadeIn 0.5s ease-in;
-        font-size: 2.5rem !important;
-    }
-    
-    h2 {
-        color: #2b4d6f;
-        font-family: 'Helvetica Neue', sans-serif;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        font-size: 2rem !important;
-    }
-    
-    h3 {
-        font-size: 1.75rem !important;
-    }
-    
-    p {
-        font-size: 1.1rem !important;
-        line-height: 1.6 !important;
-    }
-    
-    /* Animations */
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    @keyframes slideIn {
-        from { transform: translateX(-20px); opacity: 0; }
-        to { transform: translateX(0); opacity: 1; }
-    }
-    
-    /* Cards with hover effects */
-    .card {
-        background: white;
-        border-radius: 1rem;
-        padding: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        transition: all 0.3s ease;
-        animation: fadeIn 0.5s ease-in;
-    }
-    
-    .card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 12px rgba(0, 0, 0, 0.15);
-    }
-    
-    /* Metrics with animations */
-    .metric-value {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1e3d59;
-        animation: countUp 1s ease-out;
-    }
-    
-    .metric-label {
-        color: #666;
-        font-size: 0.9rem;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: #343a40 !important;
-        padding: 0 !important;
-    }
-    
-    /* Navigation title */
-    .nav-title {
-        background: #212529;
-        color: white !important;
-        font-size: 1.5rem !important;
-        font-weight: 600 !important;
-        padding: 1rem !important;
-        margin: 0 !important;
-        text-align: left;
-    }
-    
-    /* Bootstrap-style navigation buttons */
-    .stRadio > div[role="radiogroup"] {
-        padding: 0 !important;
-    }
-    
-    /* Hide radio button icons */
-    div[data-testid="stMarkdown"] + div[data-testid="stVerticalBlock"] div[role="radiogroup"] > label > div:first-child {
-        display: none !important;
-    }
-    
-    /* Navigation button text color */
-    .stRadio > div[role="radiogroup"] > label {
-         color: white !important;
-        font-size: 1rem !important;
-        padding: 0.8rem 1.5rem !important;
-        background: transparent !important;
-        border-radius: 0 !important;
-        margin: 0 !important;
-        border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-        transition: all 0.2s ease;
-    }
-    
-    /* Selected nav item */
-    .stRadio > div[role="radiogroup"] > label[data-checked="true"] {
-        background: rgba(255, 255, 255, 0.1) !important;
-        color: #007bff !important;
-        font-weight: 600;
-        box-shadow: none !important;
-        border-left: 4px solid #007bff;
-    }
-    
-    /* Footer in sidebar */
-    .sidebar-footer {
-        position: fixed;
-        bottom: 0;
-        left: 0;
-        width: 100%;
-        padding: 1rem;
-        background: rgba(0, 0, 0, 0.2);
-        backdrop-filter: blur(5px);
-        color: rgba(255, 255, 255, 0.8);
-        font-size: 0.8rem;
-        text-align: center;
-        animation: fadeIn 0.5s ease-in;
-    }
-    
-    .sidebar-footer p {
-        margin: 0;
-        line-height: 1.5;
-    }
-    
-    /* Buttons with animations */
-    .stButton>button {
-        background: linear-gradient(45deg, #1e3d59, #2b4d6f);
-        color: white;
-        border-radius: 2rem;
-        padding: 0.75rem 2rem;
-        border: none;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        transition: all 0.3s ease;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        font-weight: 500;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 8px rgba(0, 0, 0, 0.15);
-        background: linear-gradient(45deg, #2b4d6f, #1e3d59);
-    }
-    
-    /* Plots with animations */
-    .plot-container {
-        background: white;
-        border-radius: 1rem;
-        padding: 1.5rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        transition: all 0.3s ease;
-        animation: fadeIn 0.5s ease-in;
-    }
-    
-    .plot-container:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 12px rgba(0, 0, 0, 0.15);
-    }
-    
-    /* Form inputs with animations */
-    .stSlider, .stSelectbox {
-        animation: slideIn 0.5s ease-in;
-    }
-    
-    /* Loading animation */
-    .stProgress .st-bo {
-        background-color: #1e3d59;
-        height: 3px;
-        animation: loading 1s ease-in-out infinite;
-    }
-    
-    @keyframes loading {
-        0% { width: 0%; }
-        50% { width: 100%; }
-        100% { width: 0%; }
-    }
-    
-    /* Navigation menu items */
-    .nav-item {
-        padding: 0.5rem 1rem;
-        margin: 0.5rem 0;
-        border-radius: 0.5rem;
-        transition: all 0.3s ease;
-        cursor: pointer;
-        color: white;
-    }
-    
-    .nav-item:hover {
-        background: rgba(255, 255, 255, 0.1);
-        transform: translateX(5px);
-    }
-    
-    /* Increase text size globally */
-    .stMarkdown, .stText {
-        font-size: 1.1rem !important;
-    }
-
-    /* Add tab styling for white text */
-    [data-testid="stTabs"] [data-baseweb="tab-list"] {
-        gap: 8px;
-    }
-
-    [data-testid="stTabs"] [data-baseweb="tab"] {
-        background-color: transparent;
-        color: white !important;
-        border-radius: 4px;
-        font-weight: 500;
-        padding: 8px 16px;
-    }
-
-    [data-testid="stTabs"] [data-baseweb="tab-highlight"] {
-        background-color: #007bff;
-    }
-
-    [data-testid="stTabs"] [data-baseweb="tab"][aria-selected="true"] {
-        background-color: rgba(255, 255, 255, 0.1);
-        color: white !important;
-    }
-
-    [data-testid="stTabs"] [data-baseweb="tab-panel"] {
-        padding: 16px 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Enhanced title and introduction with animation
-st.markdown("""
-<div style='text-align: center; padding: 2rem 0; animation: fadeIn 0.5s ease-in;'>
-    <h1 style='font-size: 3rem; margin-bottom: 1rem;'>📚 Student Performance Analytics</h1>
-    <p style='font-size: 1.2rem; color: #666; max-width: 800px; margin: 0 auto; line-height: 1.6;'>
-        Unlock powerful insights into student performance through advanced analytics and predictive modeling
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-# Load and cache data with loading animation
-with st.spinner('Loading data and models...'):
-    # Dataset selection moved outside cached function
-    dataset_choice = st.radio(
-        "Choose dataset to analyze:",
-        ["Mathematics", "Portuguese"],
-        help="Select which course data to analyze"
-    )
+def is_admin():
+    """True when an admin token is configured and passed as the ``admin`` query parameter."""
+    token = os.environ.get('STUDENT_APP_ADMIN_TOKEN')
+    return bool(token) and hmac.compare_digest(st.query_params.get('admin', ''), token)
 
-    @st.cache_data
-    def load_cached_data(selected_dataset):
-        try:
-            # Get the absolute path to the data directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            data_dir = os.path.join(current_dir, 'data')
-            
-            # Check if data directory exists, if not create it
-            if not os.path.exists(data_dir):
-                os.makedirs(data_dir)
-            
-            math_path = os.path.join(data_dir, 'student-mat.csv')
-            por_path = os.path.join(data_dir, 'student-por.csv')
-            
-            if not os.path.exists(math_path) or not os.path.exists(por_path):
-                st.error("Dataset files not found!")
-                st.info("""
-                ### Missing Dataset Files
-                Please ensure you have the required dataset files:
-                1. Download the datasets:
-                   - [Mathematics Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-mat.csv)
-                   - [Portuguese Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-por.csv)
-                2. Create a 'data' folder in the same directory as this script
-                3. Place both files in the 'data' folder
-                """)
-                return None, "Please download the required dataset files and place them in the 'data' directory."
-                
-            if selected_dataset == "Mathematics":
-                if not os.path.exists(math_path):
-                    return None, f"Mathematics dataset not found at {math_path}"
-                return load_data(math_path), None
-            else:
-                if not os.path.exists(por_path):
-                    return None, f"Portuguese dataset not found at {por_path}"
-                return load_data(por_path), None
-            
-        except Exception as e:
-            st.error(f"Error loading data: {str(e)}")
-            return None, f"An error occurred while loading the data: {str(e)}"
-
-    @st.cache_resource
-    def load_cached_models(df):
-        try:
-            X_binary, y_binary = prepare_features(df, target='binary')
-            X_multi, y_multi = prepare_features(df, target='multiclass')
-            model_binary, *_ = train_model(X_binary, y_binary, 'binary')
-            model_multi, *_ = train_model(X_multi, y_multi, 'multiclass')
-            return model_binary, model_multi, X_binary.columns, None
-        except Exception as e:
-            return None, None, None, "An error occurred while preparing the models. Please check your data."
-
-    # Load data with error handling
-    df, data_error = load_cached_data(dataset_choice)
-    
-    if data_error:
-        st.warning(data_error)
-        st.info("""
-        To get started:
-        1. Download the required datasets:
-           - [Mathematics Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-mat.csv)
-           - [Portuguese Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-por.csv)
-        2. Place them in the 'data' directory
-        3. Refresh the page
-        """)
-        st.stop()
-    
-    # Load models with error handling
-    model_binary, model_multi, feature_names, model_error = load_cached_models(df)
-    
-    if model_error:
-        st.warning(model_error)
+def dataset_path(selected_dataset):
+    """The course's CSV under data/ if it was extracted, else its member of data/student.zip, else ``None``."""
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    path = os.path.join(data_dir, DATASET_FILES[selected_dataset])
+    if os.path.exists(path):
+        return path
+    # Read straight from the archive; no extracted copy is needed
+    archive_path = os.path.join(data_dir, ARCHIVE_NAME)
+    return os.path.join(archive_path, DATASET_FILES[selected_dataset]) if os.path.isfile(archive_path) else None
+
+def import_plotting():
+    """Import matplotlib and seaborn on first use; they dominate cold-start time."""
+    with startup_timer.phase('plotting imports'):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+    return plt, sns
+
+def render_app(rerun_profiler=None):
+    """Render the whole page; ``rerun_profiler``, if given, is labelled with the page and dataset."""
+    # Run requirements check
+    if not check_requirements():
         st.stop()
 
-# Enhanced sidebar with Bootstrap-style navigation
-with st.sidebar:
+    # Page configuration must be the first Streamlit command
+    st.set_page_config(
+        page_title="Student Performance Analytics",
+        page_icon="📚",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    # Custom CSS for luxury design with animations and responsive layout
     st.markdown("""
-    <div class="nav-title">
-        Navigation
-    </div>
-    """, unsafe_allow_html=True)
+    <style>
+        /* Main container */
+        .main {
+            background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+            animation: gradientBG 15s ease infinite;
+            font-size: 16px;  /* Base font size increase */
+        }
+    
+        @keyframes gradientBG {
+            0% { background-position: 0% 50%; }
+            50% { background-position: 100% 50%; }
+            100% { background-position: 0% 50%; }
+        }
+    
+        /* Responsive containers */
+        @media (max-width: 768px) {
+            .responsive-grid {
+                grid-template-columns: 1fr !important;
+            }
+            .metrics-container {
+                flex-direction: column;
+            }
+        }
+    
+        /* Headers with animations */
+        h1 {
+            background: linear-gradient(120deg, #1e3d59, #2b4d6f);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            font-family: 'Helvetica Neue', sans-serif;
+            font-weight: 700;
+            padding: 1.5rem 0;
+            animation: fadeIn 0.5s ease-in;
+            font-size: 2.5rem !important;
+        }
+    
+        h2 {
+            color: #2b4d6f;
+            font-family: 'Helvetica Neue', sans-serif;
+            font-weight: 600;
+            transition: all 0.3s ease;
+            font-size: 2rem !important;
+        }
+    
+        h3 {
+            font-size: 1.75rem !important;
+        }
+    
+        p {
+            font-size: 1.1rem !important;
+            line-height: 1.6 !important;
+        }
+    
+        /* Animations */
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(20px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
+    
+        @keyframes slideIn {
+            from { transform: translateX(-20px); opacity: 0; }
+            to { transform: translateX(0); opacity: 1; }
+        }
+    
+        /* Cards with hover effects */
+        .card {
+            background: white;
+            border-radius: 1rem;
+            padding: 1.5rem;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            transition: all 0.3s ease;
+            animation: fadeIn 0.5s ease-in;
+        }
+    
+        .card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 8px 12px rgba(0, 0, 0, 0.15);
+        }
+    
+        /* Metrics with animations */
+        .metric-value {
+            font-size: 2.5rem;
+            font-weight: bold;
+            color: #1e3d59;
+            animation: countUp 1s ease-out;
+        }
+    
+        .metric-label {
+            color: #666;
+            font-size: 0.9rem;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+        }
+    
+        /* Sidebar styling */
+        [data-testid="stSidebar"] {
+            background: #343a40 !important;
+            padding: 0 !important;
+        }
+    
+        /* Navigation title */
+        .nav-title {
+            background: #212529;
+            color: white !important;
+            font-size: 1.5rem !important;
+            font-weight: 600 !important;
+            padding: 1rem !important;
+            margin: 0 !important;
+            text-align: left;
+        }
+    
+        /* Bootstrap-style navigation buttons */
+        .stRadio > div[role="radiogroup"] {
+            padding: 0 !important;
+        }
+    
+        /* Hide radio button icons */
+        div[data-testid="stMarkdown"] + div[data-testid="stVerticalBlock"] div[role="radiogroup"] > label > div:first-child {
+            display: none !important;
+        }
+    
+        /* Navigation button text color */
+        .stRadio > div[role="radiogroup"] > label {
+             color: white !important;
+            font-size: 1rem !important;
+            padding: 0.8rem 1.5rem !important;
+            background: transparent !important;
+            border-radius: 0 !important;
+            margin: 0 !important;
+            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
+            transition: all 0.2s ease;
+        }
+    
+        /* Selected nav item */
+        .stRadio > div[role="radiogroup"] > label[data-checked="true"] {
+            background: rgba(255, 255, 255, 0.1) !important;
+            color: #007bff !important;
+            font-weight: 600;
+            box-shadow: none !important;
+            border-left: 4px solid #007bff;
+        }
+    
+        /* Footer in sidebar */
+        .sidebar-footer {
+            position: fixed;
+            bottom: 0;
+            left: 0;
+            width: 100%;
+            padding: 1rem;
+            background: rgba(0, 0, 0, 0.2);
+            backdrop-filter: blur(5px);
+            color: rgba(255, 255, 255, 0.8);
+            font-size: 0.8rem;
+            text-align: center;
+            animation: fadeIn 0.5s ease-in;
+        }
+    
+        .sidebar-footer p {
+            margin: 0;
+            line-height: 1.5;
+        }
+    
+        /* Buttons with animations */
+        .stButton>button {
+            background: linear-gradient(45deg, #1e3d59, #2b4d6f);
+            color: white;
+            border-radius: 2rem;
+            padding: 0.75rem 2rem;
+            border: none;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            transition: all 0.3s ease;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+            font-weight: 500;
+        }
     
-    # Custom radio buttons with Bootstrap-style
-    page = st.radio("",
-                    options=["Dashboard", "Predict Performance", "About"],
-                    key="navigation",
-                    help="Navigate through different sections of the application",
-                    label_visibility="collapsed")
+        .stButton>button:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 6px 8px rgba(0, 0, 0, 0.15);
+            background: linear-gradient(45deg, #2b4d6f, #1e3d59);
+        }
     
-    # Enhanced footer with better contrast
+        /* Plots with animations */
+        .plot-container {
+            background: white;
+            border-radius: 1rem;
+            padding: 1.5rem;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            transition: all 0.3s ease;
+            animation: fadeIn 0.5s ease-in;
+        }
+    
+        .plot-container:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 8px 12px rgba(0, 0, 0, 0.15);
+        }
+    
+        /* Form inputs with animations */
+        .stSlider, .stSelectbox {
+            animation: slideIn 0.5s ease-in;
+        }
+    
+        /* Loading animation */
+        .stProgress .st-bo {
+            background-color: #1e3d59;
+            height: 3px;
+            animation: loading 1s ease-in-out infinite;
+        }
+    
+        @keyframes loading {
+            0% { width: 0%; }
+            50% { width: 100%; }
+            100% { width: 0%; }
+        }
+    
+        /* Navigation menu items */
+        .nav-item {
+            padding: 0.5rem 1rem;
+            margin: 0.5rem 0;
+            border-radius: 0.5rem;
+            transition: all 0.3s ease;
+            cursor: pointer;
+            color: white;
+        }
+    
+        .nav-item:hover {
+            background: rgba(255, 255, 255, 0.1);
+            transform: translateX(5px);
+        }
+    
+        /* Increase text size globally */
+        .stMarkdown, .stText {
+            font-size: 1.1rem !important;
+        }
+
+        /* Add tab styling for white text */
+        [data-testid="stTabs"] [data-baseweb="tab-list"] {
+            gap: 8px;
+        }
+
+        [data-testid="stTabs"] [data-baseweb="tab"] {
+            background-color: transparent;
+            color: white !important;
+            border-radius: 4px;
+            font-weight: 500;
+            padding: 8px 16px;
+        }
+
+        [data-testid="stTabs"] [data-baseweb="tab-highlight"] {
+            background-color: #007bff;
+        }
+
+        [data-testid="stTabs"] [data-baseweb="tab"][aria-selected="true"] {
+            background-color: rgba(255, 255, 255, 0.1);
+            color: white !important;
+        }
+
+        [data-testid="stTabs"] [data-baseweb="tab-panel"] {
+            padding: 16px 0;
+        }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # Enhanced title and introduction with animation
     st.markdown("""
-    <div class="sidebar-footer">
-        <p style='font-weight: 600; color: white;'>Created by Person Who Loves Child</p>
+    <div style='text-align: center; padding: 2rem 0; animation: fadeIn 0.5s ease-in;'>
+        <h1 style='font-size: 3rem; margin-bottom: 1rem;'>📚 Student Performance Analytics</h1>
+        <p style='font-size: 1.2rem; color: #666; max-width: 800px; margin: 0 auto; line-height: 1.6;'>
+            Unlock powerful insights into student performance through advanced analytics and predictive modeling
+        </p>
     </div>
     """, unsafe_allow_html=True)
 
-if page == "Dashboard":
-    # Enhanced metrics display with animations and new color scheme
-    st.markdown("""
-    <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 1.5rem; margin-bottom: 2rem;'>
-        <div class='card' style='background: linear-gradient(135deg, #00B4DB 0%, #0083B0 100%);'>
-            <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px;'>TOTAL STUDENTS</p>
-            <h2 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{}</h2>
-            <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem;'>Enrolled Students</p>
-        </div>
-        <div class='card' style='background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);'>
-            <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px;'>AVERAGE GRADE</p>
-            <h2 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{:.1f}</h2>
-            <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem;'>Out of 20</p>
+    # Enhanced sidebar with Bootstrap-style navigation
+    with st.sidebar:
+        st.markdown("""
+        <div class="nav-title">
+            Navigation
         </div>
-        <div class='card' style='background: linear-gradient(135deg, #FF416C 0%, #FF4B2B 100%);'>
-            <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px;'>SUCCESS RATE</p>
-            <h2 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{:.1f}%</h2>
-            <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem;'>Passing Students</p>
+        """, unsafe_allow_html=True)
+    
+        # Custom radio buttons with Bootstrap-style
+        pages = ["Dashboard", "Predict Performance", "About"]
+        if is_admin():
+            pages.append("Performance")
+        page = st.radio("",
+                        options=pages,
+                        key="navigation",
+                        help="Navigate through different sections of the application",
+                        label_visibility="collapsed")
+    
+        # Enhanced footer with better contrast
+        st.markdown("""
+        <div class="sidebar-footer">
+            <p style='font-weight: 600; color: white;'>Created by Person Who Loves Child</p>
         </div>
-    </div>
-    """.format(len(df), df['G3'].mean(), df['performance_binary'].mean()*100), unsafe_allow_html=True)
+        """, unsafe_allow_html=True)
 
-    # Interactive Analysis Section
-    st.markdown("""
-    <h2 style='color: #1e3d59; margin: 2rem 0 1rem;'>📊 Performance Analysis</h2>
-    """, unsafe_allow_html=True)
+    # Load and cache data with loading animation
+    with st.spinner('Loading data and models...'):
+        # Dataset selection moved outside cached function
+        dataset_choice = st.radio(
+            "Choose dataset to analyze:",
+            ["Mathematics", "Portuguese", COMBINED_DATASET],
+            help="Select which course data to analyze"
+        )
+        if rerun_profiler is not None:
+            rerun_profiler.label = page
+            rerun_profiler.context.update(dataset=dataset_choice)
+
+        @st.cache_data
+        def load_cached_data(selected_dataset):
+            REGISTRY.cache_miss('data')
+            try:
+                # Get the absolute path to the data directory
+                current_dir = os.path.dirname(os.path.abspath(__file__))
+                data_dir = os.path.join(current_dir, 'data')
+            
+                # Check if data directory exists, if not create it
+                if not os.path.exists(data_dir):
+                    os.makedirs(data_dir)
+            
+                math_path = dataset_path('Mathematics')
+                por_path = dataset_path('Portuguese')
+            
+                if math_path is None or por_path is None:
+                    st.error("Dataset files not found!")
+                    st.info("""
+                    ### Missing Dataset Files
+                    Please ensure you have the required dataset files:
+                    1. Run `python download_data.py` to download `data/student.zip`; the app reads both courses from it directly. Or download the datasets:
+                       - [Mathematics Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-mat.csv)
+                       - [Portuguese Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-por.csv)
+                    2. Create a 'data' folder in the same directory as this script
+                    3. Place both files in the 'data' folder
+                    """)
+                    return None, "Please download the required dataset files and place them in the 'data' directory."
+                
+                if selected_dataset == COMBINED_DATASET:
+                    return merge_courses(load_data_cached(math_path), load_data_cached(por_path)), None
+                elif selected_dataset == "Mathematics":
+                    return load_data_cached(math_path), None
+                else:
+                    return load_data_cached(por_path), None
+            
+            except Exception as e:
+                st.error(f"Error loading data: {str(e)}")
+                return None, f"An error occurred while loading the data: {str(e)}"
 
-    # Add tabs for different analyses
-    tab1, tab2, tab3 = st.tabs(["Grade Distribution", "Performance Factors", "Time Series"])
+        @st.cache_resource
+        def load_cached_models(selected_dataset):
+            REGISTRY.cache_miss('models')
+            try:
+                # Load the pre-trained artifact for this dataset; train only on a cache miss.
+                # The compiled forests are memory-mapped, so every worker process on the
+                # host shares one copy of the model files through the page cache
+                data_path = dataset_path(selected_dataset)
+                model_binary, model_multi, encoder, metadata = load_or_train(data_path, mmap_mode='r', compiled=True)
+                return model_binary, model_multi, encoder, model_version(metadata), None
+            except Exception as e:
+                return None, None, None, None, "An error occurred while preparing the models. Please check your data."
 
-    with tab1:
-        col1, col2 = st.columns(2)
+        @st.cache_data(max_entries=8, show_spinner=False)
+        def load_permutation_importance(selected_dataset, model_version_id):
+            # Scored once per model version and stored with the artifact, so only the
+            # first process to show a new model pays for it
+            data_path = dataset_path(selected_dataset)
+            with REGISTRY.timer('permutation_importance', dataset=selected_dataset):
+                return pd.DataFrame(load_or_compute_importance(data_path)['importances'])
+
+        @st.cache_resource
+        def load_prediction_cache():
+            # One cache for all sessions; entries are tied to the model version they came from
+            cache = PredictionCache(int(os.environ.get('STUDENT_APP_PREDICTION_CACHE_SIZE', DEFAULT_MAX_ENTRIES)))
+            REGISTRY.register_cache('predictions', cache.stats)
+            return cache
+
+        @st.cache_resource
+        def load_aggregate_store(selected_dataset):
+            return AggregateStore.open(dataset_path(selected_dataset))
+
+        @st.cache_resource
+        def load_chart_cache():
+            max_mb = int(os.environ.get('STUDENT_APP_CHART_CACHE_MB', 64))
+            cache = ChartCache(max_bytes=max_mb * 2**20, disk_dir=os.environ.get('STUDENT_APP_CHART_CACHE_DIR'))
+            REGISTRY.register_cache('charts', cache.stats)
+            return cache
+
+        @st.cache_resource
+        def start_metrics_server():
+            # Prometheus scrape endpoint for this process, if a port is configured
+            port = os.environ.get('STUDENT_APP_METRICS_PORT')
+            if not port:
+                return None
+            try:
+                return start_http_server(int(port), host=os.environ.get('STUDENT_APP_METRICS_HOST', '127.0.0.1'))
+            except OSError:
+                # Another worker process already serves this port
+                return None
+
+        start_metrics_server()
+
+        @st.cache_resource(max_entries=4)
+        def load_scatter_index(dataset_version, _df):
+            # Joint count tables for every scatter axis pair, built once per dataset version
+            return ScatterIndex.build(_df)
+
+        def warm_dataset(selected_dataset):
+            REGISTRY.cache_request('data')
+            data_error = load_cached_data(selected_dataset)[1]
+            if data_error:
+                raise RuntimeError(data_error)
+
+        def warm_models(selected_dataset):
+            REGISTRY.cache_request('models')
+            *_, model_version_id, model_error = load_cached_models(selected_dataset)
+            if model_error:
+                raise RuntimeError(model_error)
+            load_permutation_importance(selected_dataset, model_version_id)
+
+        @st.cache_resource(show_spinner=False)
+        def start_prewarm():
+            # Once per process, load every dataset and its models in the background so
+            # switching datasets does not stall on a CSV parse or a model load
+            # The workers have no session, which Streamlit would log on every cache call
+            logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(
+                lambda record: not record.threadName.startswith('prewarm'))
+            plans = {
+                name: [
+                    ('data', lambda name=name: warm_dataset(name)),
+                    ('models', lambda name=name: warm_models(name)),
+                    ('statistics', lambda name=name: load_aggregate_store(name).refresh()),
+                ]
+                for name in DATASET_FILES
+            }
+            plans[COMBINED_DATASET] = [('data', lambda: warm_dataset(COMBINED_DATASET))]
+            return Prewarmer(plans).start()
+
+        prewarmer = start_prewarm() if prewarm_enabled() else None
+
+        if prewarmer is not None:
+            # Polls while warming runs, then reruns the whole app once so the fragment stops polling
+            polling = not prewarmer.done()
+
+            @st.fragment(run_every=1 if polling else None)
+            def show_prewarm_status():
+                if polling and prewarmer.done():
+                    st.rerun(scope='app')
+                lines = []
+                for name, entry in prewarmer.status().items():
+                    if entry['state'] == READY:
+                        lines.append(f"✅ {name}: ready in {entry['seconds']:.1f}s")
+                    elif entry['state'] == FAILED:
+                        lines.append(f"⚠️ {name}: failed ({entry['error']})")
+                    elif entry['state'] == LOADING:
+                        lines.append(f"⏳ {name}: loading {entry['step']}")
+                    else:
+                        lines.append(f"⏳ {name}: queued")
+                st.caption("Datasets  \n" + "  \n".join(lines))
+
+            with st.sidebar:
+                show_prewarm_status()
+
+        # Load data with error handling
+        with startup_timer.phase('data load'), REGISTRY.timer('load_cached_data', dataset=dataset_choice) as timing:
+            df, data_error = load_cached_data(dataset_choice)
+            timing.rows = None if df is None else len(df)
+        REGISTRY.cache_request('data')
+    
+        if data_error:
+            st.warning(data_error)
+            st.info("""
+            To get started:
+            1. Run `python download_data.py`, or download the required datasets:
+               - [Mathematics Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-mat.csv)
+               - [Portuguese Dataset](https://archive.ics.uci.edu/ml/machine-learning-databases/00320/student-por.csv)
+            2. Place them in the 'data' directory
+            3. Refresh the page
+            """)
+            st.stop()
+    
+        # Load models with error handling; only the Dashboard and Predict pages need them,
+        # and models are trained per course, so the combined cohort has none
+        if page in ("Dashboard", "Predict Performance") and dataset_choice != COMBINED_DATASET:
+            with startup_timer.phase('model load'), REGISTRY.timer('load_cached_models', dataset=dataset_choice):
+                model_binary, model_multi, encoder, model_version_id, model_error = load_cached_models(dataset_choice)
+            REGISTRY.cache_request('models')
         
-        with col1:
-            st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
+            if model_error:
+                st.warning(model_error)
+                st.stop()
+    
+        # Dashboard numbers come from the incrementally maintained grade statistics;
+        # refresh only parses rows appended to the dataset since the last rerun
+        with startup_timer.phase('aggregate refresh'):
+            if dataset_choice == COMBINED_DATASET:
+                # Versioned by both course files, so a change to either invalidates its charts
+                course_stores = [load_aggregate_store(name) for name in DATASET_FILES]
+                for store in course_stores:
+                    store.refresh()
+                aggregate_version = ':'.join(str(store.version) for store in course_stores)
+            else:
+                aggregate_store = load_aggregate_store(dataset_choice)
+                aggregate_store.refresh()
+                aggregate_version = aggregate_store.version
+                grade_stats = aggregate_store.stats
+
+    if page in ("Dashboard", "Predict Performance") and dataset_choice == COMBINED_DATASET:
+        chart_cache = load_chart_cache()
+        st.markdown("""
+        <h2 style='color: #1e3d59; margin: 2rem 0 1rem;'>📚 Students Taking Both Courses</h2>
+        """, unsafe_allow_html=True)
+        if page == "Predict Performance":
+            st.info("Predictions use the model of a single course. Choose Mathematics or Portuguese above to predict a student's performance.")
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Students", len(df))
+        col2.metric("Average Mathematics Grade", f"{df['G3_mat'].mean():.1f}")
+        col3.metric("Average Portuguese Grade", f"{df['G3_por'].mean():.1f}")
+
+        def render_course_grades():
+            plt, sns = import_plotting()
             fig, ax = plt.subplots(figsize=(10, 6))
             sns.set_style("whitegrid")
-            sns.histplot(data=df, x='G3', bins=20, color='#00B4DB')
-            plt.title('Distribution of Final Grades', pad=20, color='#1e3d59')
-            plt.xlabel('Final Grade', color='#666')
-            plt.ylabel('Count', color='#666')
+            # One marker per grade pair, sized by the number of students with it
+            pairs = df.groupby(['G3_mat', 'G3_por']).size().reset_index(name='students')
+            ax.scatter(pairs['G3_mat'], pairs['G3_por'], s=pairs['students'] * 25, alpha=0.6, color='#00B4DB')
+            ax.plot([0, 20], [0, 20], linestyle='--', color='#666', linewidth=1)
+            plt.title('Final Grade in Mathematics vs Portuguese', pad=20, color='#1e3d59')
+            plt.xlabel('Mathematics Final Grade', color='#666')
+            plt.ylabel('Portuguese Final Grade', color='#666')
             ax.tick_params(colors='#666')
-            st.pyplot(fig)
-            plt.close()
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
-            fig, ax = plt.subplots(figsize=(10, 6))
-            sns.set_style("white")
-            grade_corr = df[['G1', 'G2', 'G3']].corr()
-            sns.heatmap(grade_corr, annot=True, cmap='YlOrRd', center=0,
-                       annot_kws={'color': 'white'})
-            plt.title('Grade Progression Correlation', pad=20, color='#1e3d59')
-            ax.tick_params(colors='#666')
-            st.pyplot(fig)
-            plt.close()
-            st.markdown("</div>", unsafe_allow_html=True)
+            return fig
+        with REGISTRY.timer('chart', chart='course_grades'):
+            st.image(chart_cache.get_or_render(
+                chart_key(f"{COMBINED_DATASET}:{aggregate_version}", 'course_grades'), render_course_grades))
+        st.dataframe(df, hide_index=True)
 
-    with tab2:
-        # Add feature importance plot
-        st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
-        importances = pd.DataFrame({
-            'feature': feature_names,
-            'importance': model_binary.feature_importances_
-        }).sort_values('importance', ascending=False)
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-        sns.barplot(data=importances.head(10), x='importance', y='feature', palette='viridis')
-        plt.title('Top 10 Factors Influencing Student Performance', pad=20, color='#1e3d59')
-        plt.xlabel('Importance Score', color='#666')
-        plt.ylabel('Factor', color='#666')
-        ax.tick_params(colors='#666')
-        st.pyplot(fig)
-        plt.close()
-        st.markdown("</div>", unsafe_allow_html=True)
+    elif page == "Dashboard":
+        # Rendered charts are cached per dataset version and widget state
+        chart_cache = load_chart_cache()
+        dataset_version = f"{dataset_choice}:{aggregate_version}"
 
-        # Add interactive scatter plot
-        st.markdown("<div class='plot-container' style='margin-top: 2rem;'>", unsafe_allow_html=True)
-        x_axis = st.selectbox('Select X-axis:', ['G1', 'G2', 'studytime', 'absences', 'Medu', 'Fedu'])
-        y_axis = st.selectbox('Select Y-axis:', ['G3', 'G2', 'G1', 'studytime', 'absences'])
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.scatterplot(data=df, x=x_axis, y=y_axis, hue='performance_binary', 
-                       palette=['#FF4B2B', '#38ef7d'])
-        plt.title(f'{x_axis} vs {y_axis}', pad=20, color='#1e3d59')
-        plt.xlabel(x_axis, color='#666')
-        plt.ylabel(y_axis, color='#666')
-        ax.tick_params(colors='#666')
-        st.pyplot(fig)
-        plt.close()
-        st.markdown("</div>", unsafe_allow_html=True)
+        def dashboard_chart(chart_id, render, params=None):
+            def timed_render():
+                with REGISTRY.timer('chart_render', chart=chart_id):
+                    return render()
+            with REGISTRY.timer('chart', chart=chart_id):
+                return chart_cache.get_or_render(chart_key(dataset_version, chart_id, params), timed_render)
+    
+        # Enhanced metrics display with animations and new color scheme
+        st.markdown("""
+        <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 1.5rem; margin-bottom: 2rem;'>
+            <div class='card' style='background: linear-gradient(135deg, #00B4DB 0%, #0083B0 100%);'>
+                <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px;'>TOTAL STUDENTS</p>
+                <h2 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{}</h2>
+                <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem;'>Enrolled Students</p>
+            </div>
+            <div class='card' style='background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);'>
+                <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px;'>AVERAGE GRADE</p>
+                <h2 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{:.1f}</h2>
+                <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem;'>Out of 20</p>
+            </div>
+            <div class='card' style='background: linear-gradient(135deg, #FF416C 0%, #FF4B2B 100%);'>
+                <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px;'>SUCCESS RATE</p>
+                <h2 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{:.1f}%</h2>
+                <p style='color: rgba(255,255,255,0.8); font-size: 0.9rem;'>Passing Students</p>
+            </div>
+        </div>
+        """.format(grade_stats.n, grade_stats.column_mean('G3'), grade_stats.success_rate*100), unsafe_allow_html=True)
+
+        # Interactive Analysis Section
+        st.markdown("""
+        <h2 style='color: #1e3d59; margin: 2rem 0 1rem;'>📊 Performance Analysis</h2>
+        """, unsafe_allow_html=True)
+
+        # Add tabs for different analyses
+        tab1, tab2, tab3 = st.tabs(["Grade Distribution", "Performance Factors", "Time Series"])
 
-    with tab3:
-        # Add grade progression analysis
-        st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
-        fig, ax = plt.subplots(figsize=(12, 6))
+        with tab1:
+            col1, col2 = st.columns(2)
         
-        # Calculate average grades for each period
-        grade_progression = pd.DataFrame({
-            'Period': ['First', 'Second', 'Final'],
-            'Average Grade': [df['G1'].mean(), df['G2'].mean(), df['G3'].mean()]
-        })
+            with col1:
+                st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
+                def render_grade_histogram():
+                    plt, sns = import_plotting()
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    sns.set_style("whitegrid")
+                    g3_counts = grade_stats.histograms['G3']
+                    g3_values = np.flatnonzero(g3_counts)
+                    sns.histplot(x=g3_values, weights=g3_counts[g3_values], bins=20, color='#00B4DB')
+                    plt.title('Distribution of Final Grades', pad=20, color='#1e3d59')
+                    plt.xlabel('Final Grade', color='#666')
+                    plt.ylabel('Count', color='#666')
+                    ax.tick_params(colors='#666')
+                    return fig
+                st.image(dashboard_chart('grade_histogram', render_grade_histogram))
+                st.markdown("</div>", unsafe_allow_html=True)
         
-        sns.lineplot(data=grade_progression, x='Period', y='Average Grade', 
-                    marker='o', color='#00B4DB', linewidth=3, markersize=10)
-        plt.title('Grade Progression Throughout the Year', pad=20, color='#1e3d59')
-        plt.xlabel('Assessment Period', color='#666')
-        plt.ylabel('Average Grade', color='#666')
-        ax.tick_params(colors='#666')
+            with col2:
+                st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
+                def render_grade_correlation():
+                    plt, sns = import_plotting()
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    sns.set_style("white")
+                    grade_corr = grade_stats.corr()
+                    sns.heatmap(grade_corr, annot=True, cmap='YlOrRd', center=0,
+                               annot_kws={'color': 'white'})
+                    plt.title('Grade Progression Correlation', pad=20, color='#1e3d59')
+                    ax.tick_params(colors='#666')
+                    return fig
+                st.image(dashboard_chart('grade_correlation', render_grade_correlation))
+                st.markdown("</div>", unsafe_allow_html=True)
+
+        with tab2:
+            # Add feature importance plot
+            st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
+            def render_feature_importance():
+                plt, sns = import_plotting()
+                # Permutation importance on held-out students; a categorical's indicator
+                # columns are shuffled together, so each factor is ranked as a whole
+                importances = load_permutation_importance(dataset_choice, model_version_id).head(10)
+
+                fig, ax = plt.subplots(figsize=(12, 6))
+                sns.barplot(data=importances, x='mean', y='feature', palette='viridis')
+                ax.errorbar(importances['mean'], np.arange(len(importances)), xerr=importances['std'],
+                            fmt='none', ecolor='#666', capsize=3)
+                plt.title('Top 10 Factors Influencing Student Performance', pad=20, color='#1e3d59')
+                plt.xlabel('Drop in Prediction Score When Shuffled', color='#666')
+                plt.ylabel('Factor', color='#666')
+                ax.tick_params(colors='#666')
+                return fig
+            st.image(dashboard_chart('feature_importance', render_feature_importance,
+                                     {'model_version': model_version_id}))
+            st.markdown("</div>", unsafe_allow_html=True)
+
+            # Add interactive scatter plot
+            st.markdown("<div class='plot-container' style='margin-top: 2rem;'>", unsafe_allow_html=True)
+            x_axis = st.selectbox('Select X-axis:', SCATTER_X_AXES)
+            y_axis = st.selectbox('Select Y-axis:', SCATTER_Y_AXES)
         
-        # Add percentage changes
-        for i in range(1, len(grade_progression)):
-            pct_change = ((grade_progression['Average Grade'][i] - grade_progression['Average Grade'][i-1]) 
-                         / grade_progression['Average Grade'][i-1] * 100)
-            plt.annotate(f'{pct_change:+.1f}%',
-                        xy=(i, grade_progression['Average Grade'][i]),
-                        xytext=(0, 10), textcoords='offset points',
-                        ha='center', va='bottom',
-                        color='#666')
+            # Large datasets are drawn as exact (x, y) bins instead of one marker per student
+            raw_point_limit = int(os.environ.get('STUDENT_APP_SCATTER_RAW_LIMIT', DEFAULT_RAW_POINT_LIMIT))
         
-        st.pyplot(fig)
-        plt.close()
-        st.markdown("</div>", unsafe_allow_html=True)
+            def render_scatter():
+                plt, sns = import_plotting()
+                fig, ax = plt.subplots(figsize=(10, 6))
+                mode, scatter_data = scatter_level_of_detail(df, x_axis, y_axis, raw_point_limit=raw_point_limit,
+                                                             index=load_scatter_index(dataset_version, df))
+                if mode == 'raw':
+                    sns.scatterplot(data=scatter_data, x=x_axis, y=y_axis, hue='performance_binary', 
+                                   palette=['#FF4B2B', '#38ef7d'])
+                else:
+                    plot_binned_scatter(ax, scatter_data, x_axis, y_axis)
+                plt.title(f'{x_axis} vs {y_axis}', pad=20, color='#1e3d59')
+                plt.xlabel(x_axis, color='#666')
+                plt.ylabel(y_axis, color='#666')
+                ax.tick_params(colors='#666')
+                return fig
+            st.image(dashboard_chart(
+                'scatter', render_scatter,
+                {'x_axis': x_axis, 'y_axis': y_axis, 'raw_point_limit': raw_point_limit}))
+            st.markdown("</div>", unsafe_allow_html=True)
 
-    # Add key insights section
-    st.markdown("""
-    <div style='margin-top: 3rem;'>
-        <h2 style='color: #1e3d59; margin-bottom: 1.5rem;'>🔍 Key Insights</h2>
-        <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 1.5rem;'>
-            <div class='card' style='background: white;'>
-                <h3 style='color: #1e3d59; font-size: 1.2rem; margin-bottom: 1rem;'>Grade Distribution</h3>
-                <p style='color: #666; line-height: 1.6;'>
-                    The average final grade is {:.1f}/20, with {:.1f}% of students achieving passing grades.
-                    The distribution shows a {}.
-                </p>
-            </div>
-            <div class='card' style='background: white;'>
-                <h3 style='color: #1e3d59; font-size: 1.2rem; margin-bottom: 1rem;'>Performance Factors</h3>
-                <p style='color: #666; line-height: 1.6;'>
-                    Previous grades (G1, G2) show the strongest correlation with final performance,
-                    followed by study time and parent education levels.
-                </p>
-            </div>
-            <div class='card' style='background: white;'>
-                <h3 style='color: #1e3d59; font-size: 1.2rem; margin-bottom: 1rem;'>Trends</h3>
-                <p style='color: #666; line-height: 1.6;'>
-                    Student performance shows {} trend throughout the academic year,
-                    with the most significant changes between {}.
-                </p>
+        with tab3:
+            # Add grade progression analysis
+            st.markdown("<div class='plot-container'>", unsafe_allow_html=True)
+            def render_grade_progression():
+                plt, sns = import_plotting()
+                fig, ax = plt.subplots(figsize=(12, 6))
+            
+                # Calculate average grades for each period
+                grade_progression = pd.DataFrame({
+                    'Period': ['First', 'Second', 'Final'],
+                    'Average Grade': [grade_stats.column_mean('G1'), grade_stats.column_mean('G2'), grade_stats.column_mean('G3')]
+                })
+            
+                sns.lineplot(data=grade_progression, x='Period', y='Average Grade', 
+                            marker='o', color='#00B4DB', linewidth=3, markersize=10)
+                plt.title('Grade Progression Throughout the Year', pad=20, color='#1e3d59')
+                plt.xlabel('Assessment Period', color='#666')
+                plt.ylabel('Average Grade', color='#666')
+                ax.tick_params(colors='#666')
+            
+                # Add percentage changes
+                for i in range(1, len(grade_progression)):
+                    pct_change = ((grade_progression['Average Grade'][i] - grade_progression['Average Grade'][i-1]) 
+                                 / grade_progression['Average Grade'][i-1] * 100)
+                    plt.annotate(f'{pct_change:+.1f}%',
+                                xy=(i, grade_progression['Average Grade'][i]),
+                                xytext=(0, 10), textcoords='offset points',
+                                ha='center', va='bottom',
+                                color='#666')
+                return fig
+            st.image(dashboard_chart('grade_progression', render_grade_progression))
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # Add key insights section
+        st.markdown("""
+        <div style='margin-top: 3rem;'>
+            <h2 style='color: #1e3d59; margin-bottom: 1.5rem;'>🔍 Key Insights</h2>
+            <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 1.5rem;'>
+                <div class='card' style='background: white;'>
+                    <h3 style='color: #1e3d59; font-size: 1.2rem; margin-bottom: 1rem;'>Grade Distribution</h3>
+                    <p style='color: #666; line-height: 1.6;'>
+                        The average final grade is {:.1f}/20, with {:.1f}% of students achieving passing grades.
+                        The distribution shows a {}.
+                    </p>
+                </div>
+                <div class='card' style='background: white;'>
+                    <h3 style='color: #1e3d59; font-size: 1.2rem; margin-bottom: 1rem;'>Performance Factors</h3>
+                    <p style='color: #666; line-height: 1.6;'>
+                        Previous grades (G1, G2) show the strongest correlation with final performance,
+                        followed by study time and parent education levels.
+                    </p>
+                </div>
+                <div class='card' style='background: white;'>
+                    <h3 style='color: #1e3d59; font-size: 1.2rem; margin-bottom: 1rem;'>Trends</h3>
+                    <p style='color: #666; line-height: 1.6;'>
+                        Student performance shows {} trend throughout the academic year,
+                        with the most significant changes between {}.
+                    </p>
+                </div>
             </div>
         </div>
-    </div>
-    """.format(
-        df['G3'].mean(),
-        df['performance_binary'].mean() * 100,
-        'normal distribution with slight right skew' if df['G3'].skew() > 0 else 'normal distribution with slight left skew',
-        'an improving' if df['G3'].mean() > df['G1'].mean() else 'a stable',
-        'first and second periods' if abs(df['G2'].mean() - df['G1'].mean()) > abs(df['G3'].mean() - df['G2'].mean()) else 'second and final periods'
-    ), unsafe_allow_html=True)
-
-    # Add export options
-    st.markdown("""
-    <div style='margin-top: 2rem; text-align: right;'>
-        <button class='stButton' style='margin-left: 1rem;'>
-            📊 Export Report
-        </button>
-        <button class='stButton' style='margin-left: 1rem;'>
-            📥 Download Data
-        </button>
-    </div>
-    """, unsafe_allow_html=True)
+        """.format(
+            grade_stats.column_mean('G3'),
+            grade_stats.success_rate * 100,
+            'normal distribution with slight right skew' if grade_stats.skew('G3') > 0 else 'normal distribution with slight left skew',
+            'an improving' if grade_stats.column_mean('G3') > grade_stats.column_mean('G1') else 'a stable',
+            'first and second periods' if abs(grade_stats.column_mean('G2') - grade_stats.column_mean('G1')) > abs(grade_stats.column_mean('G3') - grade_stats.column_mean('G2')) else 'second and final periods'
+        ), unsafe_allow_html=True)
 
-elif page == "Predict Performance":
-    st.markdown("""
-    <div class='card' style='margin-bottom: 2rem;'>
-        <h2 style='color: #1e3d59; margin-bottom: 1rem;'>🎯 Student Performance Prediction</h2>
-        <p style='color: #666; line-height: 1.6;'>Enter student information below to generate performance predictions</p>
-    </div>
-    """, unsafe_allow_html=True)
+        # Add export options
+        st.markdown("""
+        <div style='margin-top: 2rem; text-align: right;'>
+            <button class='stButton' style='margin-left: 1rem;'>
+                📊 Export Report
+            </button>
+            <button class='stButton' style='margin-left: 1rem;'>
+                📥 Download Data
+            </button>
+        </div>
+        """, unsafe_allow_html=True)
+
+    elif page == "Predict Performance":
+        st.markdown("""
+        <div class='card' style='margin-bottom: 2rem;'>
+            <h2 style='color: #1e3d59; margin-bottom: 1rem;'>🎯 Student Performance Prediction</h2>
+            <p style='color: #666; line-height: 1.6;'>Enter student information below to generate performance predictions</p>
+        </div>
+        """, unsafe_allow_html=True)
     
-    # Enhanced input form with animations
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        with st.container():
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            g1 = st.slider("First Period Grade (G1)", 0, 20, 10,
-                          help="Student's grade in the first period")
-            g2 = st.slider("Second Period Grade (G2)", 0, 20, 10,
-                          help="Student's grade in the second period")
-            study_time = st.selectbox("Study Time", 
-                                    options=[1, 2, 3, 4],
-                                    help="1: <2 hours, 2: 2-5 hours, 3: 5-10 hours, 4: >10 hours")
-            absences = st.slider("Number of Absences", 0, 93, 5,
-                               help="Number of school absences")
-            st.markdown("</div>", unsafe_allow_html=True)
+        # Enhanced input form with animations
+        col1, col2 = st.columns(2)
     
-    with col2:
-        with st.container():
-            st.markdown("<div class='card'>", unsafe_allow_html=True)
-            mother_edu = st.selectbox("Mother's Education", 
-                                    options=[0, 1, 2, 3, 4],
-                                    help="0: none, 1: primary, 2: 5th-9th grade, 3: secondary, 4: higher")
-            father_edu = st.selectbox("Father's Education",
-                                    options=[0, 1, 2, 3, 4],
-                                    help="0: none, 1: primary, 2: 5th-9th grade, 3: secondary, 4: higher")
-            free_time = st.selectbox("Free Time",
-                                   options=[1, 2, 3, 4, 5],
-                                   help="1: very low to 5: very high")
-            health = st.selectbox("Health Status",
-                                options=[1, 2, 3, 4, 5],
-                                help="1: very bad to 5: very good")
-            st.markdown("</div>", unsafe_allow_html=True)
+        with col1:
+            with st.container():
+                st.markdown("<div class='card'>", unsafe_allow_html=True)
+                g1 = st.slider("First Period Grade (G1)", 0, 20, 10,
+                              help="Student's grade in the first period")
+                g2 = st.slider("Second Period Grade (G2)", 0, 20, 10,
+                              help="Student's grade in the second period")
+                study_time = st.selectbox("Study Time", 
+                                        options=[1, 2, 3, 4],
+                                        help="1: <2 hours, 2: 2-5 hours, 3: 5-10 hours, 4: >10 hours")
+                absences = st.slider("Number of Absences", 0, 93, 5,
+                                   help="Number of school absences")
+                st.markdown("</div>", unsafe_allow_html=True)
     
-    # Enhanced predict button with animation
-    st.markdown("<div style='text-align: center; margin: 2rem 0;'>", unsafe_allow_html=True)
-    predict_button = st.button("Generate Prediction")
-    st.markdown("</div>", unsafe_allow_html=True)
+        with col2:
+            with st.container():
+                st.markdown("<div class='card'>", unsafe_allow_html=True)
+                mother_edu = st.selectbox("Mother's Education", 
+                                        options=[0, 1, 2, 3, 4],
+                                        help="0: none, 1: primary, 2: 5th-9th grade, 3: secondary, 4: higher")
+                father_edu = st.selectbox("Father's Education",
+                                        options=[0, 1, 2, 3, 4],
+                                        help="0: none, 1: primary, 2: 5th-9th grade, 3: secondary, 4: higher")
+                free_time = st.selectbox("Free Time",
+                                       options=[1, 2, 3, 4, 5],
+                                       help="1: very low to 5: very high")
+                health = st.selectbox("Health Status",
+                                    options=[1, 2, 3, 4, 5],
+                                    help="1: very bad to 5: very good")
+                st.markdown("</div>", unsafe_allow_html=True)
     
-    if predict_button:
-        with st.spinner('Generating predictions...'):
-            try:
-                # Create feature vector with encoded values
-                input_data = pd.DataFrame({
-                    'G1': [g1],
-                    'G2': [g2],
-                    'studytime': [study_time],
-                    'absences': [absences],
-                    'Medu': [mother_edu],
-                    'Fedu': [father_edu],
-                    'freetime': [free_time],
-                    'health': [health],
-                    'age': [15],
-                    'failures': [0],
-                    'traveltime': [2],
-                    'goout': [3],
-                    'Dalc': [1],
-                    'Walc': [1],
-                    'school': ['GP'],
-                    'sex': ['F'],
-                    'address': ['U'],
-                    'famsize': ['GT3'],
-                    'Pstatus': ['T'],
-                    'Mjob': ['other'],
-                    'Fjob': ['other'],
-                    'reason': ['course'],
-                    'guardian': ['mother'],
-                    'schoolsup': ['no'],
-                    'famsup': ['no'],
-                    'paid': ['no'],
-                    'activities': ['no'],
-                    'nursery': ['yes'],
-                    'higher': ['yes'],
-                    'internet': ['yes'],
-                    'romantic': ['no']
-                })
+        # Enhanced predict button with animation
+        st.markdown("<div style='text-align: center; margin: 2rem 0;'>", unsafe_allow_html=True)
+        predict_button = st.button("Generate Prediction")
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+        if predict_button:
+            with st.spinner('Generating predictions...'):
+                try:
+                    # Raw student record; unspecified attributes use typical values
+                    input_record = {
+                        'G1': g1,
+                        'G2': g2,
+                        'studytime': study_time,
+                        'absences': absences,
+                        'Medu': mother_edu,
+                        'Fedu': father_edu,
+                        'freetime': free_time,
+                        'health': health,
+                        'age': 15,
+                        'failures': 0,
+                        'traveltime': 2,
+                        'goout': 3,
+                        'Dalc': 1,
+                        'Walc': 1,
+                        'school': 'GP',
+                        'sex': 'F',
+                        'address': 'U',
+                        'famsize': 'GT3',
+                        'Pstatus': 'T',
+                        'Mjob': 'other',
+                        'Fjob': 'other',
+                        'reason': 'course',
+                        'guardian': 'mother',
+                        'schoolsup': 'no',
+                        'famsup': 'no',
+                        'paid': 'no',
+                        'activities': 'no',
+                        'nursery': 'yes',
+                        'higher': 'yes',
+                        'internet': 'yes',
+                        'romantic': 'no'
+                    }
 
-                # Prepare features and make predictions
-                X_pred, _ = prepare_features(input_data)
-                
-                if X_pred is None:
-                    st.error("Unable to generate prediction. Please check your input values.")
-                    st.stop()
+                    # Encode with the dataset's fitted encoder and make predictions
+                    with REGISTRY.timer('encode', rows=1):
+                        X_pred = encoder.transform_one(input_record)
                 
-                binary_pred = model_binary.predict_proba(X_pred)
-                multi_pred = model_multi.predict_proba(X_pred)
+                    # Identical profiles are served from the shared prediction cache; the compiled
+                    # forests scale the row themselves and match sklearn exactly
+                    def predict_both():
+                        with REGISTRY.timer('predict_proba', rows=len(X_pred), dataset=dataset_choice):
+                            return model_binary.predict_proba(X_pred), model_multi.predict_proba(X_pred)
+                    binary_pred, multi_pred = load_prediction_cache().get_or_predict(
+                        dataset_choice, model_version_id, X_pred, predict_both)
                 
-                # Display results with enhanced styling and animations
-                st.markdown("""
-                <div class='card' style='margin-top: 2rem;'>
-                    <h2 style='color: #1e3d59; margin-bottom: 1.5rem;'>Prediction Results</h2>
-                    <div style='display: flex; gap: 2rem;'>
-                        <div style='flex: 1;'>
-                            <h3 style='color: #2b4d6f; margin-bottom: 1rem;'>Binary Classification</h3>
-                            <div style='text-align: center;'>
-                                <div class='metric-value'>{:.1f}%</div>
-                                <p class='metric-label'>Probability of Good Performance</p>
+                    # Display results with enhanced styling and animations
+                    st.markdown("""
+                    <div class='card' style='margin-top: 2rem;'>
+                        <h2 style='color: #1e3d59; margin-bottom: 1.5rem;'>Prediction Results</h2>
+                        <div style='display: flex; gap: 2rem;'>
+                            <div style='flex: 1;'>
+                                <h3 style='color: #2b4d6f; margin-bottom: 1rem;'>Binary Classification</h3>
+                                <div style='text-align: center;'>
+                                    <div class='metric-value'>{:.1f}%</div>
+                                    <p class='metric-label'>Probability of Good Performance</p>
+                                </div>
                             </div>
-                        </div>
-                        <div style='flex: 1;'>
-                            <h3 style='color: #2b4d6f; margin-bottom: 1rem;'>Performance Level Probabilities</h3>
-                """.format(binary_pred[0][1] * 100), unsafe_allow_html=True)
+                            <div style='flex: 1;'>
+                                <h3 style='color: #2b4d6f; margin-bottom: 1rem;'>Performance Level Probabilities</h3>
+                    """.format(binary_pred[0][1] * 100), unsafe_allow_html=True)
                 
-                # Display multi-class predictions with progress bars
-                class_names = ['Poor', 'Fair', 'Good', 'Excellent']
-                for cls, prob in zip(class_names, multi_pred[0]):
-                    st.markdown(f"""
-                    <div style='margin-bottom: 1rem;'>
-                        <div style='display: flex; justify-content: space-between; margin-bottom: 0.5rem;'>
-                            <span style='color: #666;'>{cls}</span>
-                            <span style='color: #1e3d59; font-weight: 500;'>{prob*100:.1f}%</span>
-                        </div>
-                        <div style='background: #f8f9fa; border-radius: 1rem; height: 0.5rem;'>
-                            <div style='background: linear-gradient(90deg, #1e3d59, #2b4d6f); 
-                                      width: {prob*100}%; height: 100%; border-radius: 1rem;
-                                      transition: width 1s ease-in-out;'></div>
+                    # Display multi-class predictions with progress bars
+                    class_names = ['Poor', 'Fair', 'Good', 'Excellent']
+                    for cls, prob in zip(class_names, multi_pred[0]):
+                        st.markdown(f"""
+                        <div style='margin-bottom: 1rem;'>
+                            <div style='display: flex; justify-content: space-between; margin-bottom: 0.5rem;'>
+                                <span style='color: #666;'>{cls}</span>
+                                <span style='color: #1e3d59; font-weight: 500;'>{prob*100:.1f}%</span>
+                            </div>
+                            <div style='background: #f8f9fa; border-radius: 1rem; height: 0.5rem;'>
+                                <div style='background: linear-gradient(90deg, #1e3d59, #2b4d6f); 
+                                          width: {prob*100}%; height: 100%; border-radius: 1rem;
+                                          transition: width 1s ease-in-out;'></div>
+                            </div>
                         </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        """, unsafe_allow_html=True)
                 
-                st.markdown("</div></div></div>", unsafe_allow_html=True)
+                    st.markdown("</div></div></div>", unsafe_allow_html=True)
                 
-            except Exception as e:
-                st.error("Unable to generate prediction. Please check your input values and try again.")
-                st.info("""
-                Please make sure:
-                1. All input fields are filled correctly
-                2. The values are within expected ranges
-                3. The dataset is loaded properly
+                except Exception as e:
+                    st.error("Unable to generate prediction. Please check your input values and try again.")
+                    st.info("""
+                    Please make sure:
+                    1. All input fields are filled correctly
+                    2. The values are within expected ranges
+                    3. The dataset is loaded properly
                 
-                If the issue persists, try refreshing the page or selecting a different dataset.
-                """)
+                    If the issue persists, try refreshing the page or selecting a different dataset.
+                    """)
+
+    elif page == "Performance":
+        st.title("Performance")
+        snapshot = REGISTRY.snapshot()
+        st.caption(f"Live metrics of this server process over the last {snapshot['uptime_seconds'] / 60:.0f} minutes. "
+                   f"Percentiles cover the most recent {QUANTILE_WINDOW} calls of each stage.")
+
+        st.header("Stages")
+        if snapshot['stages']:
+            st.dataframe(pd.DataFrame([{
+                'Stage': entry['stage'],
+                'Labels': ', '.join(f"{k}={v}" for k, v in entry['labels'].items()),
+                'Calls': entry['count'],
+                'p50 (ms)': entry['p50_seconds'] * 1000,
+                'p95 (ms)': entry['p95_seconds'] * 1000,
+                'p99 (ms)': entry['p99_seconds'] * 1000,
+                'Rows': entry['rows'],
+            } for entry in snapshot['stages']]).style.format(precision=2), hide_index=True, width='stretch')
+        else:
+            st.info("No stages recorded yet in this process.")
+
+        st.header("Caches")
+        if snapshot['caches']:
+            st.dataframe(pd.DataFrame([{
+                'Cache': cache,
+                'Requests': entry['requests'],
+                'Hits': entry['hits'],
+                'Hit rate': None if entry['hit_rate'] is None else f"{entry['hit_rate'] * 100:.1f}%",
+            } for cache, entry in snapshot['caches'].items()]), hide_index=True, width='stretch')
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Download Prometheus metrics", REGISTRY.to_prometheus(),
+                               file_name='metrics.prom', mime='text/plain')
+        with col2:
+            st.download_button("Download JSON metrics", REGISTRY.to_json(),
+                               file_name='metrics.json', mime='application/json')
 
-else:  # About page
-    st.title("About This Dashboard")
+    else:  # About page
+        st.title("About This Dashboard")
     
-    # Purpose Section
-    st.header("Purpose")
-    st.write("This dashboard is designed to help educators and administrators:")
+        # Purpose Section
+        st.header("Purpose")
+        st.write("This dashboard is designed to help educators and administrators:")
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.info("Monitor student performance trends")
-    with col2:
-        st.warning("Identify at-risk students early")
-    with col3:
-        st.success("Make data-driven decisions")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.info("Monitor student performance trends")
+        with col2:
+            st.warning("Identify at-risk students early")
+        with col3:
+            st.success("Make data-driven decisions")
     
-    # Features Section
-    st.header("Features")
-    features_col1, features_col2 = st.columns(2)
+        # Features Section
+        st.header("Features")
+        features_col1, features_col2 = st.columns(2)
     
-    with features_col1:
-        st.markdown("""
-        - Interactive data visualization
-        - Real-time performance prediction
-        """)
+        with features_col1:
+            st.markdown("""
+            - Interactive data visualization
+            - Real-time performance prediction
+            """)
     
-    with features_col2:
-        st.markdown("""
-        - Multi-class classification
-        - Key performance indicators
-        """)
-    
-    # Model Information Section
-    st.header("Model Information")
-    st.write("The predictions are based on Random Forest models trained on the UCI Student Performance Dataset.")
-    
-    metrics_col1, metrics_col2 = st.columns(2)
-    with metrics_col1:
-        st.metric(
-            label="Binary Classification",
-            value="95%",
-            delta="Accuracy",
-            delta_color="normal"
-        )
+        with features_col2:
+            st.markdown("""
+            - Multi-class classification
+            - Key performance indicators
+            """)
     
-    with metrics_col2:
-        st.metric(
-            label="Multi-class Classification",
-            value="77%",
-            delta="Accuracy",
-            delta_color="normal"
-        )
+        # Model Information Section
+        st.header("Model Information")
+        st.write("The predictions are based on Random Forest models trained on the UCI Student Performance Dataset.")
     
-    # How to Use Section
-    st.header("How to Use")
+        metrics_col1, metrics_col2 = st.columns(2)
+        with metrics_col1:
+            st.metric(
+                label="Binary Classification",
+                value="95%",
+                delta="Accuracy",
+                delta_color="normal"
+            )
     
-    tab1, tab2, tab3 = st.tabs(["Dashboard", "Predict Performance", "About"])
+        with metrics_col2:
+            st.metric(
+                label="Multi-class Classification",
+                value="77%",
+                delta="Accuracy",
+                delta_color="normal"
+            )
     
-    with tab1:
-        st.markdown("""
-        ### Dashboard
-        View overall performance metrics and trends:
-        - Monitor student grades
-        - Analyze performance patterns
-        - Track success rates
-        """)
-    
-    with tab2:
-        st.markdown("""
-        ### Predict Performance
-        Enter student information to get predictions:
-        - Input student grades
-        - Provide study habits
-        - Get performance forecasts
-        """)
-    
-    with tab3:
-        st.markdown("""
-        ### About
-        Learn more about the system:
-        - System capabilities
-        - Model information
-        - Usage guidelines
-        """)
-    
-    # Additional Resources
-    st.header("Additional Resources")
-    with st.expander("Documentation"):
-        st.write("Detailed documentation about using the dashboard and interpreting results.")
-    
-    with st.expander("Data Sources"):
-        st.write("Information about the UCI Student Performance Dataset and data collection methodology.")
-    
-    with st.expander("Model Details"):
-        st.write("Technical details about the machine learning models and their training process.")
-    
-    # Footer
-    st.markdown("---")
-    st.markdown(
-        "<div style='text-align: center;'>"
-        "Created by Person Who Loves Child"
-        "</div>",
-        unsafe_allow_html=True
-    ) 
\ No newline at end of file
+        # How to Use Section
+        st.header("How to Use")
+    
+        tab1, tab2, tab3 = st.tabs(["Dashboard", "Predict Performance", "About"])
+    
+        with tab1:
+            st.markdown("""
+            ### Dashboard
+            View overall performance metrics and trends:
+            - Monitor student grades
+            - Analyze performance patterns
+            - Track success rates
+            """)
+    
+        with tab2:
+            st.markdown("""
+            ### Predict Performance
+            Enter student information to get predictions:
+            - Input student grades
+            - Provide study habits
+            - Get performance forecasts
+            """)
+    
+        with tab3:
+            st.markdown("""
+            ### About
+            Learn more about the system:
+            - System capabilities
+            - Model information
+            - Usage guidelines
+            """)
+    
+        # Additional Resources
+        st.header("Additional Resources")
+        with st.expander("Documentation"):
+            st.write("Detailed documentation about using the dashboard and interpreting results.")
+    
+        with st.expander("Data Sources"):
+            st.write("Information about the UCI Student Performance Dataset and data collection methodology.")
+    
+        with st.expander("Model Details"):
+            st.write("Technical details about the machine learning models and their training process.")
+    
+        # Footer
+        st.markdown("---")
+        st.markdown(
+            "<div style='text-align: center;'>"
+            "Created by Person Who Loves Child"
+            "</div>",
+            unsafe_allow_html=True
+        ) 
+
+    # Opt-in startup timing report (STUDENT_APP_STARTUP_REPORT=1)
+    cold_start = startup_timer.finish()
+    if report_enabled():
+        with st.sidebar.expander("Startup timing"):
+            st.caption(f"This run: {startup_timer.format()}")
+            st.caption(f"Cold start: {cold_start.format()}")
+
+# Opt-in CPU and memory profile of this rerun (STUDENT_APP_PROFILE=1, or ?profile=1 for admins).
+# It is written however the rerun ends, including st.stop(), a widget interaction or an error
+with profile_rerun(profiling_enabled() or (st.query_params.get('profile') == '1' and is_admin())) as rerun_profiler:
+    render_app(rerun_profiler)
+if rerun_profiler is not None and rerun_profiler.report_path:
+    st.sidebar.caption(f"Rerun profile written to {rerun_profiler.report_path}")
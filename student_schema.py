@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Nominal columns and their allowed levels (see student.txt)
+CATEGORICAL_COLUMNS = {
+    'school': ['GP', 'MS'],
+    'sex': ['F', 'M'],
+    'address': ['R', 'U'],
+    'famsize': ['GT3', 'LE3'],
+    'Pstatus': ['A', 'T'],
+    'Mjob': ['at_home', 'health', 'other', 'services', 'teacher'],
+    'Fjob': ['at_home', 'health', 'other', 'services', 'teacher'],
+    'reason': ['course', 'home', 'other', 'reputation'],
+    'guardian': ['father', 'mother', 'other'],
+}
+
+# yes/no columns, loaded as bool
+BOOLEAN_COLUMNS = ['schoolsup', 'famsup', 'paid', 'activities', 'nursery',
+                   'higher', 'internet', 'romantic']
+
+# Integer columns: (dtype, min, max)
+INTEGER_COLUMNS = {
+    'age': ('int8', 15, 22),
+    'Medu': ('int8', 0, 4),
+    'Fedu': ('int8', 0, 4),
+    'traveltime': ('int8', 1, 4),
+    'studytime': ('int8', 1, 4),
+    'failures': ('int8', 0, 4),
+    'famrel': ('int8', 1, 5),
+    'freetime': ('int8', 1, 5),
+    'goout': ('int8', 1, 5),
+    'Dalc': ('int8', 1, 5),
+    'Walc': ('int8', 1, 5),
+    'health': ('int8', 1, 5),
+    'absences': ('int16', 0, 1000),
+    'G1': ('int8', 0, 20),
+    'G2': ('int8', 0, 20),
+    'G3': ('int8', 0, 20),
+}
+
+SCHEMA_COLUMNS = list(CATEGORICAL_COLUMNS) + BOOLEAN_COLUMNS + list(INTEGER_COLUMNS)
+
+# dtypes handed to pd.read_csv so nominal columns are never materialised as Python strings
+READ_DTYPES = {col: 'category' for col in list(CATEGORICAL_COLUMNS) + BOOLEAN_COLUMNS}
+
+
+class SchemaError(ValueError):
+    """Raised when a student frame does not match the UCI schema."""
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__("Invalid student data:\n- " + "\n- ".join(problems))
+
+
+def _examples(values):
+    return ', '.join(repr(v) for v in values.drop_duplicates().head(5).tolist())
+
+
+def apply_schema(df, required=SCHEMA_COLUMNS):
+    """Validate ``df`` against the UCI schema and cast it to compact dtypes, in place.
+
+    Nominal columns become ``category``, yes/no flags ``bool`` and the
+    ordinals and grades small integers. Every column in ``required`` must be
+    present; schema columns that are present but not required are still
+    validated. Raises ``SchemaError`` listing every violation found.
+    """
+    problems = [f"missing column '{col}'" for col in required if col not in df.columns]
+
+    for col, levels in CATEGORICAL_COLUMNS.items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        invalid = values.notna() & ~values.isin(levels)
+        if values.isna().any():
+            problems.append(f"'{col}' has missing values")
+        elif invalid.any():
+            problems.append(f"'{col}' has unknown values: {_examples(values[invalid])}")
+        else:
+            df[col] = pd.Categorical(values, categories=levels)
+
+    for col in BOOLEAN_COLUMNS:
+        if col not in df.columns or df[col].dtype == bool:
+            continue
+        values = df[col]
+        invalid = ~values.isin(['yes', 'no'])
+        if invalid.any():
+            problems.append(f"'{col}' must be yes/no, got: {_examples(values[invalid])}")
+        else:
+            df[col] = (values == 'yes').to_numpy(dtype=bool)
+
+    for col, (dtype, low, high) in INTEGER_COLUMNS.items():
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        invalid = values.isna() | (values != np.round(values)) | (values < low) | (values > high)
+        if invalid.any():
+            problems.append(f"'{col}' must be an integer in [{low}, {high}], got: {_examples(df[col][invalid])}")
+        else:
+            df[col] = values.astype(dtype)
+
+    if problems:
+        raise SchemaError(problems)
+    return df
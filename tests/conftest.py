@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The modules live at the repository root rather than in a package
+sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture
+def math_path():
+    return os.path.join(REPO_DIR, 'data', 'student-mat.csv')
+
+
+@pytest.fixture
+def por_path():
+    return os.path.join(REPO_DIR, 'data', 'student-por.csv')
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_merge import COURSE_SUFFIXES, MERGE_KEYS, hash_join, iter_hash_join, merge_courses
+from student_performance_analysis import load_data
+
+
+def _with_row_ids(df):
+    return df.drop(columns='performance_class').assign(row=np.arange(len(df)))
+
+
+def _expected(left, right):
+    merged = pd.merge(left, right, on=MERGE_KEYS, suffixes=COURSE_SUFFIXES)
+    return merged.sort_values(['row_mat', 'row_por']).reset_index(drop=True)
+
+
+def _assert_same_rows(actual, expected):
+    # The key columns come first, then each course's columns
+    assert list(actual.columns) == MERGE_KEYS + [col for col in expected.columns if col not in MERGE_KEYS]
+    assert len(actual) == len(expected)
+    for col in actual.columns:
+        np.testing.assert_array_equal(actual[col].astype(str).to_numpy(), expected[col].astype(str).to_numpy(),
+                                      err_msg=col)
+
+
+@pytest.fixture
+def courses(math_path, por_path):
+    return _with_row_ids(load_data(math_path)), _with_row_ids(load_data(por_path))
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 64, 100_000])
+def test_matches_pandas_merge(courses, chunk_rows):
+    math, por = courses
+    _assert_same_rows(hash_join(math, por, chunk_rows=chunk_rows), _expected(math, por))
+
+
+def test_course_merge_finds_the_students_in_both_courses(courses):
+    # student-merge.R reports 382 students taking both courses
+    assert len(merge_courses(*courses)) == 382
+
+
+def test_larger_left_side_is_probed(courses):
+    math, por = courses
+    _assert_same_rows(hash_join(por, math, chunk_rows=50), _expected(por, math))
+
+
+def test_duplicate_keys_emit_every_matching_pair(courses):
+    math, por = courses
+    # Every math row twice and the first 100 Portuguese rows three times
+    left = pd.concat([math, math], ignore_index=True).assign(row=np.arange(2 * len(math)))
+    right = pd.concat([por, por.iloc[:100], por.iloc[:100]], ignore_index=True).assign(row=np.arange(len(por) + 200))
+
+    actual = hash_join(left, right, chunk_rows=77)
+    _assert_same_rows(actual, _expected(left, right))
+    assert len(actual) > 2 * 382
+
+
+def test_no_common_keys_gives_an_empty_frame(courses):
+    math, por = courses
+    por = por.assign(age=por['age'].astype(int) + 100)
+    actual = hash_join(math, por)
+    assert actual.empty
+    _assert_same_rows(actual, _expected(math, por))
+
+
+def test_streamed_join_matches_in_memory_join(courses):
+    math, por = courses
+    chunks = (por.iloc[start:start + 100] for start in range(0, len(por), 100))
+    streamed = pd.concat(iter_hash_join(math, chunks, build_is_left=True), ignore_index=True)
+    _assert_same_rows(streamed.sort_values(['row_mat', 'row_por']).reset_index(drop=True), _expected(math, por))
@@ -0,0 +1,102 @@
+import copy
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+import forest_engine
+from forest_engine import CompiledForest, parity_check, random_rows
+
+
+def _fit(n_classes, seed=0, scaled=True, class_weight=None):
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 5, size=(300, 8)).astype(np.float64)
+    y = (X[:, 0] + X[:, 3] + rng.integers(0, 3, size=300)) % n_classes
+    model = RandomForestClassifier(n_estimators=25, max_depth=6, random_state=seed, class_weight=class_weight)
+    if scaled:
+        model.scaler_ = StandardScaler().fit(X)
+        model.fit(model.scaler_.transform(X), y)
+    else:
+        model.fit(X, y)
+    return model, X
+
+
+def _expected(model, X):
+    scaler = getattr(model, 'scaler_', None)
+    return model.predict_proba(scaler.transform(X) if scaler is not None else X)
+
+
+@pytest.mark.parametrize('n_classes', [2, 4])
+@pytest.mark.parametrize('scaled', [True, False])
+def test_batch_matches_sklearn(n_classes, scaled):
+    model, X = _fit(n_classes, scaled=scaled)
+    compiled = CompiledForest.from_model(model)
+    rows = np.vstack([X, random_rows(X, 500)])
+
+    np.testing.assert_array_equal(compiled.predict_proba(rows), _expected(model, rows))
+    np.testing.assert_array_equal(compiled.predict(rows), model.classes_[np.argmax(_expected(model, rows), axis=1)])
+
+
+@pytest.mark.parametrize('n_classes', [2, 4])
+def test_single_rows_match_sklearn(n_classes):
+    model, X = _fit(n_classes, seed=1)
+    compiled = CompiledForest.from_model(model)
+
+    for row in X[:50]:
+        np.testing.assert_array_equal(compiled.predict_proba(row), _expected(model, row[np.newaxis]))
+    assert parity_check(model, compiled, X[:1]) == 0
+
+
+def test_small_and_large_blocks_agree():
+    model, X = _fit(4, seed=2)
+    compiled = CompiledForest.from_model(model)
+    rows = random_rows(X, 1000)
+
+    np.testing.assert_array_equal(compiled.predict_proba(rows, block_rows=1), compiled.predict_proba(rows))
+
+
+@pytest.mark.parametrize('n_classes', [2, 4])
+@pytest.mark.parametrize('class_weight', [None, 'balanced'])
+def test_class_count_leaves_are_normalised(n_classes, class_weight, monkeypatch):
+    # scikit-learn < 1.4 stores weighted class counts in tree_.value
+    monkeypatch.setattr(forest_engine, '_leaves_hold_class_counts', lambda: True)
+    model, X = _fit(n_classes, seed=3, class_weight=class_weight)
+    counts = copy.deepcopy(model)
+    for estimator in counts.estimators_:
+        state = estimator.tree_.__getstate__()
+        state['values'] = state['values'] * estimator.tree_.weighted_n_node_samples[:, np.newaxis, np.newaxis]
+        estimator.tree_.__setstate__(state)
+
+    compiled = CompiledForest.from_model(counts)
+    rows = np.vstack([X, random_rows(X, 200)])
+    np.testing.assert_allclose(compiled.predict_proba(rows), _expected(model, rows), rtol=0, atol=1e-12)
+
+
+def test_convert_republishes_the_updated_artifact(tmp_path, math_path, capsys):
+    from incremental_training import update_artifact
+    from model_store import COMPILED_FILES, load_artifact, load_history, train_artifact
+
+    with open(math_path) as f:
+        lines = f.readlines()
+    data_path = str(tmp_path / 'student-mat.csv')
+    with open(data_path, 'w') as f:
+        f.writelines(lines[:301])
+    store_dir = str(tmp_path / 'models')
+    train_artifact(data_path, store_dir, n_workers=1)
+    with open(data_path, 'a') as f:
+        f.writelines(lines[301:])
+    artifact_dir = update_artifact(data_path, store_dir, n_workers=1)
+    published = os.path.realpath(artifact_dir)
+
+    forest_engine.convert([data_path], store_dir)
+
+    assert artifact_dir in capsys.readouterr().out
+    assert os.path.realpath(artifact_dir) != published
+    model_binary, model_multi, _, metadata = load_artifact(artifact_dir)
+    assert 'incremental' in metadata
+    X = load_history(artifact_dir)['X']
+    for model_type, model in (('binary', model_binary), ('multiclass', model_multi)):
+        compiled = CompiledForest.load(os.path.join(artifact_dir, COMPILED_FILES[model_type]))
+        assert parity_check(model, compiled, X) == 0
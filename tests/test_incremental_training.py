@@ -0,0 +1,130 @@
+import os
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import incremental_training
+import model_store
+from incremental_training import _update_versions, add_trees, update_artifact
+from model_store import METADATA_FILE, load_artifact, load_or_train, train_artifact
+
+PARAMS = {'n_estimators': 30}
+BASE_ROWS = 300
+
+
+@pytest.fixture
+def grown(tmp_path, math_path):
+    """A dataset of BASE_ROWS students with a trained artifact, then the remaining students appended."""
+    with open(math_path) as f:
+        lines = f.readlines()
+    data_path = str(tmp_path / 'student-mat.csv')
+    with open(data_path, 'w') as f:
+        f.writelines(lines[:BASE_ROWS + 1])
+    store_dir = str(tmp_path / 'models')
+    base_dir = train_artifact(data_path, store_dir, PARAMS, n_workers=1)
+    with open(data_path, 'a') as f:
+        f.writelines(lines[BASE_ROWS + 1:])
+    return data_path, store_dir, base_dir, len(lines) - 1
+
+
+def _metadata(artifact_dir):
+    return load_artifact(artifact_dir, compiled=True)[3]
+
+
+def test_update_adds_trees_for_the_new_rows(grown):
+    data_path, store_dir, base_dir, n_rows = grown
+    base_binary, base_multi, _, base_meta = load_artifact(base_dir)
+
+    artifact_dir = update_artifact(data_path, store_dir, PARAMS, trees_per_update=10, n_workers=1)
+    model_binary, model_multi, _, metadata = load_artifact(artifact_dir)
+
+    assert artifact_dir != base_dir
+    assert metadata['n_rows'] == n_rows
+    assert metadata['incremental']['new_rows'] == n_rows - BASE_ROWS
+    assert metadata['class_edges'] == base_meta['class_edges']
+    for model, base_model, model_type in ((model_binary, base_binary, 'binary'),
+                                          (model_multi, base_multi, 'multiclass')):
+        # The ten oldest trees make room for ten new ones
+        assert len(model.estimators_) == PARAMS['n_estimators']
+        assert sum(n for _, n in metadata['tree_versions'][model_type]) == PARAMS['n_estimators']
+        np.testing.assert_array_equal(model.classes_, base_model.classes_)
+        kept = base_model.estimators_[10:]
+        for old, new in zip(kept, model.estimators_[:len(kept)]):
+            np.testing.assert_array_equal(old.tree_.threshold, new.tree_.threshold)
+        assert 0.5 < metadata['metrics'][model_type]['accuracy'] <= 1.0
+    # The base artifact is left untouched
+    assert _metadata(base_dir)['n_rows'] == BASE_ROWS
+
+
+def test_update_reads_only_the_appended_rows(grown):
+    data_path, store_dir, _, _ = grown
+    full_read = AssertionError("the history was read in full")
+    with mock.patch.object(incremental_training, 'load_data', side_effect=full_read), \
+            mock.patch.object(model_store, 'load_data', side_effect=full_read):
+        artifact_dir = update_artifact(data_path, store_dir, PARAMS, n_workers=1)
+    assert 'incremental' in _metadata(artifact_dir)
+
+
+def test_second_update_is_a_no_op_and_is_loaded(grown):
+    data_path, store_dir, _, _ = grown
+    artifact_dir = update_artifact(data_path, store_dir, PARAMS, n_workers=1)
+
+    assert update_artifact(data_path, store_dir, PARAMS, n_workers=1) == artifact_dir
+    *_, metadata = load_or_train(data_path, store_dir, PARAMS)
+    assert metadata['artifact_key'] == os.path.basename(artifact_dir)
+
+
+def test_partial_last_line_waits_for_the_next_update(grown):
+    data_path, store_dir, base_dir, _ = grown
+    with open(data_path, 'a') as f:
+        f.write('"GP";"F";17')
+    assert update_artifact(data_path, store_dir, PARAMS, n_workers=1) == base_dir
+
+
+def test_rewritten_file_is_fully_retrained(grown):
+    data_path, store_dir, _, _ = grown
+    with open(data_path) as f:
+        lines = f.readlines()
+    with open(data_path, 'w') as f:
+        f.writelines([lines[0], *lines[:0:-1]])
+
+    artifact_dir = update_artifact(data_path, store_dir, PARAMS, n_workers=1)
+    assert 'incremental' not in _metadata(artifact_dir)
+
+
+def test_class_drift_falls_back_to_a_full_retrain(grown):
+    data_path, store_dir, _, n_rows = grown
+    artifact_dir = update_artifact(data_path, store_dir, PARAMS, n_workers=1, max_class_drift=-1)
+
+    metadata = _metadata(artifact_dir)
+    assert 'incremental' not in metadata
+    assert metadata['n_rows'] == n_rows
+
+
+def test_no_base_artifact_trains_from_scratch(tmp_path, math_path):
+    artifact_dir = update_artifact(math_path, str(tmp_path / 'models'), PARAMS, n_workers=1)
+    with open(os.path.join(artifact_dir, METADATA_FILE)) as f:
+        assert 'incremental' not in f.read()
+
+
+def test_add_trees_drops_the_oldest(grown):
+    _, _, base_dir, _ = grown
+    model, _, _, _ = load_artifact(base_dir)
+    history = model_store.load_history(base_dir)
+    oldest_kept = model.estimators_[5]
+
+    dropped = add_trees(model, history['X'], history['binary'], n_new=5, max_trees=PARAMS['n_estimators'],
+                        random_state=0, n_jobs=1)
+
+    assert dropped == 5
+    assert model.estimators_[0] is oldest_kept
+    assert len(model.estimators_) == model.n_estimators == PARAMS['n_estimators']
+    assert not model.warm_start
+
+
+def test_update_versions_trims_the_oldest_runs():
+    runs = [['a', 10], ['b', 5]]
+    assert _update_versions(runs, 'c', 4, 12) == [['b', 3], ['c', 4]]
+    assert _update_versions(runs, 'b', 4, 0) == [['a', 10], ['b', 9]]
+    assert runs == [['a', 10], ['b', 5]]
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+import tracemalloc
+
+import pytest
+
+import rerun_profiler
+from rerun_profiler import RerunProfiler, profile_rerun
+
+
+def _summaries(directory):
+    return [json.load(open(os.path.join(directory, name))) for name in sorted(os.listdir(directory))
+            if name.endswith('.json')]
+
+
+def test_completed_rerun_writes_a_report(tmp_path):
+    with profile_rerun(directory=str(tmp_path)) as profiler:
+        profiler.label = 'Dashboard'
+        sum(i * i for i in range(10_000))
+
+    assert os.path.exists(profiler.report_path)
+    assert os.path.exists(profiler.report_path[:-len('.txt')] + '.prof')
+    [summary] = _summaries(tmp_path)
+    assert summary['label'] == 'Dashboard' and summary['cpu_profiled']
+    assert 'interrupted_by' not in summary['context']
+    assert rerun_profiler._tracemalloc_users == 0 and not tracemalloc.is_tracing()
+
+
+def test_interrupted_rerun_is_reported_and_reraised(tmp_path):
+    class StopException(Exception):
+        pass
+
+    with pytest.raises(StopException):
+        with profile_rerun(directory=str(tmp_path)):
+            raise StopException()
+
+    [summary] = _summaries(tmp_path)
+    assert summary['context']['interrupted_by'] == 'StopException'
+    assert not rerun_profiler._cpu_profile_lock.locked()
+    assert rerun_profiler._tracemalloc_users == 0 and not tracemalloc.is_tracing()
+
+
+def test_disabled_or_failed_start_runs_unprofiled(tmp_path, monkeypatch):
+    with profile_rerun(enabled=False, directory=str(tmp_path)) as profiler:
+        assert profiler is None
+
+    def fail(self):
+        raise OSError("no profiler for you")
+    monkeypatch.setattr(RerunProfiler, 'start', fail)
+    with profile_rerun(directory=str(tmp_path)) as profiler:
+        assert profiler is None
+    assert not os.listdir(tmp_path)
+
+
+def test_concurrent_reruns_share_one_cpu_profiler(tmp_path):
+    barrier = threading.Barrier(3)
+
+    def rerun():
+        with profile_rerun(directory=str(tmp_path)):
+            barrier.wait()
+
+    threads = [threading.Thread(target=rerun) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summaries = _summaries(tmp_path)
+    assert len(summaries) == 3
+    assert sum(summary['cpu_profiled'] for summary in summaries) == 1
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.prof')]) == 1
+    assert rerun_profiler._tracemalloc_users == 0 and not tracemalloc.is_tracing()
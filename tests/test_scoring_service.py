@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+import pytest
+
+from feature_encoder import FeatureEncoder
+from scoring_service import DatasetScorer, MicroBatcher, RequestError, ScoringApp
+from student_performance_analysis import load_data
+
+
+@pytest.fixture
+def scorer(math_path):
+    # Only the encoder is needed to validate and encode records
+    scorer = DatasetScorer.__new__(DatasetScorer)
+    df = load_data(math_path)
+    scorer.encoder = FeatureEncoder().fit(df)
+    scorer.batcher = MicroBatcher(scorer.predict)
+    scorer.record = {col: value.item() if hasattr(value, 'item') else value
+                     for col, value in df.iloc[0].to_dict().items()}
+    return scorer
+
+
+def test_valid_record_is_encoded(scorer):
+    assert scorer.encode([scorer.record]).shape == (1, scorer.encoder.n_features)
+
+
+@pytest.mark.parametrize('field, value', [
+    ('G1', 'abc'), ('G1', None), ('absences', float('nan')), ('age', [16]), ('G2', True),
+    ('Mjob', 'astronaut'), ('school', None), ('internet', 'maybe'), ('sex', 1),
+])
+def test_invalid_values_are_rejected(scorer, field, value):
+    with pytest.raises(RequestError, match=field):
+        scorer.encode([scorer.record, dict(scorer.record, **{field: value})])
+
+
+def test_boolean_fields_accept_yes_no_and_bools(scorer):
+    records = [dict(scorer.record, internet=value) for value in (True, False, 'yes', 'no')]
+    assert len(scorer.encode(records)) == 4
+
+
+def test_invalid_record_returns_400(scorer):
+    app = ScoringApp({'Mathematics': scorer})
+    body = json.dumps({'records': [dict(scorer.record, G1=None)]}).encode()
+    status, payload = asyncio.run(app._score(body))
+    assert status == 400
+    assert 'G1' in payload['error']
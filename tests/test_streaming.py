@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming import GRADE_COLUMNS, GradeStats, iter_chunks, stream_stats
+from student_performance_analysis import load_data
+
+
+@pytest.mark.parametrize('chunksize', [7, 37, 10_000])
+def test_streamed_stats_match_full_frame(math_path, chunksize):
+    df = load_data(math_path)
+    stats = stream_stats(math_path, chunksize=chunksize)
+    grades = df[GRADE_COLUMNS].astype(np.float64)
+
+    assert stats.n == len(df)
+    assert stats.success_rate == pytest.approx((df['G3'] >= 15).mean())
+    np.testing.assert_allclose(stats.mean, grades.mean().to_numpy(), rtol=1e-12)
+    pd.testing.assert_frame_equal(stats.covariance(), grades.cov(), rtol=1e-10)
+    pd.testing.assert_frame_equal(stats.corr(), grades.corr(), rtol=1e-10)
+    for col in GRADE_COLUMNS:
+        assert stats.skew(col) == pytest.approx(grades[col].skew(), rel=1e-10)
+        counts = df[col].astype(int).value_counts()
+        np.testing.assert_array_equal(stats.histograms[col][counts.index], counts.to_numpy())
+
+
+def test_merge_is_order_independent(math_path, por_path):
+    math_stats, por_stats = stream_stats(math_path), stream_stats(por_path)
+    both = load_data(math_path), load_data(por_path)
+    full = GradeStats.from_frame(pd.concat(both, ignore_index=True))
+
+    for merged in (GradeStats().merge(math_stats).merge(por_stats),
+                   GradeStats().merge(por_stats).merge(math_stats)):
+        assert merged.n == full.n and merged.passed == full.passed
+        np.testing.assert_allclose(merged.mean, full.mean, rtol=1e-12)
+        np.testing.assert_allclose(merged.comoment, full.comoment, rtol=1e-10)
+
+
+def test_merging_empty_stats_changes_nothing(math_path):
+    stats = stream_stats(math_path)
+    before = stats.to_dict()
+    stats.merge(GradeStats())
+    assert stats.to_dict() == before
+    assert GradeStats().merge(stream_stats(math_path)).to_dict() == before
+
+
+def test_dict_round_trip(math_path):
+    stats = stream_stats(math_path)
+    restored = GradeStats.from_dict(stats.to_dict())
+    assert restored.to_dict() == stats.to_dict()
+    assert restored.kpis() == stats.kpis()
+
+
+def test_merging_different_columns_fails():
+    with pytest.raises(ValueError):
+        GradeStats(['G1']).merge(GradeStats())
+
+
+def test_chunks_from_offset_are_the_tail(math_path):
+    with open(math_path, 'rb') as f:
+        lines = f.readlines()
+    offset = sum(len(line) for line in lines[:101])
+
+    tail = pd.concat(iter_chunks(math_path, chunksize=50, offset=offset), ignore_index=True)
+    full = pd.concat(iter_chunks(math_path), ignore_index=True)
+    pd.testing.assert_frame_equal(tail, full.iloc[100:].reset_index(drop=True))
@@ -0,0 +1,248 @@
+import argparse
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import KFold, ParameterSampler
+from sklearn.preprocessing import StandardScaler
+
+from feature_encoder import FeatureEncoder
+from student_performance_analysis import load_data
+
+# Random Forest settings explored for both targets
+SEARCH_SPACE = {
+    'n_estimators': [50, 100, 200, 400],
+    'max_depth': [None, 5, 10, 20],
+    'max_features': ['sqrt', 'log2', 0.5, None],
+    'min_samples_leaf': [1, 2, 4, 8],
+    'class_weight': [None, 'balanced'],
+}
+
+TARGETS = {
+    'binary': 'performance_binary',
+    'multiclass': 'performance_class',
+}
+
+LATENCY_REPEATS = 200
+
+
+def sample_configs(n_candidates, seed=42, search_space=SEARCH_SPACE):
+    """Draw ``n_candidates`` distinct configurations from the search space."""
+    return list(ParameterSampler(search_space, n_iter=n_candidates, random_state=seed))
+
+
+def build_fold_cache(df, cache_dir, n_splits=5, seed=42):
+    """Encode and scale every CV fold once and save it as ``.npy`` arrays.
+
+    Workers open the arrays with ``mmap_mode='r'``, so each fold is shared
+    through the OS page cache instead of being pickled into every task.
+    Labels are stored as integer codes; returns the class names per target.
+    """
+    encoder = FeatureEncoder().fit(df)
+    X = encoder.transform(df)
+    labels = {}
+    codes = {}
+    for target, column in TARGETS.items():
+        classes, codes[target] = np.unique(np.asarray(df[column]).astype(str), return_inverse=True)
+        labels[target] = classes.tolist()
+
+    folds = KFold(n_splits=n_splits, shuffle=True, random_state=seed).split(X)
+    for fold, (train_idx, val_idx) in enumerate(folds):
+        scaler = StandardScaler()
+        np.save(os.path.join(cache_dir, f'fold{fold}_X_train.npy'), scaler.fit_transform(X[train_idx]))
+        np.save(os.path.join(cache_dir, f'fold{fold}_X_val.npy'), scaler.transform(X[val_idx]))
+        for target in TARGETS:
+            np.save(os.path.join(cache_dir, f'fold{fold}_{target}_y_train.npy'), codes[target][train_idx])
+            np.save(os.path.join(cache_dir, f'fold{fold}_{target}_y_val.npy'), codes[target][val_idx])
+    return labels
+
+
+def _single_row_latency(model, X, repeats=LATENCY_REPEATS):
+    """Median seconds for one single-row ``predict_proba`` call."""
+    row = np.ascontiguousarray(X[:1])
+    model.predict_proba(row)
+    times = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        model.predict_proba(row)
+        times[i] = time.perf_counter() - started
+    return float(np.median(times))
+
+
+def _evaluate(cache_dir, fold, target, params, fraction, seed):
+    """Fit one configuration on a fraction of one cached fold and score it."""
+    X_train = np.load(os.path.join(cache_dir, f'fold{fold}_X_train.npy'), mmap_mode='r')
+    X_val = np.load(os.path.join(cache_dir, f'fold{fold}_X_val.npy'), mmap_mode='r')
+    y_train = np.load(os.path.join(cache_dir, f'fold{fold}_{target}_y_train.npy'), mmap_mode='r')
+    y_val = np.load(os.path.join(cache_dir, f'fold{fold}_{target}_y_val.npy'), mmap_mode='r')
+
+    # Folds are shuffled, so a prefix of the training rows is a random subsample
+    n_train = max(2, int(round(len(y_train) * fraction)))
+    model = RandomForestClassifier(random_state=seed, n_jobs=1, **params)
+    started = time.perf_counter()
+    model.fit(X_train[:n_train], y_train[:n_train])
+    fit_seconds = time.perf_counter() - started
+
+    result = {
+        'accuracy': float((model.predict(X_val) == y_val).mean()),
+        'fit_seconds': fit_seconds,
+    }
+    return result
+
+
+def _fit_full(cache_dir, target, params, seed):
+    """Fit one configuration on all training rows of the first cached fold."""
+    X_train = np.load(os.path.join(cache_dir, 'fold0_X_train.npy'), mmap_mode='r')
+    y_train = np.load(os.path.join(cache_dir, f'fold0_{target}_y_train.npy'), mmap_mode='r')
+    return RandomForestClassifier(random_state=seed, n_jobs=1, **params).fit(X_train, y_train)
+
+
+def successive_halving(cache_dir, target, configs, n_splits=5, eta=3, n_jobs=-1, seed=42):
+    """Run successive halving for one target over the cached folds.
+
+    Every rung evaluates the surviving configurations on all folds with a
+    growing fraction of the training rows and keeps the best ``1/eta`` of
+    them. The last rung uses all rows.
+
+    Single-row prediction latency is then measured for every configuration,
+    not only the finalists, so a latency budget can fall back on one that
+    was eliminated earlier. The models are fitted in parallel on all rows
+    of the first fold, but timed one after another in this process, so the
+    timings are not skewed by workers competing for the CPU. Returns a
+    leaderboard frame sorted best first.
+    """
+    n_rungs = max(1, math.ceil(math.log(len(configs), eta)))
+    survivors = list(range(len(configs)))
+    records = {i: {'config_id': i, **configs[i]} for i in survivors}
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for rung in range(n_rungs):
+            fraction = eta ** (rung - (n_rungs - 1))
+            final = rung == n_rungs - 1
+            tasks = [(i, fold) for i in survivors for fold in range(n_splits)]
+            results = parallel(
+                delayed(_evaluate)(cache_dir, fold, target, configs[i], fraction, seed)
+                for i, fold in tasks
+            )
+
+            by_config = {}
+            for (i, _), result in zip(tasks, results):
+                by_config.setdefault(i, []).append(result)
+            for i, fold_results in by_config.items():
+                accuracies = [r['accuracy'] for r in fold_results]
+                records[i].update({
+                    'rung': rung,
+                    'train_fraction': fraction,
+                    'mean_accuracy': float(np.mean(accuracies)),
+                    'std_accuracy': float(np.std(accuracies)),
+                    'fit_seconds': float(np.mean([r['fit_seconds'] for r in fold_results])),
+                })
+
+            if not final:
+                n_keep = max(1, math.ceil(len(survivors) / eta))
+                survivors = sorted(survivors, key=lambda i: records[i]['mean_accuracy'], reverse=True)[:n_keep]
+
+        models = parallel(delayed(_fit_full)(cache_dir, target, configs[i], seed) for i in records)
+
+    X_val = np.load(os.path.join(cache_dir, 'fold0_X_val.npy'))
+    for i, model in zip(records, models):
+        records[i]['latency_ms'] = _single_row_latency(model, X_val) * 1000
+
+    leaderboard = pd.DataFrame(list(records.values()))
+    leaderboard = leaderboard.sort_values(['rung', 'mean_accuracy'], ascending=False).reset_index(drop=True)
+    leaderboard.insert(0, 'rank', np.arange(1, len(leaderboard) + 1))
+    return leaderboard
+
+
+def tune(df, n_candidates=27, n_splits=5, eta=3, n_jobs=-1, seed=42, latency_budget_ms=None, cache_dir=None):
+    """Search Random Forest settings for both targets.
+
+    Returns a dict mapping each target to its leaderboard. With a
+    ``latency_budget_ms``, each leaderboard gets a ``within_budget`` column
+    for the configurations whose single-row latency is under the budget.
+    """
+    configs = sample_configs(n_candidates, seed)
+    own_cache = cache_dir is None
+    if own_cache:
+        cache_dir = tempfile.mkdtemp(prefix='tuning-folds-')
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    try:
+        build_fold_cache(df, cache_dir, n_splits=n_splits, seed=seed)
+        leaderboards = {}
+        for target in TARGETS:
+            leaderboard = successive_halving(cache_dir, target, configs, n_splits, eta, n_jobs, seed)
+            if latency_budget_ms is not None:
+                leaderboard['within_budget'] = leaderboard['latency_ms'] <= latency_budget_ms
+            leaderboards[target] = leaderboard
+        return leaderboards
+    finally:
+        if own_cache:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def best_params(leaderboard, latency_budget_ms=None):
+    """Hyperparameters of the top configuration, optionally within a latency budget.
+
+    Configurations that reached a later rung rank first. When no finalist
+    meets the budget, the best one eliminated earlier that does is chosen;
+    ``None`` means no configuration meets it.
+    """
+    candidates = leaderboard
+    if latency_budget_ms is not None:
+        candidates = candidates[candidates['latency_ms'] <= latency_budget_ms]
+    if candidates.empty:
+        return None
+    best = candidates.sort_values(['rung', 'mean_accuracy'], ascending=False).iloc[0]
+    params = {}
+    for name in SEARCH_SPACE:
+        value = best[name]
+        if isinstance(value, float) and math.isnan(value):
+            value = None
+        elif isinstance(value, np.generic):
+            value = value.item()
+        # Integer settings come back as floats when the column also holds None
+        if isinstance(value, float) and name != 'max_features':
+            value = int(value)
+        params[name] = value
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune Random Forest hyperparameters with successive halving.")
+    parser.add_argument('dataset', nargs='?', default='data/student-mat.csv', help="Semicolon-separated UCI dataset")
+    parser.add_argument('--candidates', type=int, default=27, help="Number of sampled configurations")
+    parser.add_argument('--folds', type=int, default=5, help="Number of CV folds")
+    parser.add_argument('--eta', type=int, default=3, help="Halving rate between rungs")
+    parser.add_argument('--jobs', type=int, default=-1, help="Parallel workers (-1: all cores)")
+    parser.add_argument('--latency-budget-ms', type=float, help="Single-row predict latency budget")
+    parser.add_argument('--output', default='tuning_results', help="Directory for leaderboard files")
+    args = parser.parse_args()
+
+    df = load_data(args.dataset)
+    leaderboards = tune(df, n_candidates=args.candidates, n_splits=args.folds, eta=args.eta,
+                        n_jobs=args.jobs, latency_budget_ms=args.latency_budget_ms)
+
+    os.makedirs(args.output, exist_ok=True)
+    summary = {}
+    for target, leaderboard in leaderboards.items():
+        leaderboard.to_csv(os.path.join(args.output, f'leaderboard_{target}.csv'), index=False)
+        summary[target] = best_params(leaderboard, args.latency_budget_ms)
+        print(f"\n{target} leaderboard:")
+        print(leaderboard.head(10).to_string(index=False))
+        print(f"Best {target} params: {summary[target]}")
+
+    with open(os.path.join(args.output, 'best_params.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()